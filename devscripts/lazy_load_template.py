@@ -4,16 +4,33 @@ from __future__ import unicode_literals
 import re
 
 
-class LazyLoadExtractor(object):
+class LazyLoadMetaClass(type):
+    def __getattr__(cls, name):
+        # Attributes not needed to match URLs are looked up in the real
+        # extractor, which is imported on first use
+        return getattr(cls._get_real_class(), name)
+
+
+# Python 2 and 3 compatible way to use a metaclass
+LazyLoadBase = LazyLoadMetaClass(str('LazyLoadBase'), (object,), {})
+
+
+class LazyLoadExtractor(LazyLoadBase):
     _module = None
 
     @classmethod
     def ie_key(cls):
         return cls.__name__[:-2]
 
+    @classmethod
+    def _get_real_class(cls):
+        if '_real_class' not in cls.__dict__:
+            mod = __import__(cls._module, fromlist=(cls.__name__,))
+            cls._real_class = getattr(mod, cls.__name__)
+        return cls._real_class
+
     def __new__(cls, *args, **kwargs):
-        mod = __import__(cls._module, fromlist=(cls.__name__,))
-        real_cls = getattr(mod, cls.__name__)
+        real_cls = cls._get_real_class()
         instance = real_cls.__new__(real_cls)
         instance.__init__(*args, **kwargs)
         return instance
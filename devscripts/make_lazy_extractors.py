@@ -1,23 +1,26 @@
-from __future__ import unicode_literals, print_function
+from __future__ import unicode_literals
 
-from inspect import getsource
+from inspect import getsource, ismodule
 import io
 import os
 from os.path import dirname as dirn
 import sys
 
-print('WARNING: Lazy loading extractors is an experimental feature that may not always work', file=sys.stderr)
-
 sys.path.insert(0, dirn(dirn((os.path.abspath(__file__)))))
 
 lazy_extractors_filename = sys.argv[1]
 if os.path.exists(lazy_extractors_filename):
     os.remove(lazy_extractors_filename)
 
+# Read the classes from the extractors themselves rather than from a previously
+# generated module, importing a module set to None in sys.modules fails
+sys.modules['youtube_dl.extractor.lazy_extractors'] = None
+
+from youtube_dl import compat, utils
 from youtube_dl.extractor import _ALL_CLASSES
 from youtube_dl.extractor.common import InfoExtractor, SearchInfoExtractor
 
-with open('devscripts/lazy_load_template.py', 'rt') as f:
+with open(os.path.join(dirn(os.path.abspath(__file__)), 'lazy_load_template.py'), 'rt') as f:
     module_template = f.read()
 
 module_contents = [
@@ -46,6 +49,28 @@ def get_base_name(base):
         return base.__name__
 
 
+# Helpers from youtube_dl.compat and youtube_dl.utils used by copied methods
+helper_imports = set()
+
+
+def add_helper_imports(ie, func):
+    def global_names(code):
+        names = set(code.co_names)
+        for const in code.co_consts:
+            if hasattr(const, 'co_names'):
+                names |= global_names(const)
+        return names
+
+    ie_globals = func.__globals__
+    for name in global_names(func.__code__):
+        if ismodule(ie_globals.get(name)):
+            continue
+        for helpers in (compat, utils):
+            if name in ie_globals and getattr(helpers, name, None) is ie_globals[name]:
+                helper_imports.add((helpers.__name__, name))
+                break
+
+
 def build_lazy_ie(ie, name):
     valid_url = getattr(ie, '_VALID_URL', None)
     s = ie_template.format(
@@ -55,6 +80,7 @@ def build_lazy_ie(ie, name):
         module=ie.__module__)
     if ie.suitable.__func__ is not InfoExtractor.suitable.__func__:
         s += '\n' + getsource(ie.suitable)
+        add_helper_imports(ie, ie.suitable.__func__)
     if hasattr(ie, '_make_valid_url'):
         # search extractors
         s += make_valid_template.format(valid_url=ie._make_valid_url())
@@ -83,16 +109,17 @@ while classes:
             break
 ordered_cls.append(_ALL_CLASSES[-1])
 
-names = []
 for ie in ordered_cls:
-    name = ie.__name__
-    src = build_lazy_ie(ie, name)
-    module_contents.append(src)
-    if ie in _ALL_CLASSES:
-        names.append(name)
+    module_contents.append(build_lazy_ie(ie, ie.__name__))
 
+# The order of the extractors is their priority in matching URLs
 module_contents.append(
-    '_ALL_CLASSES = [{0}]'.format(', '.join(names)))
+    '\n_ALL_CLASSES = [{0}]'.format(', '.join(ie.__name__ for ie in _ALL_CLASSES)))
+
+if helper_imports:
+    module_contents.insert(1, ''.join(
+        'from {0} import {1}\n'.format(module, name)
+        for module, name in sorted(helper_imports)) + '\n')
 
 module_src = '\n'.join(module_contents) + '\n'
 
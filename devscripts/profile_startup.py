@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+from __future__ import unicode_literals, print_function
+
+import collections
+import optparse
+import os
+import re
+import subprocess
+import sys
+import time
+
+
+ROOT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+
+def profile_imports(args):
+    """
+    Run youtube-dl with the given arguments (or just import youtube_dl if
+    there are none) and return a (wall time, imports) tuple, where imports
+    is a list of (module, self time, cumulative time) tuples in seconds.
+    """
+    if args:
+        cmd = [sys.executable, '-X', 'importtime', '-m', 'youtube_dl'] + args
+    else:
+        cmd = [sys.executable, '-X', 'importtime', '-c', 'import youtube_dl']
+    start = time.time()
+    p = subprocess.Popen(
+        cmd, cwd=ROOT_DIR, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    _, stderr = p.communicate()
+    wall_time = time.time() - start
+
+    imports = []
+    for line in stderr.decode('utf-8', 'replace').splitlines():
+        mobj = re.match(r'import time:\s+(\d+)\s+\|\s+(\d+)\s+\|\s+(.+)$', line)
+        if mobj:
+            imports.append((
+                mobj.group(3).strip(),
+                int(mobj.group(1)) / 1e6, int(mobj.group(2)) / 1e6))
+    return wall_time, imports
+
+
+def group_name(module):
+    parts = module.split('.')
+    if parts[0] != 'youtube_dl':
+        return '(non youtube_dl)'
+    return '.'.join(parts[:2])
+
+
+def main():
+    parser = optparse.OptionParser(usage='%prog [OPTIONS] [-- YOUTUBE-DL ARGS]')
+    parser.add_option(
+        '--top', type=int, default=20,
+        help='number of slowest modules to show (default: %default)')
+    parser.add_option(
+        '--budget', type=float, metavar='SECONDS',
+        help='exit with an error if startup takes longer than this')
+    options, args = parser.parse_args()
+
+    if sys.version_info < (3, 7):
+        parser.error('-X importtime requires Python 3.7 or later')
+
+    wall_time, imports = profile_imports(args)
+    if not imports:
+        parser.error('no import times were recorded')
+
+    print('Startup: %.3fs wall, %.3fs importing %d modules' % (
+        wall_time, sum(t for _, t, _ in imports), len(imports)))
+    if any(module == 'youtube_dl.extractor.extractors' for module, _, _ in imports):
+        print('All extractors were imported, run "make lazy-extractors" to load them lazily')
+
+    groups = collections.defaultdict(lambda: [0, 0.0])
+    for module, self_time, _ in imports:
+        group = groups[group_name(module)]
+        group[0] += 1
+        group[1] += self_time
+    print('\nBy package:')
+    for name, (count, self_time) in sorted(groups.items(), key=lambda g: -g[1][1]):
+        print('  %8.1fms  %4d  %s' % (self_time * 1000, count, name))
+
+    print('\nSlowest modules (self / cumulative):')
+    for module, self_time, cumulative in sorted(imports, key=lambda i: -i[1])[:options.top]:
+        print('  %8.1fms  %8.1fms  %s' % (self_time * 1000, cumulative * 1000, module))
+
+    if options.budget is not None and wall_time > options.budget:
+        print('\nStartup took %.3fs, exceeding the budget of %.3fs' % (wall_time, options.budget))
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
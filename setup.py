@@ -9,9 +9,11 @@ import sys
 
 try:
     from setuptools import setup, Command
+    from setuptools.command.build_py import build_py
     setuptools_available = True
 except ImportError:
     from distutils.core import setup, Command
+    from distutils.command.build_py import build_py
     setuptools_available = False
 from distutils.spawn import spawn
 
@@ -99,6 +101,15 @@ class build_lazy_extractors(Command):
             dry_run=self.dry_run,
         )
 
+
+class build_py_with_lazy_extractors(build_py):
+    def run(self):
+        # Startup is much faster with the extractors loaded lazily
+        if os.path.exists('devscripts/make_lazy_extractors.py'):
+            self.run_command('build_lazy_extractors')
+        build_py.run(self)
+
+
 setup(
     name='youtube_dl',
     version=__version__,
@@ -143,6 +154,9 @@ setup(
         'Programming Language :: Python :: Implementation :: PyPy',
     ],
 
-    cmdclass={'build_lazy_extractors': build_lazy_extractors},
+    cmdclass={
+        'build_lazy_extractors': build_lazy_extractors,
+        'build_py': build_py_with_lazy_extractors,
+    },
     **params
 )
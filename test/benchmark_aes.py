@@ -0,0 +1,61 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Measure the throughput of the AES implementations in youtube_dl.aes:
+# the table-driven one working on bytes and the reference one working on
+# lists of ints.
+#
+# Usage: python test/benchmark_aes.py [SIZE_IN_KIB]
+
+from __future__ import unicode_literals, print_function
+
+# Allow direct execution
+import os
+import sys
+import timeit
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from youtube_dl.aes import (
+    aes_cbc_decrypt_bytes,
+    aes_ctr_decrypt_bytes,
+    aes_decrypt,
+    key_expansion,
+)
+from youtube_dl.utils import bytes_to_intlist
+
+
+def reference_cbc_decrypt(data, key, iv):
+    expanded_key = key_expansion(key)
+    decrypted_data = []
+    previous_cipher_block = iv
+    for i in range(0, len(data), 16):
+        block = data[i:i + 16]
+        decrypted_data += [x ^ y for x, y in zip(aes_decrypt(block, expanded_key), previous_cipher_block)]
+        previous_cipher_block = block
+    return decrypted_data
+
+
+def throughput(func, size):
+    return size / min(timeit.repeat(func, number=1, repeat=3)) / 1024 / 1024
+
+
+def main():
+    size = (int(sys.argv[1]) if len(sys.argv) > 1 else 1024) * 1024
+    data = os.urandom(size)
+    iv = os.urandom(16)
+    for key_size in (16, 32):
+        key = os.urandom(key_size)
+        print('AES-%d, %d KiB' % (key_size * 8, size // 1024))
+        print('  CBC decrypt (tables):    %6.2f MiB/s' % throughput(
+            lambda: aes_cbc_decrypt_bytes(data, key, iv), size))
+        print('  CTR decrypt (tables):    %6.2f MiB/s' % throughput(
+            lambda: aes_ctr_decrypt_bytes(data, key, iv), size))
+        # The reference implementation is an order of magnitude slower
+        ref_size = min(size, 64 * 1024)
+        ref_data, ref_key, ref_iv = map(bytes_to_intlist, (data[:ref_size], key, iv))
+        print('  CBC decrypt (reference): %6.2f MiB/s' % throughput(
+            lambda: reference_cbc_decrypt(ref_data, ref_key, ref_iv), ref_size))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Measure the cost of calling a player-like signature function through
+# JSInterpreter: the first call of a new interpreter, which compiles the
+# function, and the following calls, which reuse the compiled code.
+#
+# Usage: python test/benchmark_jsinterp.py [CALLS]
+
+from __future__ import unicode_literals, print_function
+
+# Allow direct execution
+import os
+import sys
+import timeit
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from youtube_dl import jsinterp
+from youtube_dl.jsinterp import JSInterpreter
+
+
+PLAYER_CODE = '''
+var Xy={Ab:function(a,b){a.splice(0,b)},
+"cd":function(a){a.reverse()},
+ef:function(a,b){var c=a[0];a[0]=a[b%a.length];a[b%a.length]=c}};
+sig=function(a){a=a.split("");Xy.ef(a,37);Xy.Ab(a,2);Xy.cd(a,45);Xy.ef(a,(3+4)*2);
+Xy.ef(a,61);Xy.Ab(a,1);Xy.cd(a,7);Xy.ef(a,1<<3|1);return a.join("")};
+'''
+SIGNATURE = ''.join(chr(ord('A') + i % 26) for i in range(88))
+
+
+def cold_call():
+    jsinterp._compiled.clear()
+    return JSInterpreter(PLAYER_CODE).call_function('sig', SIGNATURE)
+
+
+def main():
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    jsi = JSInterpreter(PLAYER_CODE)
+    sig = jsi.extract_function('sig')
+    expected = cold_call()
+    assert sig([SIGNATURE]) == expected
+
+    cold_time = min(timeit.repeat(cold_call, number=calls // 10 or 1, repeat=3)) / (calls // 10 or 1)
+    new_time = min(timeit.repeat(
+        lambda: JSInterpreter(PLAYER_CODE).call_function('sig', SIGNATURE),
+        number=calls // 10 or 1, repeat=3)) / (calls // 10 or 1)
+    warm_time = min(timeit.repeat(lambda: sig([SIGNATURE]), number=calls, repeat=3)) / calls
+
+    print('first call, nothing compiled:  %8.1f us' % (cold_time * 1e6))
+    print('first call, new interpreter:   %8.1f us' % (new_time * 1e6))
+    print('later calls:                   %8.1f us' % (warm_time * 1e6))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Compare looking up the extractor for a URL through ExtractorIndex with the
+# linear walk over all the extractors, using the URLs of the extractor test
+# cases (the corpus test_all_urls.py checks).
+#
+# Usage: python test/benchmark_url_dispatch.py [ROUNDS]
+
+from __future__ import unicode_literals, print_function
+
+# Allow direct execution
+import os
+import sys
+import timeit
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from test.helper import gettestcases
+from youtube_dl.extractor import gen_extractor_classes
+from youtube_dl.extractor.dispatch import ExtractorIndex
+
+
+def linear_lookup(ies, url):
+    for ie in ies:
+        if ie.suitable(url):
+            return ie
+
+
+def index_lookup(index, url):
+    for ie in index.candidates(url):
+        if ie.suitable(url):
+            return ie
+
+
+def main():
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    ies = gen_extractor_classes()
+    urls = [tc['url'] for tc in gettestcases(include_onlymatching=True)]
+
+    # Compile all the regexes beforehand so that both are measured warm
+    for ie in ies:
+        ie.suitable('')
+
+    build_start = timeit.default_timer()
+    index = ExtractorIndex(lookup_threshold=0)
+    for ie in ies:
+        index.add(ie)
+    index.candidates('')
+    build_time = timeit.default_timer() - build_start
+
+    for url in urls:
+        assert linear_lookup(ies, url) is index_lookup(index, url), url
+
+    linear_time = min(timeit.repeat(
+        lambda: [linear_lookup(ies, url) for url in urls], number=1, repeat=rounds))
+    index_time = min(timeit.repeat(
+        lambda: [index_lookup(index, url) for url in urls], number=1, repeat=rounds))
+
+    print('%d extractors, %d URLs' % (len(ies), len(urls)))
+    print('index build:   %8.1f ms' % (build_time * 1000))
+    print('linear walk:   %8.1f us/URL' % (linear_time / len(urls) * 1e6))
+    print('indexed:       %8.1f us/URL (%.1fx)' % (
+        index_time / len(urls) * 1e6, linear_time / index_time))
+
+
+if __name__ == '__main__':
+    main()
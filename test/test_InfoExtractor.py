@@ -13,7 +13,7 @@ from test.helper import FakeYDL, expect_dict, expect_value, http_server_port
 from youtube_dl.compat import compat_etree_fromstring, compat_http_server
 from youtube_dl.extractor.common import InfoExtractor
 from youtube_dl.extractor import YoutubeIE, get_info_extractor
-from youtube_dl.utils import encode_data_uri, strip_jsonp, ExtractorError, RegexNotFoundError
+from youtube_dl.utils import encode_data_uri, strip_jsonp, ExtractorError, ParsedWebpage, RegexNotFoundError
 import threading
 
 
@@ -98,6 +98,55 @@ class TestInfoExtractor(unittest.TestCase):
         self.assertRaises(RegexNotFoundError, ie._html_search_meta, 'z', html, None, fatal=True)
         self.assertRaises(RegexNotFoundError, ie._html_search_meta, ('z', 'x'), html, None, fatal=True)
 
+    def test_parsed_webpage(self):
+        ie = self.ie
+        html = '''
+            <meta property="og:title" content="Foo">
+            <meta name="description" content="Some &amp; description">
+            <!-- <input type="hidden" name="gone" value="1"> -->
+            <script type="application/ld+json">
+                {"@context": "http://schema.org", "@type": "VideoObject", "name": "Bar", "duration": "PT1M"}
+            </script>
+            <script>var meta = '<meta property="og:image" content="http://example.com/pic.jpg">';</script>
+            <form><input type="hidden" name="token" value="abc"><input type="text" name="q" value=""></form>
+            <video poster="/poster.jpg"><source src="/video.mp4" type="video/mp4"><audio src="/inner.mp3"/></video>
+            <amp-audio src="/audio.mp3"/>
+        '''
+        webpage = ParsedWebpage(html)
+        for page in (html, webpage):
+            self.assertEqual(ie._og_search_title(page), 'Foo')
+            self.assertEqual(ie._og_search_thumbnail(page), 'http://example.com/pic.jpg')
+            self.assertEqual(ie._html_search_meta('description', page), 'Some & description')
+            self.assertEqual(ie._rta_search(page), 0)
+            self.assertEqual(ie._hidden_inputs(page), {'token': 'abc'})
+            self.assertEqual(ie._search_json_ld(page, None), {'title': 'Bar', 'duration': 60.0})
+        self.assertEqual(
+            ie._parse_html5_media_entries('http://example.com/', webpage, None),
+            ie._parse_html5_media_entries('http://example.com/', html, None))
+        self.assertEqual(len(webpage.scripts), 2)
+        for page in (html, webpage):
+            self.assertEqual(
+                ie._search_script_regex(r'var meta = \'(<meta[^>]+>)', page, 'meta'),
+                '<meta property="og:image" content="http://example.com/pic.jpg">')
+        # Only the scripts of a ParsedWebpage are searched
+        self.assertEqual(ie._search_script_regex(r'(<input[^>]+>)', html, 'input'), '<input type="hidden" name="gone" value="1">')
+        self.assertEqual(ie._search_script_regex(r'(<input[^>]+>)', webpage, 'input', default=None), None)
+
+        page = ie._download_parsed_webpage(
+            encode_data_uri(html.encode('utf-8'), 'text/html'), None)
+        self.assertTrue(isinstance(page, ParsedWebpage))
+        self.assertEqual(page, html)
+        self.assertEqual(ie._og_search_title(page), 'Foo')
+
+        # Quoted attribute values may contain '>'
+        html = '''
+            <meta property="og:title" content="A > B">
+            <meta name="description" content="Tom &amp; Jerry -> ...">
+        '''
+        for page in (html, ParsedWebpage(html)):
+            self.assertEqual(ie._og_search_title(page), 'A > B')
+            self.assertEqual(ie._html_search_meta('description', page), 'Tom & Jerry -> ...')
+
     def test_download_json(self):
         uri = encode_data_uri(b'{"foo": "blah"}', 'application/json')
         self.assertEqual(self.ie._download_json(uri, None), {'foo': 'blah'})
@@ -10,14 +10,25 @@ import unittest
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 import copy
+import io
+import json
+import threading
+import time
 
-from test.helper import FakeYDL, assertRegexpMatches
+from test.helper import FakeYDL, assertRegexpMatches, try_rm
 from youtube_dl import YoutubeDL
 from youtube_dl.compat import compat_str, compat_urllib_error
 from youtube_dl.extractor import YoutubeIE
 from youtube_dl.extractor.common import InfoExtractor
 from youtube_dl.postprocessor.common import PostProcessor
-from youtube_dl.utils import ExtractorError, match_filter_func
+from youtube_dl.utils import (
+    ExistingVideoReached,
+    ExtractorError,
+    InAdvancePagedList,
+    MaxDownloadsReached,
+    OnDemandPagedList,
+    match_filter_func,
+)
 
 TEST_URL = 'http://localhost/sample.mp4'
 
@@ -105,6 +116,31 @@ class TestFormatSelection(unittest.TestCase):
         downloaded = ydl.downloaded_info_dicts[0]
         self.assertEqual(downloaded['ext'], 'flv')
 
+    def test_sort_formats(self):
+        ydl = YDL()
+        formats = [
+            {'format_id': 'http', 'ext': 'mp4', 'url': TEST_URL},
+            {'format_id': 'hls', 'url': 'http://localhost/v.m3u8'},
+            {'format_id': 'rtsp', 'ext': 'mp4', 'url': 'rtsp://localhost/v'},
+            {'format_id': 'audio-m4a', 'ext': 'm4a', 'vcodec': 'none', 'url': TEST_URL},
+            {'format_id': 'audio-ogg', 'ext': 'ogg', 'vcodec': 'none', 'url': TEST_URL},
+            {'format_id': 'video-only', 'ext': 'mp4', 'acodec': 'none', 'url': TEST_URL},
+            {'format_id': 'f4m', 'url': 'http://localhost/v.f4m'},
+            {'format_id': 'preferred', 'ext': 'mp4', 'preference': 1, 'url': 'rtsp://localhost/v'},
+        ]
+        YoutubeIE(ydl)._sort_formats(formats)
+        self.assertEqual([f['format_id'] for f in formats], [
+            'audio-ogg', 'audio-m4a', 'video-only', 'f4m', 'rtsp', 'hls', 'http', 'preferred'])
+        self.assertEqual(formats[3]['ext'], 'f4m')
+
+        ydl.params['prefer_free_formats'] = True
+        YoutubeIE(ydl)._sort_formats(formats)
+        self.assertEqual([f['format_id'] for f in formats[:2]], ['audio-m4a', 'audio-ogg'])
+
+        YoutubeIE(ydl)._sort_formats(formats, field_preference=('preference', 'format_id'))
+        self.assertEqual([f['format_id'] for f in formats], [
+            'audio-m4a', 'audio-ogg', 'f4m', 'hls', 'http', 'rtsp', 'video-only', 'preferred'])
+
     def test_format_selection(self):
         formats = [
             {'format_id': '35', 'ext': 'mp4', 'preference': 1, 'url': TEST_URL},
@@ -872,6 +908,296 @@ class TestYoutubeDL(unittest.TestCase):
         self.assertEqual(result[1]['playlist_index'], 2)
         # @}
 
+    def test_concurrent_downloads(self):
+        entries = [{
+            'id': compat_str(i),
+            'title': compat_str(i),
+            'url': TEST_URL,
+        } for i in range(1, 9)]
+        playlist = {
+            '_type': 'playlist',
+            'id': 'test',
+            'entries': entries,
+            'extractor': 'test:playlist',
+            'extractor_key': 'test:playlist',
+            'webpage_url': 'http://example.com',
+        }
+
+        class ConcurrentYDL(YDL):
+            def process_info(self, info_dict):
+                # Make earlier entries slower so that they complete out of order
+                time.sleep(0.01 * (9 - int(info_dict['id'])))
+                with self._lock:
+                    self.threads.add(threading.current_thread())
+                    super(ConcurrentYDL, self).process_info(info_dict)
+
+        ydl = ConcurrentYDL({'concurrent_downloads': 4})
+        ydl.threads = set()
+        result = ydl.process_ie_result(copy.deepcopy(playlist))
+        self.assertEqual([e['id'] for e in result['entries']], [e['id'] for e in entries])
+        self.assertEqual(
+            sorted(int(e['id']) for e in ydl.downloaded_info_dicts), list(range(1, 9)))
+        self.assertTrue(len(ydl.threads) > 1)
+
+        class SimulateYDL(FakeYDL):
+            def to_screen(self, s, skip_eol=None):
+                pass
+
+        ydl = SimulateYDL({'simulate': True, 'max_downloads': 3, 'concurrent_downloads': 4})
+        self.assertRaises(
+            MaxDownloadsReached, ydl.process_ie_result, copy.deepcopy(playlist))
+        self.assertEqual(ydl._num_downloads, 3)
+
+    def test_playlist_prefetch(self):
+        extracted = []
+        second_extracted = threading.Event()
+
+        class PrefetchIE(InfoExtractor):
+            _VALID_URL = r'prefetch:(?P<id>\d+)'
+
+            def _real_extract(self, url):
+                video_id = self._match_id(url)
+                extracted.append(video_id)
+                if video_id == '2':
+                    second_extracted.set()
+                return _make_result([{'url': TEST_URL}], id=video_id, title=video_id)
+
+        class PrefetchYDL(YDL):
+            def process_info(self, info_dict):
+                if info_dict['id'] == '1':
+                    # The next entry is extracted while this one is downloaded
+                    self.prefetched = second_extracted.wait(5)
+                super(PrefetchYDL, self).process_info(info_dict)
+
+        ydl = PrefetchYDL({'playlist_prefetch': 2})
+        ydl.add_info_extractor(PrefetchIE(ydl))
+        result = ydl.process_ie_result({
+            '_type': 'playlist',
+            'id': 'test',
+            'entries': [{
+                '_type': 'url',
+                'url': 'prefetch:%d' % i,
+                'ie_key': 'Prefetch',
+            } for i in range(1, 6)],
+            'extractor': 'test:playlist',
+            'extractor_key': 'test:playlist',
+            'webpage_url': 'http://example.com',
+        })
+        self.assertTrue(ydl.prefetched)
+        self.assertEqual(sorted(extracted), ['1', '2', '3', '4', '5'])
+        self.assertEqual([e['id'] for e in result['entries']], ['1', '2', '3', '4', '5'])
+        self.assertEqual([e['id'] for e in ydl.downloaded_info_dicts], ['1', '2', '3', '4', '5'])
+        self.assertEqual(ydl._prefetched, {})
+
+    def test_lazy_playlist(self):
+        yielded = []
+
+        def make_entry(i):
+            yielded.append(i)
+            return {'id': compat_str(i), 'title': compat_str(i), 'url': TEST_URL}
+
+        def iter_entries():
+            for i in range(1, 6):
+                yield make_entry(i)
+
+        def get_page(pagenum):
+            return [make_entry(i) for i in range(pagenum * 2 + 1, min(pagenum * 2 + 3, 6))]
+
+        class LazyYDL(YDL):
+            def process_info(self, info_dict):
+                # Entries are downloaded before the next ones are extracted
+                self.yielded.append(len(yielded))
+                super(LazyYDL, self).process_info(info_dict)
+
+        def get_downloaded(entries, **params):
+            del yielded[:]
+            params['lazy_playlist'] = True
+            ydl = LazyYDL(params)
+            ydl.yielded = []
+            ydl.process_ie_result({
+                '_type': 'playlist',
+                'id': 'test',
+                'entries': entries,
+                'extractor': 'test:playlist',
+                'extractor_key': 'test:playlist',
+                'webpage_url': 'http://example.com',
+            })
+            return (
+                [(int(i['id']), i['playlist_index'], i['n_entries']) for i in ydl.downloaded_info_dicts],
+                ydl.yielded)
+
+        self.assertEqual(
+            get_downloaded(iter_entries()),
+            ([(i, i, None) for i in range(1, 6)], [1, 2, 3, 4, 5]))
+        self.assertEqual(
+            get_downloaded(iter_entries(), playliststart=2, playlistend=3),
+            ([(2, 2, None), (3, 3, None)], [2, 3]))
+        self.assertEqual(
+            get_downloaded(iter_entries(), playlist_items='4,2,9'),
+            ([(4, 4, None), (2, 2, None)], [4, 4]))
+        self.assertEqual(
+            get_downloaded(iter_entries(), playlist_items='2-3'),
+            ([(2, 2, None), (3, 3, None)], [2, 3]))
+        # Items counted from the end need all the entries
+        self.assertEqual(
+            get_downloaded(iter_entries(), playlist_items='2,0'),
+            ([(2, 2, 2), (5, 0, 2)], [5, 5]))
+        self.assertEqual(
+            get_downloaded(OnDemandPagedList(get_page, 2), playlist_items='0'),
+            ([(5, 0, 1)], [5]))
+        # Reversing needs all the entries
+        self.assertEqual(
+            get_downloaded(iter_entries(), playlistreverse=True, playliststart=2),
+            ([(5, 5, 4), (4, 4, 4), (3, 3, 4), (2, 2, 4)], [5, 5, 5, 5]))
+        self.assertEqual(
+            get_downloaded(OnDemandPagedList(get_page, 2, prefetch=0), playliststart=2),
+            ([(i, i, None) for i in range(2, 6)], [2, 4, 4, 5]))
+        self.assertEqual(
+            get_downloaded(InAdvancePagedList(get_page, 3, 2, prefetch=0), playlist_items='5,1'),
+            ([(5, 5, None), (1, 1, None)], [1, 3]))
+        self.assertEqual(
+            sorted(get_downloaded(iter_entries(), concurrent_downloads=3)[0]),
+            [(i, i, None) for i in range(1, 6)])
+
+    def test_flat_playlist_dump(self):
+        yielded = []
+
+        def iter_entries():
+            for i in range(1, 6):
+                yielded.append(i)
+                yield {'_type': 'url', 'url': 'http://example.com/%d' % i, 'ie_key': None, 'id': compat_str(i)}
+
+        class FlatYDL(YDL):
+            def to_stdout(self, message, skip_eol=False, check_quiet=False):
+                if message.startswith('{'):
+                    message = json.loads(message)
+                self.printed.append((len(yielded), message))
+
+            def prepare_filename(self, info_dict):
+                self.filenames.append(info_dict['id'])
+                return super(FlatYDL, self).prepare_filename(info_dict)
+
+        def dump(**params):
+            del yielded[:]
+            params.update({'extract_flat': 'in_playlist', 'forcejson': True})
+            ydl = FlatYDL(params)
+            ydl.printed = []
+            ydl.filenames = []
+            result = ydl.process_ie_result({
+                '_type': 'playlist',
+                'id': 'test',
+                'entries': iter_entries(),
+                'extractor': 'test:playlist',
+                'extractor_key': 'test:playlist',
+                'webpage_url': 'http://example.com',
+            })
+            return result, ydl
+
+        result, ydl = dump()
+        # Each entry is printed before the next one is extracted
+        self.assertEqual(ydl.printed, [(i, {
+            '_type': 'url',
+            'url': 'http://example.com/%d' % i,
+            'ie_key': None,
+            'id': compat_str(i),
+        }) for i in range(1, 6)])
+        self.assertEqual(result['entries'], [])
+        self.assertEqual(ydl.filenames, [])
+
+        result, ydl = dump(playlist_items='4,2', forcefilename=True)
+        self.assertEqual(
+            [m if i % 2 == 0 else m['id'] for i, (_, m) in enumerate(ydl.printed)],
+            ['4.NA', '4', '2.NA', '2'])
+        self.assertEqual(ydl.filenames, ['4', '2'])
+
+        result, ydl = dump(dump_single_json=True)
+        self.assertEqual(ydl.printed, [(5, e) for e in result['entries']])
+        self.assertEqual(len(result['entries']), 5)
+
+    def test_archive_prefilter(self):
+        archive_fn = os.path.join(
+            os.path.dirname(os.path.abspath(__file__)), 'test_archive_prefilter.txt')
+        with io.open(archive_fn, 'w', encoding='utf-8') as f:
+            f.write('archived 1\narchived 3\narchived 4\n')
+        self.addCleanup(try_rm, archive_fn)
+        extracted = []
+
+        class ArchivedIE(InfoExtractor):
+            _VALID_URL = r'archived:(?P<id>\d+)'
+
+            def _real_extract(self, url):
+                video_id = self._match_id(url)
+                extracted.append(video_id)
+                return _make_result([{'url': TEST_URL}], id=video_id, title=video_id)
+
+        def run(entries, **params):
+            del extracted[:]
+            params['download_archive'] = archive_fn
+            ydl = YDL(params)
+            ydl.add_info_extractor(ArchivedIE(ydl))
+            archive = ydl._get_download_archive()
+            ydl.lookups = []
+            filter_recorded = archive.filter_recorded
+
+            def counting_filter_recorded(vid_ids):
+                vid_ids = list(vid_ids)
+                ydl.lookups.append(len(vid_ids))
+                return filter_recorded(vid_ids)
+            archive.filter_recorded = counting_filter_recorded
+            ydl.prefetched_urls = []
+            prefetch = ydl._prefetch
+
+            def recording_prefetch(url, ie_key=None):
+                ydl.prefetched_urls.append(url)
+                return prefetch(url, ie_key)
+            ydl._prefetch = recording_prefetch
+            ydl.process_ie_result({
+                '_type': 'playlist',
+                'id': 'test',
+                'entries': entries,
+                'extractor': 'test:playlist',
+                'extractor_key': 'test:playlist',
+                'webpage_url': 'http://example.com',
+            })
+            return ydl
+
+        def make_entries(ids=range(1, 6)):
+            return [{
+                '_type': 'url',
+                'url': 'archived:%d' % i,
+                'ie_key': 'Archived',
+                'id': compat_str(i),
+            } for i in ids]
+
+        ydl = run(make_entries())
+        self.assertEqual(extracted, ['2', '5'])
+        self.assertEqual([i['playlist_index'] for i in ydl.downloaded_info_dicts], [2, 5])
+        self.assertEqual(ydl.lookups, [5])
+        self.assertTrue('[download] 3 has already been recorded in archive' in ydl.msgs)
+
+        # Only the entries already received are looked up together
+        ydl = run(iter(make_entries()), lazy_playlist=True)
+        self.assertEqual(extracted, ['2', '5'])
+        self.assertEqual(ydl.lookups, [1] * 5)
+
+        self.assertRaises(
+            ExistingVideoReached, run, make_entries()[1:], break_on_existing=True)
+        self.assertEqual(extracted, ['2'])
+
+        # Prefetching does not stop before the entries preceding an archived one
+        entries = [e for e in make_entries() if e['id'] in ('2', '3', '5')]
+        for prefetch in (0, 2):
+            self.assertRaises(
+                ExistingVideoReached, run, entries, break_on_existing=True,
+                playlist_prefetch=prefetch)
+            self.assertEqual(extracted, ['2'])
+
+        # Every upcoming entry is prefetched once, whichever ones are skipped
+        ydl = run(make_entries((1, 2, 3, 5, 6, 7)), playlist_prefetch=2)
+        self.assertEqual(sorted(extracted), ['2', '5', '6', '7'])
+        self.assertEqual(
+            ydl.prefetched_urls, ['archived:5', 'archived:6', 'archived:7'])
+
     def test_urlopen_no_file_protocol(self):
         # see https://github.com/ytdl-org/youtube-dl/issues/8227
         ydl = YDL()
@@ -8,7 +8,18 @@ import sys
 import unittest
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from youtube_dl.aes import aes_decrypt, aes_encrypt, aes_cbc_decrypt, aes_cbc_encrypt, aes_decrypt_text
+from youtube_dl.aes import (
+    aes_decrypt,
+    aes_encrypt,
+    aes_cbc_decrypt,
+    aes_cbc_decrypt_bytes,
+    aes_cbc_encrypt,
+    aes_cbc_encrypt_bytes,
+    aes_ctr_decrypt,
+    aes_ctr_decrypt_bytes,
+    aes_decrypt_text,
+    key_expansion,
+)
 from youtube_dl.utils import bytes_to_intlist, intlist_to_bytes
 import base64
 
@@ -41,6 +52,55 @@ class TestAES(unittest.TestCase):
             encrypted,
             b"\x97\x92+\xe5\x0b\xc3\x18\x91ky9m&\xb3\xb5@\xe6'\xc2\x96.\xc8u\x88\xab9-[\x9e|\xf1\xcd")
 
+    def test_cbc_bytes(self):
+        data = b"\x97\x92+\xe5\x0b\xc3\x18\x91ky9m&\xb3\xb5@\xe6'\xc2\x96.\xc8u\x88\xab9-[\x9e|\xf1\xcd"
+        key = intlist_to_bytes(self.key)
+        iv = intlist_to_bytes(self.iv)
+        self.assertEqual(aes_cbc_decrypt_bytes(data, key, iv).rstrip(b'\x08'), self.secret_msg)
+        self.assertEqual(aes_cbc_encrypt_bytes(self.secret_msg, key, iv), data)
+        self.assertEqual(aes_cbc_decrypt_bytes(bytearray(data), bytearray(key), iv).rstrip(b'\x08'), self.secret_msg)
+
+    def test_table_driven(self):
+        # Check the T-box implementation against the reference one
+        data = bytes_to_intlist(b'Secret message goes here, with more than two blocks')
+        for key in (list(range(16)), list(range(24)), list(range(32))):
+            expanded_key = key_expansion(key)
+            expected = []
+            previous_cipher_block = self.iv
+            for i in range(0, len(data), 16):
+                block = data[i:i + 16]
+                block += [0] * (16 - len(block))
+                expected += [x ^ y for x, y in zip(aes_decrypt(block, expanded_key), previous_cipher_block)]
+                previous_cipher_block = block
+            self.assertEqual(aes_cbc_decrypt(data, key, self.iv), expected[:len(data)])
+
+            class Counter(object):
+                def __init__(self, iv):
+                    self.iv = iv
+                    self.count = 0
+
+                def next_value(self):
+                    self.count += 1
+                    return self.iv[:15] + [self.count]
+
+            expected = []
+            counter = Counter(self.iv)
+            for i in range(0, len(data), 16):
+                counter_block = counter.next_value()
+                expected += [x ^ y for x, y in zip(data[i:i + 16], aes_encrypt(counter_block, expanded_key))]
+            self.assertEqual(aes_ctr_decrypt(data, key, Counter(self.iv)), expected)
+
+    def test_ctr_bytes(self):
+        key = intlist_to_bytes(list(range(16)))
+        iv = b'\xff' * 16
+        data = b'Secret message goes here, with more than two blocks'
+        keystream = b''.join(
+            intlist_to_bytes(aes_encrypt(bytes_to_intlist(counter_block), key_expansion(list(range(16)))))
+            for counter_block in (b'\xff' * 16, b'\x00' * 16, b'\x00' * 15 + b'\x01', b'\x00' * 15 + b'\x02'))
+        self.assertEqual(
+            aes_ctr_decrypt_bytes(data, key, iv),
+            intlist_to_bytes([x ^ y for x, y in zip(bytes_to_intlist(data), bytes_to_intlist(keystream))]))
+
     def test_decrypt_text(self):
         password = intlist_to_bytes(self.key).decode('utf-8')
         encrypted = base64.b64encode(
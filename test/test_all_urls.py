@@ -14,9 +14,11 @@ from test.helper import gettestcases
 
 from youtube_dl.extractor import (
     FacebookIE,
+    gen_extractor_classes,
     gen_extractors,
     YoutubeIE,
 )
+from youtube_dl.extractor.dispatch import ExtractorIndex
 
 
 class TestAllURLsMatching(unittest.TestCase):
@@ -94,6 +96,20 @@ class TestAllURLsMatching(unittest.TestCase):
                         ie.suitable(url),
                         '%s should not match URL %r . That URL belongs to %s.' % (type(ie).__name__, url, tc['name']))
 
+    def test_dispatch_index(self):
+        ies = gen_extractor_classes()
+        index = ExtractorIndex(lookup_threshold=0)
+        for ie in ies:
+            index.add(ie)
+        urls = [tc['url'] for tc in gettestcases(include_onlymatching=True)] + [
+            ':ytsubs', 'PL63F0C78739B09958', 'BaW_jenozKc', 'ytsearch5:youtube-dl test video',
+            'HTTP://WWW.YOUTUBE.COM/watch?v=BaW_jenozKc', 'https://example.com/\u0432\u0438\u0434\u0435\u043e']
+        for url in urls:
+            candidates = index.candidates(url)
+            for ie in ies:
+                if ie.suitable(url):
+                    self.assertTrue(ie in candidates, '%s should be a candidate for URL %r' % (ie.__name__, url))
+
     def test_keywords(self):
         self.assertMatch(':ytsubs', ['youtube:subscriptions'])
         self.assertMatch(':ytsubscriptions', ['youtube:subscriptions'])
@@ -129,6 +145,26 @@ class TestAllURLsMatching(unittest.TestCase):
                 len(ie_list), 1,
                 'Multiple extractors with the same IE_NAME "%s" (%s)' % (ie_name, ', '.join(ie_list)))
 
+    def test_embed_markers(self):
+        for ie in self.ies:
+            markers = ie._EMBED_MARKERS
+            if markers is None:
+                continue
+            self.assertTrue(isinstance(markers, tuple) and markers, ie.IE_NAME)
+            for marker in markers:
+                self.assertEqual(marker, marker.lower(), ie.IE_NAME)
+            # Embeds of the extractor's own test URLs must not be skipped
+            for tc in ie.get_testcases(include_onlymatching=True):
+                webpage = '<iframe src="%s"></iframe>' % tc['url']
+                try:
+                    found = ie._extract_urls(webpage)
+                except (AttributeError, TypeError):
+                    continue
+                if found:
+                    self.assertTrue(
+                        any(marker in webpage.lower() for marker in markers),
+                        '%s misses embed of %s' % (ie.IE_NAME, tc['url']))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+from __future__ import unicode_literals
+
+# Allow direct execution
+import io
+import os
+import sys
+import unittest
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from test.helper import try_rm
+from youtube_dl.archive import (
+    DownloadArchive,
+    open_download_archive,
+    SQLiteDownloadArchive,
+)
+from youtube_dl.utils import import_sqlite3
+
+
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+class TestDownloadArchive(unittest.TestCase):
+    def setUp(self):
+        self.filename = os.path.join(TEST_DIR, 'test_archive.txt')
+        try_rm(self.filename)
+
+    def tearDown(self):
+        try_rm(self.filename)
+
+    def test_missing_file(self):
+        archive = DownloadArchive(self.filename)
+        self.assertFalse('youtube abc' in archive)
+        self.assertFalse(os.path.exists(self.filename))
+
+    def test_add(self):
+        archive = DownloadArchive(self.filename)
+        archive.add('youtube abc')
+        self.assertTrue('youtube abc' in archive)
+        self.assertFalse('youtube ab' in archive)
+        with io.open(self.filename, 'r', encoding='utf-8') as f:
+            self.assertEqual(f.read(), 'youtube abc\n')
+        self.assertTrue('youtube abc' in DownloadArchive(self.filename))
+
+    def test_external_append(self):
+        with io.open(self.filename, 'w', encoding='utf-8') as f:
+            f.write('youtube abc\nvimeo 123\r\n  vimeo 456  \nyoutube ä')
+        archive = DownloadArchive(self.filename)
+        self.assertTrue('vimeo 123' in archive)
+        self.assertTrue('vimeo 456' in archive)
+        self.assertTrue('youtube ä' in archive)
+        self.assertFalse('youtube def' in archive)
+        # Entries appended by another process are picked up
+        with io.open(self.filename, 'a', encoding='utf-8') as f:
+            f.write('bc\nyoutube def\n')
+        self.assertTrue('youtube def' in archive)
+        self.assertTrue('youtube äbc' in archive)
+        # Rewritten archive is loaded from scratch
+        with io.open(self.filename, 'w', encoding='utf-8') as f:
+            f.write('dailymotion x\n')
+        self.assertTrue('dailymotion x' in archive)
+
+    def test_filter_recorded(self):
+        archive = DownloadArchive(self.filename)
+        self.assertEqual(archive.filter_recorded(['youtube abc']), set())
+        archive.add('youtube abc')
+        with io.open(self.filename, 'a', encoding='utf-8') as f:
+            f.write('vimeo 123\n')
+        self.assertEqual(
+            archive.filter_recorded(['youtube abc', 'vimeo 123', 'vimeo 456']),
+            set(['youtube abc', 'vimeo 123']))
+
+
+@unittest.skipIf(import_sqlite3() is None, 'sqlite3 module is not available')
+class TestSQLiteDownloadArchive(unittest.TestCase):
+    def setUp(self):
+        self.filename = os.path.join(TEST_DIR, 'test_archive.sqlite')
+        try_rm(self.filename)
+
+    def tearDown(self):
+        try_rm(self.filename)
+
+    def test_open(self):
+        self.assertTrue(isinstance(open_download_archive(self.filename), SQLiteDownloadArchive))
+        archive = SQLiteDownloadArchive(self.filename)
+        archive.add('youtube abc')
+        archive.close()
+        renamed = os.path.join(TEST_DIR, 'test_archive.renamed')
+        os.rename(self.filename, renamed)
+        try:
+            archive = open_download_archive(renamed)
+            self.assertTrue(isinstance(archive, SQLiteDownloadArchive))
+            self.assertTrue('youtube abc' in archive)
+            archive.close()
+        finally:
+            try_rm(renamed)
+
+    def test_add(self):
+        archive = SQLiteDownloadArchive(self.filename)
+        self.assertFalse('youtube abc' in archive)
+        archive.add('youtube abc')
+        archive.add('youtube abc')
+        self.assertTrue('youtube abc' in archive)
+        other = SQLiteDownloadArchive(self.filename)
+        self.assertTrue('youtube abc' in other)
+        other.add('youtube def')
+        self.assertTrue('youtube def' in archive)
+        archive.close()
+        other.close()
+
+    def test_filter_recorded(self):
+        archive = SQLiteDownloadArchive(self.filename)
+        archive._QUERY_BATCH_SIZE = 2
+        self.assertEqual(archive.filter_recorded([]), set())
+        for vid_id in ('youtube a', 'youtube b', 'youtube c'):
+            archive.add(vid_id)
+        self.assertEqual(
+            archive.filter_recorded(['youtube a', 'youtube x', 'youtube c', 'youtube b', 'youtube a']),
+            set(['youtube a', 'youtube b', 'youtube c']))
+        archive.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
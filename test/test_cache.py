@@ -3,7 +3,10 @@
 
 from __future__ import unicode_literals
 
+import io
 import shutil
+import threading
+import time
 
 # Allow direct execution
 import os
@@ -11,9 +14,12 @@ import sys
 import unittest
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-
-from test.helper import FakeYDL
+from test.helper import FakeYDL, http_server_port
+from youtube_dl import cache as cache_module
 from youtube_dl.cache import Cache
+from youtube_dl.utils import import_sqlite3
+from youtube_dl.compat import compat_http_server
+from youtube_dl.extractor.common import InfoExtractor
 
 
 def _is_empty(d):
@@ -26,6 +32,8 @@ def _mkdir(d):
 
 
 class TestCache(unittest.TestCase):
+    backend = 'file'
+
     def setUp(self):
         TEST_DIR = os.path.dirname(os.path.abspath(__file__))
         TESTDATA_DIR = os.path.join(TEST_DIR, 'testdata')
@@ -40,6 +48,7 @@ class TestCache(unittest.TestCase):
     def test_cache(self):
         ydl = FakeYDL({
             'cachedir': self.test_dir,
+            'cache_backend': self.backend,
         })
         c = Cache(ydl)
         obj = {'x': 1, 'y': ['ä', '\\a', True]}
@@ -54,6 +63,279 @@ class TestCache(unittest.TestCase):
         self.assertFalse(os.path.exists(self.test_dir))
         self.assertEqual(c.load('test_cache', 'k.'), None)
 
+    def test_max_age(self):
+        c = Cache(FakeYDL({
+            'cachedir': self.test_dir,
+            'cache_backend': self.backend,
+        }))
+        c.store('test_cache', 'k', 1)
+        self.assertEqual(c.load('test_cache', 'k', max_age=60), 1)
+        self.assertEqual(c.load('test_cache', 'k', max_age=-1), None)
+        self.assertEqual(c.load('test_cache', 'k'), 1)
+        c._SECTION_MAX_AGES = {'test_cache': -1}
+        self.assertEqual(c.load('test_cache', 'k'), None)
+        self.assertEqual(c.load('test_cache', 'k', max_age=60), 1)
+        c.close()
+
+    def test_evict(self):
+        c = Cache(FakeYDL({
+            'cachedir': self.test_dir,
+            'cache_backend': self.backend,
+        }))
+        for i in range(4):
+            c.store('test_cache', 'k%d' % i, 'x' * 1000)
+        c.store('other_cache', 'k', 'x' * 1000)
+        for i in (0, 3, 1):
+            # Make sure the accesses are ordered
+            time.sleep(0.01)
+            c.load('test_cache', 'k%d' % i)
+        c.evict('test_cache', 2500)
+        self.assertEqual(
+            [i for i in range(4) if c.load('test_cache', 'k%d' % i) is not None],
+            [1, 3])
+        self.assertEqual(c.load('other_cache', 'k'), 'x' * 1000)
+        c.close()
+
+    def test_concurrent_writes(self):
+        warnings = []
+        ydl = FakeYDL({
+            'cachedir': self.test_dir,
+            'cache_backend': self.backend,
+        })
+        ydl.report_warning = warnings.append
+        caches = [Cache(ydl) for _ in range(4)]
+        value = ['x' * 10000]
+
+        def worker(c):
+            for _ in range(20):
+                c.store('test_cache', 'k', value)
+                self.assertEqual(c.load('test_cache', 'k'), value)
+
+        threads = [threading.Thread(target=worker, args=(c, )) for c in caches]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(warnings, [])
+        for c in caches:
+            c.close()
+
+    def test_unavailable_backend(self):
+        warnings = []
+        ydl = FakeYDL({
+            'cachedir': self.test_dir,
+            'cache_backend': 'sqlite',
+        })
+        ydl.report_warning = warnings.append
+        c = Cache(ydl)
+        orig_import_sqlite3 = cache_module.import_sqlite3
+        cache_module.import_sqlite3 = lambda: None
+        try:
+            c.store('test_cache', 'k', 1)
+            self.assertEqual(c.load('test_cache', 'k', default=2), 2)
+            c.evict('test_cache', 0)
+        finally:
+            cache_module.import_sqlite3 = orig_import_sqlite3
+        self.assertEqual(len(warnings), 3)
+        self.assertTrue('sqlite3 module is required' in warnings[1])
+
+    def test_unusable_dir(self):
+        warnings = []
+        _mkdir(self.test_dir)
+        not_a_dir = os.path.join(self.test_dir, 'file')
+        io.open(not_a_dir, 'w').close()
+        ydl = FakeYDL({
+            'cachedir': os.path.join(not_a_dir, 'cache'),
+            'cache_backend': self.backend,
+        })
+        ydl.report_warning = warnings.append
+        c = Cache(ydl)
+        c.store('test_cache', 'k', 1)
+        self.assertEqual(c.load('test_cache', 'k', default=2), 2)
+        c.evict('test_cache', 0)
+        c.close()
+        self.assertTrue(warnings)
+
+
+@unittest.skipIf(import_sqlite3() is None, 'sqlite3 module is not available')
+class TestSQLiteCache(TestCache):
+    backend = 'sqlite'
+
+    def test_locked(self):
+        warnings = []
+        ydl = FakeYDL({
+            'cachedir': self.test_dir,
+            'cache_backend': self.backend,
+        })
+        ydl.report_warning = warnings.append
+        c = Cache(ydl)
+        c._get_backend()._TIMEOUT = 0.1
+        c.store('test_cache', 'k', 1)
+        conn = import_sqlite3().connect(
+            os.path.join(self.test_dir, 'cache.sqlite'), isolation_level=None)
+        try:
+            conn.execute('BEGIN EXCLUSIVE')
+            self.assertEqual(c.load('test_cache', 'k', default=2), 2)
+            c.evict('test_cache', 0)
+        finally:
+            conn.close()
+            c.close()
+        self.assertEqual(len(warnings), 2)
+        self.assertTrue('database is locked' in warnings[0])
+
+
+class HTTPCacheTestRequestHandler(compat_http_server.BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def respond(self):
+        self.server.requests.append((self.command, self.path, self.headers.get('If-None-Match')))
+        path = self.path.partition('?')[0]
+        if path == '/page' and self.headers.get('If-None-Match') == '"v1"':
+            self.send_response(304)
+            self.end_headers()
+            return
+        body = ('%s %d' % (self.path, len(self.server.requests))).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        if path == '/page':
+            self.send_header('ETag', '"v1"')
+        elif path == '/no-store':
+            self.send_header('Cache-Control', 'no-store')
+        elif path == '/max-age':
+            self.send_header('Cache-Control', 'public, max-age=0')
+        elif path == '/cookie':
+            self.send_header('Set-Cookie', 'session=abc; Path=/')
+            self.send_header('Set-Cookie', 'csrf=xyz; Expires=Wed, 01 Jan 2048 00:00:00 GMT; Path=/')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        self.respond()
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers['Content-Length']))
+        self.respond()
+
+
+class TestHTTPCache(unittest.TestCase):
+    def setUp(self):
+        TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+        TESTDATA_DIR = os.path.join(TEST_DIR, 'testdata')
+        _mkdir(TESTDATA_DIR)
+        self.test_dir = os.path.join(TESTDATA_DIR, 'http_cache_test')
+        self.tearDown()
+        self.httpd = compat_http_server.HTTPServer(
+            ('127.0.0.1', 0), HTTPCacheTestRequestHandler)
+        self.httpd.requests = []
+        self.port = http_server_port(self.httpd)
+        self.server_thread = threading.Thread(target=self.httpd.serve_forever)
+        self.server_thread.daemon = True
+        self.server_thread.start()
+
+    def tearDown(self):
+        if os.path.exists(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+    def make_ie(self, **params):
+        params.setdefault('http_cache', True)
+        params.setdefault('cachedir', self.test_dir)
+        return InfoExtractor(FakeYDL(params))
+
+    def url(self, path):
+        return 'http://127.0.0.1:%d%s' % (self.port, path)
+
+    def test_hit(self):
+        ie = self.make_ie()
+        content, urlh = ie._download_webpage_handle(self.url('/hit'), None)
+        self.assertEqual(content, '/hit 1')
+        # Responses are shared by extractor instances
+        content, urlh = self.make_ie()._download_webpage_handle(self.url('/hit'), None)
+        self.assertEqual(content, '/hit 1')
+        self.assertEqual(urlh.geturl(), self.url('/hit'))
+        self.assertEqual(urlh.getcode(), 200)
+        self.assertEqual(urlh.headers.get('Content-Type'), 'text/plain; charset=utf-8')
+        self.assertEqual(ie._download_webpage(self.url('/hit'), None, query={'a': 1}), '/hit?a=1 2')
+        self.assertEqual(ie._download_webpage(
+            self.url('/hit'), None, headers={'X-Foo': 'bar'}), '/hit 3')
+        self.assertEqual(ie._download_webpage(
+            self.url('/hit'), None, headers={'X-Foo': 'bar'}), '/hit 3')
+        self.assertEqual(len(self.httpd.requests), 3)
+
+    def test_post_not_cached(self):
+        ie = self.make_ie()
+        self.assertEqual(ie._download_webpage(self.url('/post'), None, data=b'x'), '/post 1')
+        self.assertEqual(ie._download_webpage(self.url('/post'), None, data=b'x'), '/post 2')
+        self.assertFalse(os.path.exists(os.path.join(self.test_dir, 'http')))
+
+    def test_cookies_replayed(self):
+        self.assertEqual(self.make_ie()._download_webpage(self.url('/cookie'), None), '/cookie 1')
+        # A fresh cookie jar gets the cookies set by the cached page
+        ie = self.make_ie()
+        self.assertEqual(ie._download_webpage(self.url('/cookie'), None), '/cookie 1')
+        self.assertEqual(len(self.httpd.requests), 1)
+        cookies = ie._get_cookies(self.url('/'))
+        self.assertEqual(cookies['session'].value, 'abc')
+        self.assertEqual(cookies['csrf'].value, 'xyz')
+
+    def test_disabled(self):
+        for params in ({'http_cache': False}, {'cachedir': False}):
+            ie = self.make_ie(**params)
+            ie._download_webpage(self.url('/disabled'), None)
+        ie._download_webpage(self.url('/disabled'), None)
+        self.assertEqual(len(self.httpd.requests), 3)
+        self.assertFalse(os.path.exists(self.test_dir))
+
+    def test_revalidate(self):
+        ie = self.make_ie(http_cache_ttl=0)
+        self.assertEqual(ie._download_webpage(self.url('/page'), None), '/page 1')
+        self.assertEqual(ie._download_webpage(self.url('/page'), None), '/page 1')
+        self.assertEqual(self.httpd.requests, [
+            ('GET', '/page', None), ('GET', '/page', '"v1"')])
+        # Entries without validators are downloaded again
+        self.assertEqual(ie._download_webpage(self.url('/no-validator'), None), '/no-validator 3')
+        self.assertEqual(ie._download_webpage(self.url('/no-validator'), None), '/no-validator 4')
+
+    def test_cache_control(self):
+        ie = self.make_ie()
+        self.assertEqual(ie._download_webpage(self.url('/no-store'), None), '/no-store 1')
+        self.assertEqual(ie._download_webpage(self.url('/no-store'), None), '/no-store 2')
+        self.assertEqual(ie._download_webpage(self.url('/max-age'), None), '/max-age 3')
+        self.assertEqual(ie._download_webpage(self.url('/max-age'), None), '/max-age 4')
+
+    def test_eviction(self):
+        ie = self.make_ie()
+        ie._download_webpage(self.url('/first'), None)
+        http_dir = os.path.join(self.test_dir, 'http')
+        first_fn = os.path.join(http_dir, os.listdir(http_dir)[0])
+        os.utime(first_fn, (0, 0))
+        ie = self.make_ie(http_cache_max_size=os.path.getsize(first_fn) + 10)
+        ie._download_webpage(self.url('/second'), None)
+        self.assertFalse(os.path.exists(first_fn))
+        self.assertEqual(len(os.listdir(http_dir)), 1)
+        self.assertEqual(ie._download_webpage(self.url('/second'), None), '/second 2')
+        self.assertEqual(ie._download_webpage(self.url('/first'), None), '/first 3')
+
+    def test_eviction_batched(self):
+        ie = self.make_ie(http_cache_max_size=1000)
+        http_cache = ie._downloader.http_cache
+        evictions = []
+        evict = http_cache.evict
+
+        def counting_evict(section, max_size):
+            evictions.append(section)
+            return evict(section, max_size)
+        http_cache.evict = counting_evict
+        # The size is only looked up again once the cache may be full
+        for i in range(3):
+            ie._download_webpage(self.url('/page%d' % i), None)
+        self.assertEqual(len(evictions), 1)
+        ie._downloader.params['http_cache_max_size'] = 0
+        ie._download_webpage(self.url('/page3'), None)
+        self.assertEqual(len(evictions), 2)
+        self.assertEqual(os.listdir(os.path.join(self.test_dir, 'http')), [])
+
 
 if __name__ == '__main__':
     unittest.main()
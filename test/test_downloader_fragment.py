@@ -0,0 +1,154 @@
+#!/usr/bin/env python
+# coding: utf-8
+from __future__ import unicode_literals
+
+# Allow direct execution
+import os
+import re
+import sys
+import time
+import unittest
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from test.helper import http_server_port, try_rm
+from youtube_dl import YoutubeDL
+from youtube_dl.aes import aes_cbc_encrypt_bytes
+from youtube_dl.compat import compat_http_server, compat_struct_pack
+from youtube_dl.downloader.dash import DashSegmentsFD
+from youtube_dl.downloader.hls import HlsFD
+from youtube_dl.utils import encodeFilename
+import threading
+
+try:
+    from socketserver import ThreadingMixIn
+except ImportError:  # Python 2
+    from SocketServer import ThreadingMixIn
+
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+FRAGMENT_COUNT = 12
+AES_KEY = b'0123456789abcdef'
+
+
+def fragment_content(index):
+    # Whole AES blocks, so that encrypted fragments are not padded
+    return ('fragment %06d;' % index).encode('utf-8') * (100 + index)
+
+
+class HTTPTestRequestHandler(compat_http_server.BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        if self.path in ('/index.m3u8', '/encrypted.m3u8'):
+            prefix = 'frag'
+            lines = ['#EXTM3U', '#EXT-X-TARGETDURATION:1']
+            if self.path == '/encrypted.m3u8':
+                prefix = 'encrypted'
+                lines.append('#EXT-X-KEY:METHOD=AES-128,URI="key"')
+            content = '\n'.join(
+                lines
+                + ['#EXTINF:1,\n%s/%d' % (prefix, i) for i in range(FRAGMENT_COUNT)]
+                + ['#EXT-X-ENDLIST']).encode('utf-8')
+        elif self.path == '/key':
+            content = AES_KEY
+        else:
+            mobj = re.match(r'^/(frag|encrypted)/(\d+)$', self.path)
+            assert mobj
+            index = int(mobj.group(2))
+            # Make earlier fragments slower so that they complete out of order
+            time.sleep(0.005 * ((FRAGMENT_COUNT - index) % 4))
+            content = fragment_content(index)
+            if mobj.group(1) == 'encrypted':
+                # The IV defaults to the media sequence number
+                content = aes_cbc_encrypt_bytes(
+                    content, AES_KEY, compat_struct_pack('>8xq', index))
+        self.send_response(200)
+        self.send_header('Content-Length', len(content))
+        self.end_headers()
+        self.wfile.write(content)
+
+
+class ThreadingHTTPServer(ThreadingMixIn, compat_http_server.HTTPServer):
+    daemon_threads = True
+
+
+class FakeLogger(object):
+    def debug(self, msg):
+        pass
+
+    def warning(self, msg):
+        pass
+
+    def error(self, msg):
+        pass
+
+
+class TestFragmentFD(unittest.TestCase):
+    def setUp(self):
+        self.httpd = ThreadingHTTPServer(
+            ('127.0.0.1', 0), HTTPTestRequestHandler)
+        self.port = http_server_port(self.httpd)
+        self.server_thread = threading.Thread(target=self.httpd.serve_forever)
+        self.server_thread.daemon = True
+        self.server_thread.start()
+
+    def download(self, fd_class, params, info_dict):
+        params['logger'] = FakeLogger()
+        ydl = YoutubeDL(params)
+        downloader = fd_class(ydl, params)
+        filename = 'testfile.mp4'
+        try_rm(encodeFilename(filename))
+        try:
+            self.assertTrue(downloader.real_download(filename, info_dict))
+            with open(encodeFilename(filename), 'rb') as f:
+                self.assertEqual(
+                    f.read(), b''.join(fragment_content(i) for i in range(FRAGMENT_COUNT)))
+            self.assertFalse(os.path.exists(encodeFilename(filename + '.ytdl')))
+            self.assertEqual(
+                os.path.exists(encodeFilename(filename + '.part-Frag1')),
+                params.get('keep_fragments', False))
+        finally:
+            try_rm(encodeFilename(filename))
+            for i in range(FRAGMENT_COUNT):
+                try_rm(encodeFilename('%s.part-Frag%d' % (filename, i + 1)))
+
+    def download_dash(self, params):
+        self.download(DashSegmentsFD, params, {
+            'fragment_base_url': 'http://127.0.0.1:%d/' % self.port,
+            'fragments': [{'path': 'frag/%d' % i} for i in range(FRAGMENT_COUNT)],
+        })
+
+    def download_hls(self, params, path='/index.m3u8'):
+        self.download(HlsFD, params, {
+            'url': 'http://127.0.0.1:%d%s' % (self.port, path),
+        })
+
+    def test_sequential(self):
+        self.download_dash({})
+        self.download_hls({})
+
+    def test_concurrent(self):
+        self.download_dash({'concurrent_fragment_downloads': 4})
+        self.download_hls({'concurrent_fragment_downloads': 4})
+
+    def test_hls_aes128(self):
+        self.download_hls({}, '/encrypted.m3u8')
+        self.download_hls({'concurrent_fragment_downloads': 4}, '/encrypted.m3u8')
+
+    def test_keep_fragments(self):
+        self.download_dash({'keep_fragments': True})
+        self.download_dash({'keep_fragments': True, 'concurrent_fragment_downloads': 4})
+
+    def test_concurrent_buffer_limit(self):
+        # Force workers to wait for the fragments to be appended
+        DashSegmentsFD._FRAGMENT_BUFFER_LIMIT = 1
+        try:
+            self.download_dash({'concurrent_fragment_downloads': 4})
+        finally:
+            del DashSegmentsFD._FRAGMENT_BUFFER_LIMIT
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -3,23 +3,36 @@
 from __future__ import unicode_literals
 
 # Allow direct execution
+import io
+import json
 import os
 import re
 import sys
+import time
 import unittest
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from test.helper import http_server_port, try_rm
 from youtube_dl import YoutubeDL
-from youtube_dl.compat import compat_http_server
+from youtube_dl.compat import compat_http_server, compat_str
 from youtube_dl.downloader.http import HttpFD
 from youtube_dl.utils import encodeFilename
 import threading
 
+try:
+    from socketserver import ThreadingMixIn
+except ImportError:  # Python 2
+    from SocketServer import ThreadingMixIn
+
 TEST_DIR = os.path.dirname(os.path.abspath(__file__))
 
 
 TEST_SIZE = 10 * 1024
+RANGED_CONTENT = bytes(bytearray(i % 251 for i in range(100 * 1024)))
+
+
+class ThreadingHTTPServer(ThreadingMixIn, compat_http_server.HTTPServer):
+    daemon_threads = True
 
 
 class HTTPTestRequestHandler(compat_http_server.BaseHTTPRequestHandler):
@@ -53,8 +66,44 @@ class HTTPTestRequestHandler(compat_http_server.BaseHTTPRequestHandler):
         self.end_headers()
         self.wfile.write(b'#' * size)
 
+    def serve_ranged(self, flaky=False, broken=False):
+        start, end = map(int, re.match(
+            r'^bytes=(\d+)-(\d+)$', self.headers['Range']).groups())
+        self.server.requested_ranges.append((start, end))
+        content = RANGED_CONTENT[start:end + 1]
+        self.send_response(206)
+        self.send_header('Content-Type', 'video/mp4')
+        self.send_header('Content-Range', 'bytes %d-%d/%d' % (start, end, len(RANGED_CONTENT)))
+        self.send_header('Content-Length', len(content))
+        self.end_headers()
+        if flaky and end > start and end not in self.server.failed_ends:
+            # Drop the connection halfway once per segment
+            self.server.failed_ends.add(end)
+            content = content[:len(content) // 2]
+        if broken:
+            if start == 0 and end > 0:
+                # The first segment always fails
+                content = content[:len(content) // 2]
+            else:
+                # The others are served slowly
+                try:
+                    for i in range(0, len(content), 1024):
+                        self.wfile.write(content[i:i + 1024])
+                        time.sleep(0.02)
+                except (IOError, OSError):
+                    pass  # The client stopped reading
+                self.server.slow_segments_done.release()
+                return
+        self.wfile.write(content)
+
     def do_GET(self):
-        if self.path == '/regular':
+        if self.path == '/ranged':
+            self.serve_ranged()
+        elif self.path == '/flaky':
+            self.serve_ranged(flaky=True)
+        elif self.path == '/broken':
+            self.serve_ranged(broken=True)
+        elif self.path == '/regular':
             self.serve()
         elif self.path == '/no-content-length':
             self.serve(content_length=False)
@@ -79,7 +128,7 @@ class FakeLogger(object):
 
 class TestHttpFD(unittest.TestCase):
     def setUp(self):
-        self.httpd = compat_http_server.HTTPServer(
+        self.httpd = ThreadingHTTPServer(
             ('127.0.0.1', 0), HTTPTestRequestHandler)
         self.port = http_server_port(self.httpd)
         self.server_thread = threading.Thread(target=self.httpd.serve_forever)
@@ -110,6 +159,105 @@ class TestHttpFD(unittest.TestCase):
             'http_chunk_size': 1000,
         })
 
+    def test_connections_unsupported(self):
+        # Servers not answering with partial content get a single connection
+        self.download_all({
+            'http_connections': 4,
+        })
+
+
+class TestHttpFDConnections(unittest.TestCase):
+    def setUp(self):
+        self.httpd = ThreadingHTTPServer(
+            ('127.0.0.1', 0), HTTPTestRequestHandler)
+        self.httpd.requested_ranges = []
+        self.httpd.failed_ends = set()
+        self.httpd.slow_segments_done = threading.Semaphore(0)
+        self.port = http_server_port(self.httpd)
+        self.server_thread = threading.Thread(target=self.httpd.serve_forever)
+        self.server_thread.daemon = True
+        self.server_thread.start()
+        self._min_segment_size = HttpFD._MIN_SEGMENT_SIZE
+        HttpFD._MIN_SEGMENT_SIZE = 16 * 1024
+        self.filename = os.path.join(TEST_DIR, 'testfile_segmented.mp4')
+        self.remove_files()
+
+    def tearDown(self):
+        HttpFD._MIN_SEGMENT_SIZE = self._min_segment_size
+        self.remove_files()
+
+    def remove_files(self):
+        for fn in (self.filename, self.filename + '.part', self.filename + '.ytdl'):
+            try_rm(encodeFilename(fn))
+
+    def download_segmented(self, params, ep='ranged'):
+        params['logger'] = FakeLogger()
+        ydl = YoutubeDL(params)
+        downloader = HttpFD(ydl, params)
+        self.assertTrue(downloader.real_download(self.filename, {
+            'url': 'http://127.0.0.1:%d/%s' % (self.port, ep),
+        }))
+        with io.open(encodeFilename(self.filename), 'rb') as f:
+            self.assertEqual(f.read(), RANGED_CONTENT)
+        self.assertFalse(os.path.exists(encodeFilename(self.filename + '.ytdl')))
+        # Leave out the size probe
+        return sorted(r for r in self.httpd.requested_ranges if r != (0, 0))
+
+    def test_segmented(self):
+        self.assertEqual(self.download_segmented({'http_connections': 4}), [
+            (0, 25599), (25600, 51199), (51200, 76799), (76800, 102399)])
+
+    def test_segment_count(self):
+        # Segments are not smaller than _MIN_SEGMENT_SIZE
+        self.assertEqual(len(self.download_segmented({'http_connections': 16})), 6)
+
+    def test_retry(self):
+        self.assertEqual(self.download_segmented({
+            'http_connections': 2,
+            'retries': 1,
+        }, 'flaky'), [(0, 51199), (25600, 51199), (51200, 102399), (76800, 102399)])
+
+    def test_resume(self):
+        segments = [
+            {'start': 0, 'end': 51199, 'downloaded': 51200},
+            {'start': 51200, 'end': 102399, 'downloaded': 1000},
+        ]
+        with io.open(encodeFilename(self.filename + '.part'), 'wb') as f:
+            f.write(RANGED_CONTENT[:52200])
+            f.write(b'\0' * (len(RANGED_CONTENT) - 52200))
+        with io.open(encodeFilename(self.filename + '.ytdl'), 'w', encoding='utf-8') as f:
+            f.write(compat_str(json.dumps({
+                'downloader': {
+                    'segments': segments,
+                    'filesize': len(RANGED_CONTENT),
+                },
+            })))
+        self.assertEqual(self.download_segmented({
+            'http_connections': 2,
+            'continuedl': True,
+        }), [(52200, 102399)])
+
+    def test_stop_on_failure(self):
+        params = {
+            'http_connections': 4,
+            'retries': 0,
+            'ignoreerrors': True,
+            'logger': FakeLogger(),
+        }
+        downloader = HttpFD(YoutubeDL(params), params)
+        self.assertFalse(downloader.real_download(self.filename, {
+            'url': 'http://127.0.0.1:%d/broken' % self.port,
+        }))
+        with io.open(encodeFilename(self.filename + '.ytdl'), encoding='utf-8') as f:
+            segments = json.load(f)['downloader']['segments']
+        # The other segments stopped once the first one gave up
+        self.assertTrue(all(
+            segment['downloaded'] < segment['end'] - segment['start'] + 1
+            for segment in segments))
+        # Let the server finish sending them
+        for _ in segments[1:]:
+            self.httpd.slow_segments_done.acquire()
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -11,6 +11,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from test.helper import http_server_port
 from youtube_dl import YoutubeDL
 from youtube_dl.compat import compat_http_server, compat_urllib_request
+from youtube_dl.utils import HTTP_KEEP_ALIVE_SUPPORTED
 import ssl
 import threading
 
@@ -106,6 +107,61 @@ class TestHTTPS(unittest.TestCase):
         self.assertEqual(r['entries'][0]['url'], 'https://127.0.0.1:%d/vid.mp4' % self.port)
 
 
+class KeepAliveRequestHandler(compat_http_server.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self.server.client_ports.append(self.client_address[1])
+        content = b'keep-alive content' * 1000
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain')
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+        if self.path == '/drop':
+            # Close the connection without telling the client
+            self.close_connection = True
+
+
+@unittest.skipUnless(HTTP_KEEP_ALIVE_SUPPORTED, 'keep-alive is not supported')
+class TestKeepAlive(unittest.TestCase):
+    def setUp(self):
+        self.httpd = compat_http_server.HTTPServer(
+            ('127.0.0.1', 0), KeepAliveRequestHandler)
+        self.httpd.client_ports = []
+        self.port = http_server_port(self.httpd)
+        self.server_thread = threading.Thread(target=self.httpd.serve_forever)
+        self.server_thread.daemon = True
+        self.server_thread.start()
+        self.ydl = YoutubeDL({'logger': FakeLogger()})
+
+    def tearDown(self):
+        self.ydl.__exit__()
+
+    def urlopen(self, path):
+        return self.ydl.urlopen('http://127.0.0.1:%d%s' % (self.port, path))
+
+    def test_reuse(self):
+        for _ in range(3):
+            self.assertEqual(self.urlopen('/').read(), b'keep-alive content' * 1000)
+        self.assertEqual(len(set(self.httpd.client_ports)), 1)
+
+    def test_partially_read(self):
+        response = self.urlopen('/')
+        response.read(10)
+        response.close()
+        self.urlopen('/').read()
+        self.assertEqual(len(set(self.httpd.client_ports)), 2)
+
+    def test_dropped_connection(self):
+        self.urlopen('/drop').read()
+        self.assertEqual(self.urlopen('/').read(), b'keep-alive content' * 1000)
+        self.assertEqual(len(set(self.httpd.client_ports)), 2)
+
+
 def _build_proxy_handler(name):
     class HTTPTestRequestHandler(compat_http_server.BaseHTTPRequestHandler):
         proxy_name = name
@@ -8,7 +8,8 @@ import sys
 import unittest
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from youtube_dl.jsinterp import JSInterpreter
+from youtube_dl.jsinterp import JSInterpreter, _compile_statements
+from youtube_dl.utils import ExtractorError
 
 
 class TestJSInterpreter(unittest.TestCase):
@@ -73,8 +74,6 @@ class TestJSInterpreter(unittest.TestCase):
         self.assertEqual(jsi.call_function('f'), -11)
 
     def test_comments(self):
-        'Skipping: Not yet fully implemented'
-        return
         jsi = JSInterpreter('''
         function x() {
             var x = /* 1 + */ 2;
@@ -112,6 +111,62 @@ class TestJSInterpreter(unittest.TestCase):
         ''')
         self.assertEqual(jsi.call_function('z'), 5)
 
+    def test_recursion(self):
+        jsi = JSInterpreter('''
+        function f(a) { return g(a + 1); }
+        function g(a) { return f(a + 1); }
+        function h(a) { return g(a) + 1; }
+        function k() { return 1; }
+        ''')
+        with self.assertRaises(ExtractorError) as cm:
+            jsi.call_function('f', 0)
+        self.assertTrue('Recursion limit reached' in str(cm.exception))
+        # The depth is restored once the calls unwind
+        self.assertEqual(jsi.call_function('k'), 1)
+        with self.assertRaises(ExtractorError):
+            jsi.call_function('h', 0)
+
+    def test_associativity(self):
+        jsi = JSInterpreter('function f(){return 10 - 2 - 3;}')
+        self.assertEqual(jsi.call_function('f'), 5)
+
+        jsi = JSInterpreter('function f(){return 2 * 3 % 4 + 1 << 2 | 1;}')
+        self.assertEqual(jsi.call_function('f'), 13)
+
+        jsi = JSInterpreter('function f(a){return -a + 1;}')
+        self.assertEqual(jsi.call_function('f', 3), -2)
+
+    def test_strings(self):
+        jsi = JSInterpreter('''function f(){var x = 'a;"b' + "c\\"d"; return x;}''')
+        self.assertEqual(jsi.call_function('f'), 'a;"bc"d')
+
+    def test_signature_function(self):
+        jsi = JSInterpreter('''
+        var Xy={Ab:function(a,b){a.splice(0,b)},
+        "cd":function(a){a.reverse()},
+        ef:function(a,b){var c=a[0];a[0]=a[b%a.length];a[b%a.length]=c}};
+        sig=function(a){a=a.split("");Xy.Ab(a,2);Xy["cd"](a,45);Xy.ef(a,3);return a.join("")};
+        ''')
+        self.assertEqual(jsi.call_function('sig', 'abcdefgh'), 'egfhdc')
+        self.assertEqual(jsi.call_function('sig', '0123456789'), '68795432')
+
+        # The extracted parts of the code are enough to run it again
+        jsi = JSInterpreter(jsi.extracted_code())
+        self.assertEqual(jsi.call_function('sig', 'abcdefgh'), 'egfhdc')
+
+    def test_compiled_once(self):
+        code = 'var x = 1; return x + a;'
+        self.assertTrue(_compile_statements(code) is _compile_statements(code))
+        jsi = JSInterpreter('')
+        f = jsi.build_function(['a'], code)
+        self.assertEqual(f([1]), 2)
+        self.assertEqual(jsi.build_function(['a'], code)([2]), 3)
+        self.assertEqual(f([3]), 4)
+
+    def test_unsupported(self):
+        jsi = JSInterpreter('function f(){if (x) {return 1}}')
+        self.assertRaises(ExtractorError, jsi.call_function, 'f')
+
 
 if __name__ == '__main__':
     unittest.main()
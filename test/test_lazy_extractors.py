@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+# coding: utf-8
+from __future__ import unicode_literals
+
+# Allow direct execution
+import io
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from youtube_dl.extractor import _lazy_extractors_outdated, gen_extractors
+
+
+rootDir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class TestLazyExtractors(unittest.TestCase):
+    def test_generated_module(self):
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            fn = os.path.join(tmp_dir, 'lazy_extractors.py')
+            subprocess.check_call(
+                [sys.executable, os.path.join('devscripts', 'make_lazy_extractors.py'), fn],
+                cwd=rootDir)
+            # Compiled as bytes, so that the coding declaration is honoured
+            with open(fn, 'rb') as f:
+                lazy = {}
+                exec(compile(f.read(), fn, 'exec'), lazy)
+        finally:
+            shutil.rmtree(tmp_dir)
+
+        ies = gen_extractors()
+        lazy_classes = lazy['_ALL_CLASSES']
+        self.assertEqual(
+            [klass.__name__ for klass in lazy_classes],
+            [type(ie).__name__ for ie in ies])
+        for ie, lazy_ie in zip(ies, lazy_classes):
+            self.assertEqual(lazy_ie.ie_key(), ie.ie_key())
+            for tc in ie.get_testcases(include_onlymatching=True):
+                self.assertTrue(lazy_ie.suitable(tc['url']), '%s: %s' % (lazy_ie.__name__, tc['url']))
+        # Instantiating imports the actual extractor
+        self.assertEqual(type(lazy['YoutubeIE']()).__module__, 'youtube_dl.extractor.youtube')
+
+    def test_outdated(self):
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            extractor_dir = os.path.join(tmp_dir, 'youtube_dl', 'extractor')
+            os.makedirs(extractor_dir)
+
+            def touch(name, mtime):
+                fn = os.path.join(extractor_dir, name)
+                io.open(fn, 'w').close()
+                os.utime(fn, (mtime, mtime))
+
+            now = time.time()
+            touch('lazy_extractors.py', now)
+            touch('common.py', now - 10)
+            touch('foo.py', now + 10)
+            # Only source checkouts are checked
+            self.assertFalse(_lazy_extractors_outdated(extractor_dir))
+            os.mkdir(os.path.join(tmp_dir, '.git'))
+            self.assertTrue(_lazy_extractors_outdated(extractor_dir))
+            touch('foo.py', now - 10)
+            self.assertFalse(_lazy_extractors_outdated(extractor_dir))
+            touch('lazy_extractors.py', now - 20)
+            self.assertTrue(_lazy_extractors_outdated(extractor_dir))
+        finally:
+            shutil.rmtree(tmp_dir)
+
+
+if __name__ == '__main__':
+    unittest.main()
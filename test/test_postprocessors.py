@@ -3,15 +3,83 @@
 from __future__ import unicode_literals
 
 # Allow direct execution
+import io
 import os
+import shutil
 import sys
 import unittest
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from youtube_dl.postprocessor import MetadataFromTitlePP
+from test.helper import FakeYDL
+from youtube_dl.postprocessor import FFmpegPostProcessor, MetadataFromTitlePP
+from youtube_dl.postprocessor import ffmpeg
+
+
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
 
 
 class TestMetadataFromTitle(unittest.TestCase):
     def test_format_to_regex(self):
         pp = MetadataFromTitlePP(None, '%(title)s - %(artist)s')
         self.assertEqual(pp._titleregex, r'(?P<title>.+)\ \-\ (?P<artist>.+)')
+
+
+FAKE_FFMPEG = """#!/bin/sh
+echo run >> "$(dirname "$0")/runs"
+echo "ffmpeg version 4.2.1 Copyright (c) 2000-2019 the FFmpeg developers"
+"""
+
+
+@unittest.skipIf(os.name == 'nt', 'shell script executables are not supported on Windows')
+class TestFFmpegVersions(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = os.path.join(TEST_DIR, 'testdata', 'ffmpeg_test')
+        self.bin_dir = os.path.join(self.test_dir, 'bin')
+        self.tearDown()
+        os.makedirs(self.bin_dir)
+        for program in ('ffmpeg', 'ffprobe'):
+            self.write_program(program)
+
+    def tearDown(self):
+        ffmpeg._exe_versions.clear()
+        if os.path.exists(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+    def write_program(self, program):
+        fn = os.path.join(self.bin_dir, program)
+        with io.open(fn, 'w') as f:
+            f.write(FAKE_FFMPEG)
+        os.chmod(fn, 0o755)
+
+    def runs(self):
+        with io.open(os.path.join(self.bin_dir, 'runs')) as f:
+            return len(f.readlines())
+
+    def get_versions(self):
+        return FFmpegPostProcessor.get_versions(FakeYDL({
+            'ffmpeg_location': self.bin_dir,
+            'cachedir': os.path.join(self.test_dir, 'cache'),
+        }))
+
+    def test_memoized(self):
+        self.assertEqual(self.get_versions(), {
+            'ffmpeg': '4.2.1',
+            'ffprobe': '4.2.1',
+            'avconv': False,
+            'avprobe': False,
+        })
+        self.assertEqual(self.runs(), 2)
+        self.get_versions()
+        self.assertEqual(self.runs(), 2)
+
+        # Versions are persisted in the cache across processes
+        ffmpeg._exe_versions.clear()
+        self.assertEqual(self.get_versions()['ffmpeg'], '4.2.1')
+        self.assertEqual(self.runs(), 2)
+
+        # Unless the executable changes
+        ffmpeg._exe_versions.clear()
+        fn = os.path.join(self.bin_dir, 'ffmpeg')
+        os.utime(fn, (0, 0))
+        self.assertEqual(self.get_versions()['ffmpeg'], '4.2.1')
+        self.assertEqual(self.runs(), 3)
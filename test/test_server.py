@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+# coding: utf-8
+from __future__ import unicode_literals
+
+# Allow direct execution
+import io
+import json
+import os
+import sys
+import unittest
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from youtube_dl import YoutubeDL
+from youtube_dl.compat import compat_str
+from youtube_dl.extractor.common import InfoExtractor
+from youtube_dl.server import JobServer
+from youtube_dl.utils import ExtractorError
+
+
+class JobTestIE(InfoExtractor):
+    _VALID_URL = r'job:(?P<id>\w+)'
+
+    def _real_extract(self, url):
+        video_id = self._match_id(url)
+        if video_id == 'broken':
+            raise ExtractorError('broken video', expected=True)
+        self.to_screen('%s: extracting' % video_id)
+        return {
+            'id': video_id,
+            'title': 'Video %s' % video_id,
+            'url': 'http://example.com/%s.mp4' % video_id,
+            'format_note': self._downloader.params.get('format_note_param'),
+        }
+
+
+class TestJobServer(unittest.TestCase):
+    def serve(self, jobs, **params):
+        params.setdefault('simulate', True)
+        ydl = YoutubeDL(params, auto_init=False)
+        ydl.add_info_extractor(JobTestIE(ydl))
+        server = JobServer(ydl)
+        out = io.StringIO()
+        retcode = server.serve(io.StringIO(''.join(
+            (job if isinstance(job, compat_str) else json.dumps(job)) + '\n' for job in jobs)), out)
+        self.assertEqual(retcode, 0)
+        return ydl, server, [json.loads(line) for line in out.getvalue().splitlines()]
+
+    def test_jobs(self):
+        ydl, _, messages = self.serve([
+            {'id': 1, 'url': 'job:first', 'download': False},
+            {'id': 'second', 'url': 'job:second', 'params': {'format_note_param': 'override'}},
+            {'id': 3, 'url': 'job:third'},
+        ])
+        results = [m for m in messages if m['type'] == 'result']
+        self.assertEqual([r['id'] for r in results], [1, 'second', 3])
+        self.assertEqual([r['info']['id'] for r in results], ['first', 'second', 'third'])
+        self.assertEqual(results[0]['info']['title'], 'Video first')
+        # Overrides only apply to their job
+        self.assertEqual(
+            [r['info']['format_note'] for r in results], [None, 'override', None])
+        self.assertFalse('format_note_param' in ydl.params)
+        self.assertTrue({
+            'id': 1, 'type': 'log', 'level': 'debug', 'message': '[JobTest] first: extracting',
+        } in messages)
+
+    def test_errors(self):
+        ydl, _, messages = self.serve([
+            'not json',
+            '[1, 2]',
+            {'id': 1},
+            {'id': 2, 'url': 'job:x', 'params': {'proxy': 'http://127.0.0.1:1'}},
+            {'id': 3, 'url': 'job:broken'},
+            {'id': 4, 'url': 'job:ok'},
+        ])
+        errors = [m for m in messages if m['type'] == 'error']
+        self.assertEqual([e['id'] for e in errors], [None, None, 1, 2, 3])
+        self.assertEqual(errors[3]['error'], 'Invalid job: proxy cannot be changed per job')
+        self.assertTrue('broken video' in errors[4]['error'])
+        # The server keeps running after failed jobs
+        self.assertEqual(messages[-1]['type'], 'result')
+        self.assertEqual(messages[-1]['info']['id'], 'ok')
+
+    def test_progress(self):
+        ydl, server, _ = self.serve([])
+        out = server._out = io.StringIO()
+        server._job_id = 7
+        server._report_progress({
+            'status': 'downloading',
+            'downloaded_bytes': 10,
+            'total_bytes': 100,
+            'eta': None,
+            'info_dict': {},
+        })
+        self.assertEqual(json.loads(out.getvalue()), {
+            'id': 7,
+            'type': 'progress',
+            'status': 'downloading',
+            'downloaded_bytes': 10,
+            'total_bytes': 100,
+        })
+
+
+if __name__ == '__main__':
+    unittest.main()
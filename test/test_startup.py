@@ -0,0 +1,110 @@
+#!/usr/bin/env python
+# coding: utf-8
+from __future__ import unicode_literals
+
+# Allow direct execution
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+rootDir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Maximum wall time in seconds (best of a few runs) of a cold start with
+# lazily loaded extractors, e.g. 1.0 on an idle machine; see
+# devscripts/profile_startup.py for details. Wall time depends too much on
+# the machine for the budget tests to run unless it is set.
+STARTUP_BUDGET = os.environ.get('YOUTUBE_DL_STARTUP_BUDGET')
+
+# Extractor modules that may be imported before any URL is looked at
+STARTUP_EXTRACTOR_MODULES = set((
+    'youtube_dl.extractor',
+    'youtube_dl.extractor.common',
+    'youtube_dl.extractor.dispatch',
+    'youtube_dl.extractor.lazy_extractors',
+))
+
+# Modules that are only needed by some runs and must be imported on first use
+DEFERRED_MODULES = (
+    'ctypes',
+    'getpass',
+    'gzip',
+    'sqlite3',
+    'youtube_dl.extractor.openload',
+    'youtube_dl.postprocessor',
+)
+
+
+class TestStartup(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # Measure a release-like copy, where the extractors are loaded lazily
+        cls.tmp_dir = tempfile.mkdtemp()
+        shutil.copytree(
+            os.path.join(rootDir, 'youtube_dl'), os.path.join(cls.tmp_dir, 'youtube_dl'),
+            ignore=shutil.ignore_patterns('__pycache__', '*.pyc', 'lazy_extractors.py'))
+        subprocess.check_call([
+            sys.executable, os.path.join(rootDir, 'devscripts', 'make_lazy_extractors.py'),
+            os.path.join(cls.tmp_dir, 'youtube_dl', 'extractor', 'lazy_extractors.py')])
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.tmp_dir)
+
+    def run_youtube_dl(self, args):
+        # Let the copy cache its bytecode like an installed package would
+        env = dict(os.environ)
+        env.pop('PYTHONDONTWRITEBYTECODE', None)
+        p = subprocess.Popen(
+            [sys.executable] + args, cwd=self.tmp_dir, env=env,
+            stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        stdout, stderr = p.communicate()
+        self.assertEqual(p.returncode, 0, stderr)
+        return stdout.decode('utf-8')
+
+    def assertStartupWithin(self, args, budget):
+        # The first run also compiles the sources
+        times = []
+        for _ in range(3):
+            start = time.time()
+            self.run_youtube_dl(args)
+            times.append(time.time() - start)
+        self.assertLessEqual(
+            min(times), budget,
+            'Startup of %s took %.3fs, exceeding the budget of %.3fs' % (' '.join(args), min(times), budget))
+
+    @unittest.skipUnless(STARTUP_BUDGET, 'YOUTUBE_DL_STARTUP_BUDGET is not set')
+    def test_import_budget(self):
+        self.assertStartupWithin(['-c', 'import youtube_dl'], float(STARTUP_BUDGET))
+
+    @unittest.skipUnless(STARTUP_BUDGET, 'YOUTUBE_DL_STARTUP_BUDGET is not set')
+    def test_version_budget(self):
+        self.assertStartupWithin(['-m', 'youtube_dl', '--version'], float(STARTUP_BUDGET))
+
+    def imported_modules(self, code):
+        # Python 2 keeps None placeholders for failed relative imports
+        return self.run_youtube_dl([
+            '-c', 'import sys; %s; print("\\n".join(k for k, v in sys.modules.items() if v is not None))'
+            % code]).split()
+
+    def test_extractors_not_imported(self):
+        modules = self.imported_modules('import youtube_dl')
+        self.assertTrue('youtube_dl.extractor.lazy_extractors' in modules)
+        self.assertEqual(
+            set(m for m in modules if m.startswith('youtube_dl.extractor')) - STARTUP_EXTRACTOR_MODULES,
+            set())
+
+    def test_deferred_modules_not_imported(self):
+        modules = self.imported_modules(
+            'import youtube_dl; youtube_dl.YoutubeDL({"quiet": True})')
+        self.assertEqual(
+            [m for m in DEFERRED_MODULES if m in modules], [])
+
+
+if __name__ == '__main__':
+    unittest.main()
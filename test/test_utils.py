@@ -13,6 +13,8 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 # Various small unit tests
 import io
 import json
+import threading
+import time
 import xml.etree.ElementTree
 
 from youtube_dl.utils import (
@@ -25,6 +27,7 @@ from youtube_dl.utils import (
     DateRange,
     detect_exe_version,
     determine_ext,
+    determine_protocol,
     dict_get,
     encode_compat_str,
     encodeFilename,
@@ -59,6 +62,7 @@ from youtube_dl.utils import (
     parse_iso8601,
     parse_resolution,
     parse_bitrate,
+    ParsedWebpage,
     pkcs1pad,
     read_batch_urls,
     sanitize_filename,
@@ -111,6 +115,7 @@ from youtube_dl.compat import (
     compat_getenv,
     compat_os_name,
     compat_setenv,
+    compat_str,
     compat_urlparse,
     compat_parse_qs,
 )
@@ -378,6 +383,16 @@ class TestUtil(unittest.TestCase):
         self.assertEqual(determine_ext('http://example.com/foo/bar.m3u8//?download'), 'm3u8')
         self.assertEqual(determine_ext('foobar', None), None)
 
+    def test_determine_protocol(self):
+        self.assertEqual(determine_protocol({'url': 'http://example.com/foo.mp4', 'protocol': 'rtmp'}), 'rtmp')
+        self.assertEqual(determine_protocol({'url': 'http://example.com/foo.mp4'}), 'http')
+        self.assertEqual(determine_protocol({'url': 'https://example.com/foo.mp4?x=y'}), 'https')
+        self.assertEqual(determine_protocol({'url': 'https://example.com/foo.m3u8?x=y'}), 'm3u8')
+        self.assertEqual(determine_protocol({'url': 'rtmpe://example.com/app'}), 'rtmp')
+        self.assertEqual(determine_protocol({'url': 'HTTP://example.com/foo'}), 'http')
+        self.assertEqual(determine_protocol({'url': 'ftp://example.com/foo.mp4'}), 'ftp')
+        self.assertEqual(determine_protocol({'url': '//example.com/foo.mp4'}), '')
+
     def test_find_xpath_attr(self):
         testxml = '''<root>
             <node/>
@@ -642,6 +657,79 @@ class TestUtil(unittest.TestCase):
         testPL(5, 2, (2, 99), [2, 3, 4])
         testPL(5, 2, (20, 99), [])
 
+    def test_paged_list_prefetch(self):
+        lock = threading.Lock()
+        state = {'running': 0, 'max_running': 0, 'fetched': []}
+
+        def get_page(pagenum):
+            with lock:
+                state['running'] += 1
+                state['max_running'] = max(state['max_running'], state['running'])
+                state['fetched'].append(pagenum)
+            time.sleep(0.05)
+            with lock:
+                state['running'] -= 1
+            if pagenum >= 5:
+                raise ValueError('no page %d' % pagenum)
+            return [pagenum * 2, pagenum * 2 + 1] if pagenum < 4 else [8]
+
+        def wait_for_pages(threads):
+            # Wait for the pages still fetched in the background
+            for t in set(threading.enumerate()) - threads:
+                t.join()
+
+        def test(pl, sliceargs, expected, max_running):
+            state.update({'running': 0, 'max_running': 0, 'fetched': []})
+            threads = set(threading.enumerate())
+            self.assertEqual(pl.getslice(*sliceargs), expected)
+            wait_for_pages(threads)
+            self.assertEqual(state['max_running'], max_running)
+            return sorted(state['fetched'])
+
+        # Pages are fetched one at a time unless prefetch is enabled
+        test(OnDemandPagedList(get_page, 2), (), list(range(9)), 1)
+        pl = OnDemandPagedList(get_page, 2)
+        pl.set_default_prefetch(3)
+        test(pl, (), list(range(9)), 3)
+        pl = OnDemandPagedList(get_page, 2, prefetch=0)
+        pl.set_default_prefetch(3)
+        test(pl, (), list(range(9)), 1)
+
+        # The errors of the pages fetched ahead past the end are ignored
+        test(OnDemandPagedList(get_page, 2, prefetch=4), (), list(range(9)), 4)
+        self.assertEqual(
+            test(OnDemandPagedList(get_page, 2, prefetch=4), (1, 5), [1, 2, 3, 4], 3),
+            [0, 1, 2])
+        self.assertEqual(
+            test(OnDemandPagedList(get_page, 2, prefetch=0), (), list(range(9)), 1),
+            [0, 1, 2, 3, 4])
+        pl = OnDemandPagedList(get_page, 2, prefetch=2)
+        test(pl, (0, 4), [0, 1, 2, 3], 2)
+        self.assertEqual(test(pl, (2, 6), [2, 3, 4, 5], 1), [2])
+        pl = OnDemandPagedList(get_page, 2, use_cache=False, prefetch=2)
+        self.assertEqual(test(pl, (0, 4), [0, 1, 2, 3], 2), [0, 1])
+        self.assertEqual(test(pl, (0, 4), [0, 1, 2, 3], 2), [0, 1])
+
+        # Without use_cache, the pages fetched ahead are not kept once the
+        # iteration stops
+        pl = OnDemandPagedList(get_page, 2, use_cache=False, prefetch=3)
+        threads = set(threading.enumerate())
+        entries = pl.iterslice()
+        self.assertEqual(next(entries), 0)
+        entries.close()
+        wait_for_pages(threads)
+        self.assertEqual(pl._cache, {})
+        self.assertEqual(pl._pending, {})
+
+        self.assertEqual(
+            test(InAdvancePagedList(get_page, 5, 2, prefetch=8), (), list(range(9)), 5),
+            [0, 1, 2, 3, 4])
+        self.assertEqual(
+            test(InAdvancePagedList(get_page, 5, 2, prefetch=8), (3, 6), [3, 4, 5], 3),
+            [1, 2, 3])
+        self.assertRaises(
+            ValueError, InAdvancePagedList(get_page, 6, 2).getslice)
+
     def test_read_batch_urls(self):
         f = io.StringIO('''\xef\xbb\xbf foo
             bar\r
@@ -1066,6 +1154,29 @@ class TestUtil(unittest.TestCase):
         # Malformed HTML should not break attributes extraction on older Python
         self.assertEqual(extract_attributes('<mal"formed/>'), {})
 
+    def test_parsed_webpage(self):
+        webpage = ParsedWebpage(
+            '<META name="a" content="1"><!-- <input name="b"> --><input name="c">'
+            '<script type="application/ld+json">{}</script><script>"<meta name=d>"</script>'
+            '<video><audio/></video><amp-video/><input\nname="e"><!--\n<input name="f">\n-->')
+        self.assertTrue(isinstance(webpage, compat_str))
+        self.assertEqual(webpage.meta_html, '<META name="a" content="1">\n<meta name=d>')
+        self.assertEqual(webpage.input_html, '<input name="c">\n<input\nname="e">\n<input name="f">')
+        self.assertEqual(webpage.media_html, '<video><audio/></video>\n<amp-video/>')
+        self.assertEqual(webpage.scripts, [({'type': 'application/ld+json'}, '{}'), ({}, '"<meta name=d>"')])
+        self.assertEqual(webpage.script_text, '{}\n"<meta name=d>"')
+        self.assertEqual(webpage.json_ld, ['{}'])
+        self.assertEqual(ParsedWebpage('').scripts, [])
+        self.assertEqual(ParsedWebpage('').json_ld, [])
+        # Quoted attribute values may contain '>'
+        webpage = ParsedWebpage(
+            '<meta content="a > b" name=x><input value=\'>\' name="y"><video title="<>"/>'
+            '<script data-x="a>b">1</script>')
+        self.assertEqual(webpage.meta_html, '<meta content="a > b" name=x>')
+        self.assertEqual(webpage.input_html, '<input value=\'>\' name="y">')
+        self.assertEqual(webpage.media_html, '<video title="<>"/>')
+        self.assertEqual(webpage.scripts, [({'data-x': 'a>b'}, '1')])
+
     def test_clean_html(self):
         self.assertEqual(clean_html('a:\nb'), 'a: b')
         self.assertEqual(clean_html('a:\n   "b"'), 'a:    "b"')
@@ -10,6 +10,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 import io
 import re
+import shutil
 import string
 
 from test.helper import FakeYDL
@@ -96,6 +97,51 @@ class TestPlayerInfo(unittest.TestCase):
             self.assertEqual(player_id, expected_player_id)
 
 
+PLAYER_URL = 'https://www.youtube.com/s/player/64dddad9/player_ias.vflset/en_US/base.js'
+PLAYER_CODE = '''
+var filler = "%s";
+var Xy={Ab:function(a,b){a.splice(0,b)},
+cd:function(a){a.reverse()},
+ef:function(a,b){var c=a[0];a[0]=a[b%%a.length];a[b%%a.length]=c}};
+var ab=function(a){a=a.split("");Xy.ef(a,3);Xy.Ab(a,2);Xy.cd(a,1);return a.join("")};
+c&&d.set(b,encodeURIComponent(ab(decodeURIComponent(c))));
+''' % ('x' * 100000)
+
+
+class PlayerCacheTestIE(YoutubeIE):
+    def _download_webpage(self, url_or_request, *args, **kwargs):
+        self.player_downloads += 1
+        return PLAYER_CODE
+
+
+class TestPlayerCache(unittest.TestCase):
+    def setUp(self):
+        TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+        self.cache_dir = os.path.join(TEST_DIR, 'testdata', 'player_cache_test')
+        self.tearDown()
+
+    def tearDown(self):
+        if os.path.exists(self.cache_dir):
+            shutil.rmtree(self.cache_dir)
+
+    def decrypt(self, sig):
+        ie = PlayerCacheTestIE(FakeYDL({'cachedir': self.cache_dir}))
+        ie.player_downloads = 0
+        return ie._decrypt_signature(sig, None, PLAYER_URL), ie.player_downloads
+
+    def test_player_cache(self):
+        self.assertEqual(self.decrypt('0123456789'), ('98765402', 1))
+        players_dir = os.path.join(self.cache_dir, 'youtube-players')
+        self.assertEqual(os.listdir(players_dir), ['64dddad9.json'])
+        self.assertTrue(os.path.getsize(os.path.join(players_dir, '64dddad9.json')) < 1000)
+        # Signatures of another length do not need the player again
+        self.assertEqual(self.decrypt('abcdefghijkl'), ('lkjihgfeac', 0))
+
+        # Neither do other processes
+        shutil.rmtree(os.path.join(self.cache_dir, 'youtube-sigfuncs'))
+        self.assertEqual(self.decrypt('0123456789'), ('98765402', 0))
+
+
 class TestSignature(unittest.TestCase):
     def setUp(self):
         TEST_DIR = os.path.dirname(os.path.abspath(__file__))
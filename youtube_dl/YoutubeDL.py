@@ -5,7 +5,6 @@ from __future__ import absolute_import, unicode_literals
 
 import collections
 import contextlib
-import copy
 import datetime
 import errno
 import fileinput
@@ -22,6 +21,7 @@ import subprocess
 import socket
 import sys
 import time
+import threading
 import tokenize
 import traceback
 import random
@@ -62,8 +62,8 @@ from .utils import (
     GeoRestrictedError,
     int_or_none,
     ISO3166Utils,
-    locked_file,
     make_HTTPS_handler,
+    ExistingVideoReached,
     MaxDownloadsReached,
     orderedSet,
     PagedList,
@@ -94,19 +94,11 @@ from .utils import (
     YoutubeDLHandler,
     YoutubeDLRedirectHandler,
 )
-from .cache import Cache
+from .archive import open_download_archive
+from .cache import Cache, HTTPCache
 from .extractor import get_info_extractor, gen_extractor_classes, _LAZY_LOADER
-from .extractor.openload import PhantomJSwrapper
+from .extractor.dispatch import ExtractorIndex
 from .downloader import get_suitable_downloader
-from .downloader.rtmp import rtmpdump_version
-from .postprocessor import (
-    FFmpegFixupM3u8PP,
-    FFmpegFixupM4aPP,
-    FFmpegFixupStretchedPP,
-    FFmpegMergerPP,
-    FFmpegPostProcessor,
-    get_postprocessor,
-)
 from .version import __version__
 
 if compat_os_name == 'nt':
@@ -172,6 +164,15 @@ class YoutubeDL(object):
     playlist_items:    Specific indices of playlist to download.
     playlistreverse:   Download playlist items in reverse order.
     playlistrandom:    Download playlist items in random order.
+    lazy_playlist:     Process the entries of a playlist as they are
+                       extracted instead of collecting them first
+                       (n_entries is then None, unless the entries are
+                       reversed or shuffled).
+    concurrent_downloads: Number of URLs or playlist entries to extract and
+                       download concurrently (default is 1).
+    playlist_prefetch: Number of upcoming playlist entries to extract in the
+                       background while the current one is downloaded, and
+                       of playlist pages to fetch at the same time.
     matchtitle:        Download only matching titles.
     rejecttitle:       Reject downloads for matching titles.
     logger:            Log messages to a logging.Logger instance.
@@ -193,6 +194,15 @@ class YoutubeDL(object):
     skip_download:     Skip the actual download of the video file
     cachedir:          Location of the cache files in the filesystem.
                        False to disable filesystem cache.
+    cache_backend:     How the cache is stored in the cache directory: "file"
+                       (default) for a JSON file per entry or "sqlite" for a
+                       single SQLite database.
+    http_cache:        Cache the web pages and API responses downloaded by the
+                       extractors in the cache directory.
+    http_cache_ttl:    Number of seconds cached responses are used without
+                       revalidation (default 3600).
+    http_cache_max_size: Maximum size in bytes of the cached responses
+                       (default 100 MiB).
     noplaylist:        Download single video instead of a playlist if in doubt.
     age_limit:         An integer representing the user's age in years.
                        Unsuitable videos for the given age are skipped.
@@ -207,7 +217,11 @@ class YoutubeDL(object):
                        downloaded. None for no limit.
     download_archive:  File name of a file where all downloads are recorded.
                        Videos already present in the file are not downloaded
-                       again.
+                       again. Files with a .db, .sqlite or .sqlite3 extension
+                       (or existing SQLite databases) are used as an SQLite
+                       archive instead of a plain text one.
+    break_on_existing: Stop the download process when encountering a video
+                       that is in the download archive.
     cookiefile:        File name where cookies should be read from and dumped to.
     nocheckcertificate:Do not verify SSL certificates
     prefer_insecure:   Use HTTP instead of HTTPS to retrieve information.
@@ -225,7 +239,10 @@ class YoutubeDL(object):
     encoding:          Use this encoding instead of the system-specified.
     extract_flat:      Do not resolve URLs, return the immediate result.
                        Pass in 'in_playlist' to only show this behavior for
-                       playlist items.
+                       playlist items. With forcejson (and without
+                       dump_single_json) the entries of a playlist are
+                       printed as they are extracted and are not kept in
+                       the returned result.
     postprocessors:    A list of dictionaries, each with an entry
                        * key:  The name of the postprocessor. See
                                youtube_dl/postprocessor/__init__.py for a list.
@@ -305,7 +322,7 @@ class YoutubeDL(object):
     nopart, updatetime, buffersize, ratelimit, min_filesize, max_filesize, test,
     noresizebuffer, retries, continuedl, noprogress, consoletitle,
     xattr_set_filesize, external_downloader_args, hls_use_mpegts,
-    http_chunk_size.
+    http_chunk_size, http_connections, concurrent_fragment_downloads.
 
     The following options are used by the post processors:
     prefer_ffmpeg:     If False, use avconv instead of ffmpeg if both are available,
@@ -322,6 +339,9 @@ class YoutubeDL(object):
                         care about DASH.
     """
 
+    # Number of playlist entries looked up at once in the download archive
+    _ARCHIVE_BATCH_SIZE = 1000
+
     _NUMERIC_FIELDS = set((
         'width', 'height', 'tbr', 'abr', 'asr', 'vbr', 'fps', 'filesize', 'filesize_approx',
         'timestamp', 'upload_year', 'upload_month', 'upload_day',
@@ -338,6 +358,7 @@ class YoutubeDL(object):
     _pps = []
     _download_retcode = None
     _num_downloads = None
+    _download_archive = None
     _screen_file = None
 
     def __init__(self, params=None, auto_init=True):
@@ -346,10 +367,17 @@ class YoutubeDL(object):
             params = {}
         self._ies = []
         self._ies_instances = {}
+        self._ie_index = ExtractorIndex()
         self._pps = []
         self._progress_hooks = []
         self._download_retcode = 0
         self._num_downloads = 0
+        # Guards the state shared by concurrent downloads
+        self._lock = threading.RLock()
+        self._output_lock = threading.Lock()
+        self._thread_local = threading.local()
+        # Extractions started ahead of time, by (ie_key, url)
+        self._prefetched = {}
         self._screen_file = [sys.stdout, sys.stderr][params.get('logtostderr', False)]
         self._err_file = sys.stderr
         self.params = {
@@ -358,6 +386,7 @@ class YoutubeDL(object):
         }
         self.params.update(params)
         self.cache = Cache(self)
+        self.http_cache = HTTPCache(self)
 
         def check_deprecated(param, option, suggestion):
             if self.params.get(param) is not None:
@@ -423,6 +452,8 @@ class YoutubeDL(object):
             self.add_default_info_extractors()
 
         for pp_def_raw in self.params.get('postprocessors', []):
+            # Postprocessors are only imported when some are requested
+            from .postprocessor import get_postprocessor
             pp_class = get_postprocessor(pp_def_raw['key'])
             pp_def = dict(pp_def_raw)
             del pp_def['key']
@@ -453,6 +484,7 @@ class YoutubeDL(object):
     def add_info_extractor(self, ie):
         """Add an InfoExtractor object to the end of the list."""
         self._ies.append(ie)
+        self._ie_index.add(ie)
         if not isinstance(ie, type):
             self._ies_instances[ie.ie_key()] = ie
             ie.set_downloader(self)
@@ -463,10 +495,11 @@ class YoutubeDL(object):
         the _ies list, if there's no instance it will create a new one and add
         it to the extractor list.
         """
-        ie = self._ies_instances.get(ie_key)
-        if ie is None:
-            ie = get_info_extractor(ie_key)()
-            self.add_info_extractor(ie)
+        with self._lock:
+            ie = self._ies_instances.get(ie_key)
+            if ie is None:
+                ie = get_info_extractor(ie_key)()
+                self.add_info_extractor(ie)
         return ie
 
     def add_default_info_extractors(self):
@@ -503,7 +536,8 @@ class YoutubeDL(object):
         return self.to_stdout(message, skip_eol, check_quiet=True)
 
     def _write_string(self, s, out=None):
-        write_string(s, out=out, encoding=self.params.get('encoding'))
+        with self._output_lock:
+            write_string(s, out=out, encoding=self.params.get('encoding'))
 
     def to_stdout(self, message, skip_eol=False, check_quiet=False):
         """Print message to stdout if not in quiet mode."""
@@ -565,6 +599,16 @@ class YoutubeDL(object):
         if self.params.get('cookiefile') is not None:
             self.cookiejar.save(ignore_discard=True, ignore_expires=True)
 
+        if self._download_archive is not None:
+            self._download_archive.close()
+
+        self.cache.close()
+        self.http_cache.close()
+
+        # Close the connections kept alive by the HTTP handlers
+        for handler in self._opener.handlers:
+            handler.close()
+
     def trouble(self, message=None, tb=None):
         """Determine action to take when a download problem appears.
 
@@ -640,7 +684,10 @@ class YoutubeDL(object):
             autonumber_size = self.params.get('autonumber_size')
             if autonumber_size is None:
                 autonumber_size = 5
-            template_dict['autonumber'] = self.params.get('autonumber_start', 1) - 1 + self._num_downloads
+            # With concurrent downloads the number of the download being
+            # processed by this thread, not the latest one
+            num_downloads = getattr(self._thread_local, 'num_downloads', self._num_downloads)
+            template_dict['autonumber'] = self.params.get('autonumber_start', 1) - 1 + num_downloads
             if template_dict.get('resolution') is None:
                 if template_dict.get('width') and template_dict.get('height'):
                     template_dict['resolution'] = '%dx%d' % (template_dict['width'], template_dict['height'])
@@ -751,6 +798,8 @@ class YoutubeDL(object):
         if age_restricted(info_dict.get('age_limit'), self.params.get('age_limit')):
             return 'Skipping "%s" because it is age restricted' % video_title
         if self.in_download_archive(info_dict):
+            if self.params.get('break_on_existing', False):
+                raise ExistingVideoReached()
             return '%s has already been recorded in archive' % video_title
 
         if not incomplete:
@@ -782,7 +831,7 @@ class YoutubeDL(object):
         if ie_key:
             ies = [self.get_info_extractor(ie_key)]
         else:
-            ies = self._ies
+            ies = self._ie_index.candidates(url)
 
         for ie in ies:
             if not ie.suitable(url):
@@ -794,7 +843,7 @@ class YoutubeDL(object):
                                     'and will probably not work.')
 
             try:
-                ie_result = ie.extract(url)
+                ie_result = self._extract_prefetched(ie, url)
                 if ie_result is None:  # Finished already (backwards compatibility; listformats and friends should be moved here)
                     break
                 if isinstance(ie_result, list):
@@ -819,7 +868,7 @@ class YoutubeDL(object):
             except ExtractorError as e:  # An error we somewhat expected
                 self.report_error(compat_str(e), e.format_traceback())
                 break
-            except MaxDownloadsReached:
+            except (ExistingVideoReached, MaxDownloadsReached):
                 raise
             except Exception as e:
                 if self.params.get('ignoreerrors', False):
@@ -830,6 +879,53 @@ class YoutubeDL(object):
         else:
             self.report_error('no suitable InfoExtractor for URL %s' % url)
 
+    def _prefetch(self, url, ie_key=None):
+        """
+        Start extracting url in the background for a later extract_info(),
+        return the key of the extraction or None.
+        """
+        try:
+            if ie_key:
+                ie = self.get_info_extractor(ie_key)
+            else:
+                ie = next(
+                    ie for ie in self._ie_index.candidates(url) if ie.suitable(url))
+                ie = self.get_info_extractor(ie.ie_key())
+        except Exception:
+            # Let extract_info() report it
+            return None
+        key = (ie.ie_key(), url)
+        with self._lock:
+            if key in self._prefetched:
+                return None
+            prefetched = self._prefetched[key] = {}
+
+        def extract():
+            try:
+                prefetched['result'] = ie.extract(url)
+            except Exception as e:
+                prefetched['error'] = e
+
+        prefetched['thread'] = threading.Thread(target=extract)
+        prefetched['thread'].daemon = True
+        prefetched['thread'].start()
+        return key
+
+    def _discard_prefetched(self, keys):
+        with self._lock:
+            for key in keys:
+                self._prefetched.pop(key, None)
+
+    def _extract_prefetched(self, ie, url):
+        with self._lock:
+            prefetched = self._prefetched.pop((ie.ie_key(), url), None)
+        if prefetched is None:
+            return ie.extract(url)
+        prefetched['thread'].join()
+        if 'error' in prefetched:
+            raise prefetched['error']
+        return prefetched['result']
+
     def add_default_extra_info(self, ie_result, ie, url):
         self.add_extra_info(ie_result, {
             'extractor': ie.IE_NAME,
@@ -853,9 +949,10 @@ class YoutubeDL(object):
             extract_flat = self.params.get('extract_flat', False)
             if ((extract_flat == 'in_playlist' and 'playlist' in extra_info)
                     or extract_flat is True):
-                self.__forced_printings(
-                    ie_result, self.prepare_filename(ie_result),
-                    incomplete=True)
+                filename = None
+                if self.params.get('forcefilename', False):
+                    filename = self.prepare_filename(ie_result)
+                self.__forced_printings(ie_result, filename, incomplete=True)
                 return ie_result
 
         if result_type == 'video':
@@ -926,6 +1023,8 @@ class YoutubeDL(object):
                 playlistitems = orderedSet(iter_playlistitems(playlistitems_str))
 
             ie_entries = ie_result['entries']
+            if isinstance(ie_entries, PagedList) and self.params.get('playlist_prefetch'):
+                ie_entries.set_default_prefetch(self.params['playlist_prefetch'])
 
             def make_playlistitems_entries(list_ie_entries):
                 num_entries = len(list_ie_entries)
@@ -938,7 +1037,60 @@ class YoutubeDL(object):
                     '[%s] playlist %s: Downloading %d videos' %
                     (ie_result['extractor'], playlist, num_entries))
 
-            if isinstance(ie_entries, list):
+            def iter_lazy_entries():
+                # Yield (playlist_index, entry) as the entries are extracted
+                if isinstance(ie_entries, PagedList):
+                    if playlistitems:
+                        for item in playlistitems:
+                            for entry in ie_entries.getslice(item - 1, item):
+                                yield item, entry
+                        return
+                    selected = ie_entries.iterslice(playliststart, playlistend)
+                elif playlistitems:
+                    # Keep the requested entries until their turn comes
+                    items = collections.deque(playlistitems)
+                    found = {}
+                    for index, entry in enumerate(itertools.islice(
+                            ie_entries, 0, max(playlistitems)), 1):
+                        if index in items:
+                            found[index] = entry
+                        while items and items[0] in found:
+                            item = items.popleft()
+                            yield item, found.pop(item)
+                    for item in items:
+                        if item in found:
+                            yield item, found[item]
+                    return
+                else:
+                    selected = itertools.islice(ie_entries, playliststart, playlistend)
+                for index, entry in enumerate(selected, playliststart + 1):
+                    yield index, entry
+
+            # Flat entries are only printed: stream them without keeping them
+            dump_flat = (
+                self.params.get('extract_flat') and self.params.get('forcejson', False)
+                and not self.params.get('dump_single_json', False))
+            lazy = (
+                (self.params.get('lazy_playlist') or dump_flat)
+                and not isinstance(ie_entries, list))
+            if lazy and playlistitems and min(playlistitems) < 1:
+                # Items counted from the end need all the entries
+                self.to_screen(
+                    '[%s] playlist %s: Collecting all the videos for the requested items'
+                    % (ie_result['extractor'], playlist))
+                lazy = False
+            if lazy:
+                entries = iter_lazy_entries()
+                n_entries = None
+                if self.params.get('playlistreverse', False) or self.params.get('playlistrandom', False):
+                    entries = list(entries)
+                    n_entries = len(entries)
+                    report_download(n_entries)
+                else:
+                    self.to_screen(
+                        '[%s] playlist %s: Downloading videos as they are extracted' %
+                        (ie_result['extractor'], playlist))
+            elif isinstance(ie_entries, list):
                 n_all_entries = len(ie_entries)
                 if playlistitems:
                     entries = make_playlistitems_entries(ie_entries)
@@ -949,7 +1101,9 @@ class YoutubeDL(object):
                     '[%s] playlist %s: Collected %d video ids (downloading %d of them)' %
                     (ie_result['extractor'], playlist, n_all_entries, n_entries))
             elif isinstance(ie_entries, PagedList):
-                if playlistitems:
+                if playlistitems and min(playlistitems) < 1:
+                    entries = make_playlistitems_entries(ie_entries.getslice())
+                elif playlistitems:
                     entries = []
                     for item in playlistitems:
                         entries.extend(ie_entries.getslice(
@@ -963,7 +1117,8 @@ class YoutubeDL(object):
             else:  # iterable
                 if playlistitems:
                     entries = make_playlistitems_entries(list(itertools.islice(
-                        ie_entries, 0, max(playlistitems))))
+                        ie_entries, 0,
+                        max(playlistitems) if min(playlistitems) > 0 else None)))
                 else:
                     entries = list(itertools.islice(
                         ie_entries, playliststart, playlistend))
@@ -976,10 +1131,90 @@ class YoutubeDL(object):
             if self.params.get('playlistrandom', False):
                 random.shuffle(entries)
 
+            if not lazy:
+                entries = [
+                    (playlistitems[i - 1] if playlistitems else i + playliststart, entry)
+                    for i, entry in enumerate(entries, 1)]
+
             x_forwarded_for = ie_result.get('__x_forwarded_for_ip')
 
-            for i, entry in enumerate(entries, 1):
-                self.to_screen('[download] Downloading video %s of %s' % (i, n_entries))
+            # Extract the next entries while the current one is downloaded,
+            # unless the entries are already processed concurrently
+            prefetch = self.params.get('playlist_prefetch') or 0
+            if (self.params.get('concurrent_downloads') or 1) > 1 or self.params.get('extract_flat'):
+                prefetch = 0
+            prefetched_keys = []
+            # URLs of the upcoming entries already started or rejected
+            prefetch_seen = set()
+            upcoming = collections.deque()
+            entries = iter(entries)
+
+            def peek_entries(count):
+                while len(upcoming) < count:
+                    try:
+                        upcoming.append(next(entries))
+                    except StopIteration:
+                        break
+                return [entry for _, entry in itertools.islice(upcoming, count)]
+
+            # Look up the entries in the download archive in batches, before
+            # extracting any of them
+            archive = self._get_download_archive()
+            archived = {}
+
+            def check_archive(i):
+                # Entries not in memory yet are not fetched in advance for it
+                batch_size = self._ARCHIVE_BATCH_SIZE if n_entries is not None else len(upcoming)
+                vid_ids = [self._make_archive_id(entry) for entry in peek_entries(batch_size)]
+                recorded = archive.filter_recorded(vid_id for vid_id in vid_ids if vid_id)
+                for k, vid_id in enumerate(vid_ids):
+                    archived[i + k] = vid_id in recorded
+
+            def iter_entries():
+                for i in itertools.count(1):
+                    if not peek_entries(1):
+                        return
+                    if archive is not None:
+                        if i not in archived:
+                            check_archive(i)
+                        if archived.pop(i):
+                            if self.params.get('break_on_existing', False):
+                                raise ExistingVideoReached()
+                            entry = upcoming.popleft()[1]
+                            self.to_screen(
+                                '[download] %s has already been recorded in archive'
+                                % entry.get('title', entry.get('id', 'video')))
+                            continue
+                    yield (i, ) + upcoming.popleft()
+
+            def prefetch_entries():
+                for entry in peek_entries(prefetch):
+                    if entry.get('_type') not in ('url', 'url_transparent'):
+                        continue
+                    url = sanitize_url(entry['url'])
+                    if url in prefetch_seen:
+                        continue
+                    try:
+                        reason = self._match_entry(entry, incomplete=True)
+                    except ExistingVideoReached:
+                        # The download stops there, but only once the
+                        # entries before it are done
+                        return
+                    prefetch_seen.add(url)
+                    if reason is not None:
+                        continue
+                    key = self._prefetch(url, entry.get('ie_key'))
+                    if key:
+                        prefetched_keys.append(key)
+
+            def process_entry(item):
+                i, playlist_index, entry = item
+                if prefetch:
+                    prefetch_entries()
+                if n_entries is None:
+                    self.to_screen('[download] Downloading video %s' % i)
+                else:
+                    self.to_screen('[download] Downloading video %s of %s' % (i, n_entries))
                 # This __x_forwarded_for_ip thing is a bit ugly but requires
                 # minimal changes
                 if x_forwarded_for:
@@ -991,7 +1226,7 @@ class YoutubeDL(object):
                     'playlist_title': ie_result.get('title'),
                     'playlist_uploader': ie_result.get('uploader'),
                     'playlist_uploader_id': ie_result.get('uploader_id'),
-                    'playlist_index': playlistitems[i - 1] if playlistitems else i + playliststart,
+                    'playlist_index': playlist_index,
                     'extractor': ie_result['extractor'],
                     'webpage_url': ie_result['webpage_url'],
                     'webpage_url_basename': url_basename(ie_result['webpage_url']),
@@ -1001,12 +1236,23 @@ class YoutubeDL(object):
                 reason = self._match_entry(entry, incomplete=True)
                 if reason is not None:
                     self.to_screen('[download] ' + reason)
-                    continue
+                    return []
+
+                return [self.process_ie_result(entry,
+                                               download=download,
+                                               extra_info=extra)]
 
-                entry_result = self.process_ie_result(entry,
-                                                      download=download,
-                                                      extra_info=extra)
-                playlist_results.append(entry_result)
+            try:
+                if dump_flat:
+                    for item in iter_entries():
+                        process_entry(item)
+                else:
+                    for entry_results in self._map_concurrently(
+                            process_entry, iter_entries()):
+                        playlist_results.extend(entry_results)
+            finally:
+                # Drop the extractions of the entries that were not reached
+                self._discard_prefetched(prefetched_keys)
             ie_result['entries'] = playlist_results
             self.to_screen('[download] Finished downloading playlist: %s' % playlist)
             return ie_result
@@ -1090,16 +1336,20 @@ class YoutubeDL(object):
         if not m:
             raise ValueError('Invalid filter specification %r' % filter_spec)
 
+        key = m.group('key')
+        none_inclusive = m.group('none_inclusive')
+
         def _filter(f):
-            actual_value = f.get(m.group('key'))
+            actual_value = f.get(key)
             if actual_value is None:
-                return m.group('none_inclusive')
+                return none_inclusive
             return op(actual_value, comparison_value)
         return _filter
 
     def _default_format_spec(self, info_dict, download=True):
 
         def can_merge():
+            from .postprocessor import FFmpegMergerPP
             merger = FFmpegMergerPP(self)
             return merger.available and merger.can_merge()
 
@@ -1325,7 +1575,8 @@ class YoutubeDL(object):
                         if self.params.get('merge_output_format') is None
                         else self.params['merge_output_format'])
                     return {
-                        'requested_formats': formats_info,
+                        # Copied, as the only format may be the info dict itself
+                        'requested_formats': [dict(f) for f in formats_info],
                         'format': '%s+%s' % (formats_info[0].get('format'),
                                              formats_info[1].get('format')),
                         'format_id': '%s+%s' % (formats_info[0].get('format_id'),
@@ -1344,14 +1595,15 @@ class YoutubeDL(object):
                 video_selector, audio_selector = map(_build_selector_function, selector.selector)
 
                 def selector_function(ctx):
-                    for pair in itertools.product(
-                            video_selector(copy.deepcopy(ctx)), audio_selector(copy.deepcopy(ctx))):
+                    for pair in itertools.product(video_selector(ctx), audio_selector(ctx)):
                         yield _merge(pair)
 
             filters = [self._build_format_filter(f) for f in selector.filters]
 
             def final_selector(ctx):
-                ctx_copy = copy.deepcopy(ctx)
+                # Selectors never modify the formats themselves, only the
+                # list of candidates, so there is no need to copy them
+                ctx_copy = dict(ctx)
                 for _filter in filters:
                     ctx_copy['formats'] = list(filter(_filter, ctx_copy['formats']))
                 return selector_function(ctx_copy)
@@ -1540,7 +1792,8 @@ class YoutubeDL(object):
 
         formats_dict = {}
 
-        # We check that all the formats have the format and format_id fields
+        # Fields that do not depend on the final format_id are all filled
+        # in a single pass over the formats
         for i, format in enumerate(formats):
             sanitize_string_field(format, 'format_id')
             sanitize_numeric_fields(format)
@@ -1554,6 +1807,18 @@ class YoutubeDL(object):
             if format_id not in formats_dict:
                 formats_dict[format_id] = []
             formats_dict[format_id].append(format)
+            # Automatically determine file extension if missing
+            if format.get('ext') is None:
+                format['ext'] = determine_ext(format['url']).lower()
+            # Automatically determine protocol if missing (useful for format
+            # selection purposes)
+            if format.get('protocol') is None:
+                format['protocol'] = determine_protocol(format)
+            # Add HTTP headers, so that external programs can use them from the
+            # json output
+            full_format_info = info_dict.copy()
+            full_format_info.update(format)
+            format['http_headers'] = self._calc_headers(full_format_info)
 
         # Make sure all formats have unique format_id
         for format_id, ambiguous_formats in formats_dict.items():
@@ -1561,25 +1826,13 @@ class YoutubeDL(object):
                 for i, format in enumerate(ambiguous_formats):
                     format['format_id'] = '%s-%d' % (format_id, i)
 
-        for i, format in enumerate(formats):
+        for format in formats:
             if format.get('format') is None:
                 format['format'] = '{id} - {res}{note}'.format(
                     id=format['format_id'],
                     res=self.format_resolution(format),
                     note=' ({0})'.format(format['format_note']) if format.get('format_note') is not None else '',
                 )
-            # Automatically determine file extension if missing
-            if format.get('ext') is None:
-                format['ext'] = determine_ext(format['url']).lower()
-            # Automatically determine protocol if missing (useful for format
-            # selection purposes)
-            if format.get('protocol') is None:
-                format['protocol'] = determine_protocol(format)
-            # Add HTTP headers, so that external programs can use them from the
-            # json output
-            full_format_info = info_dict.copy()
-            full_format_info.update(format)
-            format['http_headers'] = self._calc_headers(full_format_info)
         # Remove private housekeeping stuff
         if '__x_forwarded_for_ip' in info_dict:
             del info_dict['__x_forwarded_for_ip']
@@ -1746,7 +1999,12 @@ class YoutubeDL(object):
             self.to_screen('[download] ' + reason)
             return
 
-        self._num_downloads += 1
+        with self._lock:
+            # Other threads may have completed the count meanwhile
+            if max_downloads is not None and self._num_downloads >= int(max_downloads):
+                raise MaxDownloadsReached()
+            self._num_downloads += 1
+            self._thread_local.num_downloads = self._num_downloads
 
         info_dict['_filename'] = filename = self.prepare_filename(info_dict)
 
@@ -1855,6 +2113,13 @@ class YoutubeDL(object):
         self._write_thumbnails(info_dict, filename)
 
         if not self.params.get('skip_download', False):
+            from .postprocessor import (
+                FFmpegFixupM3u8PP,
+                FFmpegFixupM4aPP,
+                FFmpegFixupStretchedPP,
+                FFmpegMergerPP,
+            )
+
             try:
                 def dl(name, info):
                     fd = get_suitable_downloader(info, self.params)(self, self.params)
@@ -2012,22 +2277,87 @@ class YoutubeDL(object):
                 and self.params.get('max_downloads') != 1):
             raise SameFileError(outtmpl)
 
-        for url in url_list:
+        def download_url(url):
             try:
                 # It also downloads the videos
                 res = self.extract_info(
                     url, force_generic_extractor=self.params.get('force_generic_extractor', False))
             except UnavailableVideoError:
                 self.report_error('unable to download video')
-            except MaxDownloadsReached:
-                self.to_screen('[info] Maximum number of downloaded files reached.')
-                raise
             else:
                 if self.params.get('dump_single_json', False):
                     self.to_stdout(json.dumps(res))
 
+        try:
+            self._map_concurrently(download_url, url_list)
+        except ExistingVideoReached:
+            self.to_screen('[info] Encountered a video that is already in the archive, stopping due to --break-on-existing')
+            raise
+        except MaxDownloadsReached:
+            self.to_screen('[info] Maximum number of downloaded files reached.')
+            raise
+
         return self._download_retcode
 
+    def _map_concurrently(self, func, items):
+        """
+        Return [func(item) for item in items], running func in up to
+        concurrent_downloads threads.
+
+        items may be any iterable (e.g. the entries of a playlist as they
+        are extracted); it is only advanced by one thread at a time.
+        Calls made from one of these threads (e.g. for the entries of a
+        playlist being downloaded concurrently with other URLs) run
+        sequentially. Once func has raised an exception no more items are
+        started and the exception is re-raised after the running ones finish.
+        """
+        workers = self.params.get('concurrent_downloads') or 1
+        if isinstance(items, list):
+            workers = min(workers, len(items))
+        if workers <= 1 or getattr(self._thread_local, 'in_worker', False):
+            return [func(item) for item in items]
+
+        results = {}
+        pending = enumerate(items)
+        errors = []
+        lock = threading.Lock()
+
+        def worker():
+            self._thread_local.in_worker = True
+            while True:
+                with lock:
+                    if errors:
+                        return
+                    try:
+                        idx, item = next(pending)
+                    except StopIteration:
+                        return
+                    except BaseException as e:
+                        errors.append(e)
+                        return
+                try:
+                    results[idx] = func(item)
+                except BaseException as e:
+                    with lock:
+                        errors.append(e)
+                    return
+
+        threads = [threading.Thread(target=worker) for _ in range(workers)]
+        for t in threads:
+            t.daemon = True
+            t.start()
+        try:
+            for t in threads:
+                t.join()
+        except BaseException as e:
+            # Do not start any more items, e.g. on KeyboardInterrupt
+            with lock:
+                errors.append(e)
+            raise
+        if errors:
+            raise errors[0]
+        return [results[idx] for idx in range(len(results))]
+
     def download_with_info_file(self, info_filename):
         with contextlib.closing(fileinput.FileInput(
                 [info_filename], mode='r',
@@ -2085,7 +2415,7 @@ class YoutubeDL(object):
             if not url:
                 return
             # Try to find matching extractor for the URL and take its ie_key
-            for ie in self._ies:
+            for ie in self._ie_index.candidates(url):
                 if ie.suitable(url):
                     extractor = ie.ie_key()
                     break
@@ -2093,33 +2423,36 @@ class YoutubeDL(object):
                 return
         return extractor.lower() + ' ' + video_id
 
-    def in_download_archive(self, info_dict):
+    def _get_download_archive(self):
         fn = self.params.get('download_archive')
         if fn is None:
+            return None
+        with self._lock:
+            archive = self._download_archive
+            if archive is None or archive.filename != fn:
+                if archive is not None:
+                    archive.close()
+                archive = self._download_archive = open_download_archive(fn)
+        return archive
+
+    def in_download_archive(self, info_dict):
+        archive = self._get_download_archive()
+        if archive is None:
             return False
 
         vid_id = self._make_archive_id(info_dict)
         if not vid_id:
             return False  # Incomplete video information
 
-        try:
-            with locked_file(fn, 'r', encoding='utf-8') as archive_file:
-                for line in archive_file:
-                    if line.strip() == vid_id:
-                        return True
-        except IOError as ioe:
-            if ioe.errno != errno.ENOENT:
-                raise
-        return False
+        return vid_id in archive
 
     def record_download_archive(self, info_dict):
-        fn = self.params.get('download_archive')
-        if fn is None:
+        archive = self._get_download_archive()
+        if archive is None:
             return
         vid_id = self._make_archive_id(info_dict)
         assert vid_id
-        with locked_file(fn, 'a', encoding='utf-8') as archive_file:
-            archive_file.write(vid_id + '\n')
+        archive.add(vid_id)
 
     @staticmethod
     def format_resolution(format, default='unknown'):
@@ -2284,6 +2617,10 @@ class YoutubeDL(object):
             platform.python_version(), python_implementation(),
             platform_name()))
 
+        from .downloader.rtmp import rtmpdump_version
+        from .extractor.openload import PhantomJSwrapper
+        from .postprocessor import FFmpegPostProcessor
+
         exe_versions = FFmpegPostProcessor.get_versions(self)
         exe_versions['rtmpdump'] = rtmpdump_version()
         exe_versions['phantomjs'] = PhantomJSwrapper._version()
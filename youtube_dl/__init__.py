@@ -25,7 +25,9 @@ from .utils import (
     decodeOption,
     DEFAULT_OUTTMPL,
     DownloadError,
+    ExistingVideoReached,
     expand_path,
+    import_sqlite3,
     match_filter_func,
     MaxDownloadsReached,
     preferredencoding,
@@ -41,7 +43,6 @@ from .downloader import (
     FileDownloader,
 )
 from .extractor import gen_extractors, list_extractors
-from .extractor.adobepass import MSO_INFO
 from .YoutubeDL import YoutubeDL
 
 
@@ -120,6 +121,7 @@ def _real_main(argv=None):
             write_string(desc + '\n', out=sys.stdout)
         sys.exit(0)
     if opts.ap_list_mso:
+        from .extractor.adobepass import MSO_INFO
         table = [[mso_id, mso_info['name']] for mso_id, mso_info in MSO_INFO.items()]
         write_string('Supported TV Providers:\n' + render_table(['mso', 'mso name'], table) + '\n', out=sys.stdout)
         sys.exit(0)
@@ -133,6 +135,8 @@ def _real_main(argv=None):
         parser.error('TV Provider account username missing\n')
     if opts.outtmpl is not None and (opts.usetitle or opts.autonumber or opts.useid):
         parser.error('using output template conflicts with using title, video ID or auto number')
+    if opts.cache_backend == 'sqlite' and import_sqlite3() is None:
+        parser.error('the sqlite cache backend requires the Python sqlite3 module')
     if opts.autonumber_size is not None:
         if opts.autonumber_size <= 0:
             parser.error('auto number size must be positive')
@@ -160,6 +164,13 @@ def _real_main(argv=None):
         if numeric_limit is None:
             parser.error('invalid max_filesize specified')
         opts.max_filesize = numeric_limit
+    if opts.http_cache_max_size is not None:
+        numeric_limit = FileDownloader.parse_bytes(opts.http_cache_max_size)
+        if numeric_limit is None:
+            parser.error('invalid http cache size specified')
+        opts.http_cache_max_size = numeric_limit
+    if opts.http_cache_ttl is not None and opts.http_cache_ttl < 0:
+        parser.error('http cache TTL must be positive or 0')
     if opts.sleep_interval is not None:
         if opts.sleep_interval < 0:
             parser.error('sleep interval must be positive or 0')
@@ -172,8 +183,10 @@ def _real_main(argv=None):
             parser.error('max sleep interval must be greater than or equal to min sleep interval')
     else:
         opts.max_sleep_interval = opts.sleep_interval
-    if opts.ap_mso and opts.ap_mso not in MSO_INFO:
-        parser.error('Unsupported TV Provider, use --ap-list-mso to get a list of supported TV Providers')
+    if opts.ap_mso:
+        from .extractor.adobepass import MSO_INFO
+        if opts.ap_mso not in MSO_INFO:
+            parser.error('Unsupported TV Provider, use --ap-list-mso to get a list of supported TV Providers')
 
     def parse_retries(retries):
         if retries in ('inf', 'infinite'):
@@ -188,6 +201,14 @@ def _real_main(argv=None):
         opts.retries = parse_retries(opts.retries)
     if opts.fragment_retries is not None:
         opts.fragment_retries = parse_retries(opts.fragment_retries)
+    if opts.concurrent_fragment_downloads <= 0:
+        parser.error('concurrent fragments must be positive')
+    if opts.concurrent_downloads <= 0:
+        parser.error('concurrent downloads must be positive')
+    if opts.http_connections <= 0:
+        parser.error('HTTP connections must be positive')
+    if opts.playlist_prefetch < 0:
+        parser.error('playlist prefetch must be positive or 0')
     if opts.buffersize is not None:
         numeric_buffersize = FileDownloader.parse_bytes(opts.buffersize)
         if numeric_buffersize is None:
@@ -351,9 +372,13 @@ def _real_main(argv=None):
         'fragment_retries': opts.fragment_retries,
         'skip_unavailable_fragments': opts.skip_unavailable_fragments,
         'keep_fragments': opts.keep_fragments,
+        'concurrent_fragment_downloads': opts.concurrent_fragment_downloads,
+        'concurrent_downloads': opts.concurrent_downloads,
+        'playlist_prefetch': opts.playlist_prefetch,
         'buffersize': opts.buffersize,
         'noresizebuffer': opts.noresizebuffer,
         'http_chunk_size': opts.http_chunk_size,
+        'http_connections': opts.http_connections,
         'continuedl': opts.continue_dl,
         'noprogress': opts.noprogress,
         'progress_with_newline': opts.progress_with_newline,
@@ -361,6 +386,7 @@ def _real_main(argv=None):
         'playlistend': opts.playlistend,
         'playlistreverse': opts.playlist_reverse,
         'playlistrandom': opts.playlist_random,
+        'lazy_playlist': opts.lazy_playlist,
         'noplaylist': opts.noplaylist,
         'logtostderr': opts.outtmpl == '-',
         'consoletitle': opts.consoletitle,
@@ -392,9 +418,14 @@ def _real_main(argv=None):
         'max_views': opts.max_views,
         'daterange': date,
         'cachedir': opts.cachedir,
+        'cache_backend': opts.cache_backend,
+        'http_cache': opts.http_cache,
+        'http_cache_ttl': opts.http_cache_ttl,
+        'http_cache_max_size': opts.http_cache_max_size,
         'youtube_print_sig_code': opts.youtube_print_sig_code,
         'age_limit': opts.age_limit,
         'download_archive': download_archive_fn,
+        'break_on_existing': opts.break_on_existing,
         'cookiefile': opts.cookiefile,
         'nocheckcertificate': opts.no_check_certificate,
         'prefer_insecure': opts.prefer_insecure,
@@ -447,6 +478,12 @@ def _real_main(argv=None):
         if opts.rm_cachedir:
             ydl.cache.remove()
 
+        if opts.serve:
+            if all_urls or opts.load_info_filename is not None:
+                parser.error('URLs must be sent as jobs when using --serve')
+            from .server import JobServer
+            sys.exit(JobServer(ydl).serve(sys.stdin, sys.stdout))
+
         # Maybe do nothing
         if (len(all_urls) < 1) and (opts.load_info_filename is None):
             if opts.update_self or opts.rm_cachedir:
@@ -465,6 +502,9 @@ def _real_main(argv=None):
         except MaxDownloadsReached:
             ydl.to_screen('--max-download limit reached, aborting.')
             retcode = 101
+        except ExistingVideoReached:
+            ydl.to_screen('--break-on-existing triggered, aborting.')
+            retcode = 101
 
     sys.exit(retcode)
 
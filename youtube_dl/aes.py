@@ -1,8 +1,10 @@
 from __future__ import unicode_literals
 
-from math import ceil
-
-from .compat import compat_b64decode
+from .compat import (
+    compat_b64decode,
+    compat_struct_pack,
+    compat_struct_unpack,
+)
 from .utils import bytes_to_intlist, intlist_to_bytes
 
 BLOCK_SIZE_BYTES = 16
@@ -18,20 +20,9 @@ def aes_ctr_decrypt(data, key, counter):
                                returns the next counter block
     @returns {int[]}           decrypted data
     """
-    expanded_key = key_expansion(key)
-    block_count = int(ceil(float(len(data)) / BLOCK_SIZE_BYTES))
-
-    decrypted_data = []
-    for i in range(block_count):
-        counter_block = counter.next_value()
-        block = data[i * BLOCK_SIZE_BYTES: (i + 1) * BLOCK_SIZE_BYTES]
-        block += [0] * (BLOCK_SIZE_BYTES - len(block))
-
-        cipher_counter_block = aes_encrypt(counter_block, expanded_key)
-        decrypted_data += xor(block, cipher_counter_block)
-    decrypted_data = decrypted_data[:len(data)]
-
-    return decrypted_data
+    return bytes_to_intlist(_aes_ctr_crypt(
+        intlist_to_bytes(data), intlist_to_bytes(key),
+        lambda: intlist_to_bytes(counter.next_value())))
 
 
 def aes_cbc_decrypt(data, key, iv):
@@ -43,21 +34,8 @@ def aes_cbc_decrypt(data, key, iv):
     @param {int[]} iv          16-Byte IV
     @returns {int[]}           decrypted data
     """
-    expanded_key = key_expansion(key)
-    block_count = int(ceil(float(len(data)) / BLOCK_SIZE_BYTES))
-
-    decrypted_data = []
-    previous_cipher_block = iv
-    for i in range(block_count):
-        block = data[i * BLOCK_SIZE_BYTES: (i + 1) * BLOCK_SIZE_BYTES]
-        block += [0] * (BLOCK_SIZE_BYTES - len(block))
-
-        decrypted_block = aes_decrypt(block, expanded_key)
-        decrypted_data += xor(decrypted_block, previous_cipher_block)
-        previous_cipher_block = block
-    decrypted_data = decrypted_data[:len(data)]
-
-    return decrypted_data
+    return bytes_to_intlist(aes_cbc_decrypt_bytes(
+        intlist_to_bytes(data), intlist_to_bytes(key), intlist_to_bytes(iv)))
 
 
 def aes_cbc_encrypt(data, key, iv):
@@ -69,23 +47,80 @@ def aes_cbc_encrypt(data, key, iv):
     @param {int[]} iv          16-Byte IV
     @returns {int[]}           encrypted data
     """
-    expanded_key = key_expansion(key)
-    block_count = int(ceil(float(len(data)) / BLOCK_SIZE_BYTES))
+    return bytes_to_intlist(aes_cbc_encrypt_bytes(
+        intlist_to_bytes(data), intlist_to_bytes(key), intlist_to_bytes(iv)))
+
+
+def aes_ctr_decrypt_bytes(data, key, iv):
+    """
+    Decrypt with aes in counter mode, the counter block being incremented
+    as a 128-Bit big-endian integer
+
+    @param {bytes} data  cipher
+    @param {bytes} key   16/24/32-Byte cipher key
+    @param {bytes} iv    16-Byte initial counter block
+    @returns {bytes}     decrypted data
+    """
+    hi, lo = compat_struct_unpack('>QQ', iv)
+    counter = [(hi << 64) | lo]
+
+    def next_value():
+        value = counter[0]
+        counter[0] = (value + 1) & ((1 << 128) - 1)
+        return compat_struct_pack('>QQ', value >> 64, value & 0xFFFFFFFFFFFFFFFF)
+
+    return _aes_ctr_crypt(data, key, next_value)
+
+
+def aes_cbc_decrypt_bytes(data, key, iv):
+    """
+    Decrypt with aes in CBC mode
+
+    @param {bytes} data  cipher
+    @param {bytes} key   16/24/32-Byte cipher key
+    @param {bytes} iv    16-Byte IV
+    @returns {bytes}     decrypted data
+    """
+    rounds, _, dk = _key_schedule(key)
+    data_len = len(data)
+    words = _bytes_to_words(data)
+    decrypt_block = _decrypt_block
+
+    decrypted = []
+    append = decrypted.extend
+    p0, p1, p2, p3 = compat_struct_unpack('>4I', iv)
+    for i in range(0, len(words), 4):
+        c0, c1, c2, c3 = words[i:i + 4]
+        d0, d1, d2, d3 = decrypt_block(c0, c1, c2, c3, dk, rounds)
+        append((d0 ^ p0, d1 ^ p1, d2 ^ p2, d3 ^ p3))
+        p0, p1, p2, p3 = c0, c1, c2, c3
 
-    encrypted_data = []
-    previous_cipher_block = iv
-    for i in range(block_count):
-        block = data[i * BLOCK_SIZE_BYTES: (i + 1) * BLOCK_SIZE_BYTES]
-        remaining_length = BLOCK_SIZE_BYTES - len(block)
-        block += [remaining_length] * remaining_length
-        mixed_block = xor(block, previous_cipher_block)
+    return _words_to_bytes(decrypted)[:data_len]
 
-        encrypted_block = aes_encrypt(mixed_block, expanded_key)
-        encrypted_data += encrypted_block
 
-        previous_cipher_block = encrypted_block
+def aes_cbc_encrypt_bytes(data, key, iv):
+    """
+    Encrypt with aes in CBC mode. Using PKCS#7 padding
+
+    @param {bytes} data  cleartext
+    @param {bytes} key   16/24/32-Byte cipher key
+    @param {bytes} iv    16-Byte IV
+    @returns {bytes}     encrypted data
+    """
+    rounds, ek, _ = _key_schedule(key)
+    remaining_length = -len(data) % BLOCK_SIZE_BYTES
+    words = _bytes_to_words(data + compat_struct_pack('B', remaining_length) * remaining_length)
+    encrypt_block = _encrypt_block
 
-    return encrypted_data
+    encrypted = []
+    append = encrypted.extend
+    c0, c1, c2, c3 = compat_struct_unpack('>4I', iv)
+    for i in range(0, len(words), 4):
+        m0, m1, m2, m3 = words[i:i + 4]
+        c0, c1, c2, c3 = encrypt_block(m0 ^ c0, m1 ^ c1, m2 ^ c2, m3 ^ c3, ek, rounds)
+        append((c0, c1, c2, c3))
+
+    return _words_to_bytes(encrypted)
 
 
 def key_expansion(data):
@@ -180,7 +215,7 @@ def aes_decrypt_text(data, password, key_size_bytes):
     """
     NONCE_LENGTH_BYTES = 8
 
-    data = bytes_to_intlist(compat_b64decode(data))
+    data = compat_b64decode(data)
     password = bytes_to_intlist(password.encode('utf-8'))
 
     key = password[:key_size_bytes] + [0] * (key_size_bytes - len(password))
@@ -189,16 +224,9 @@ def aes_decrypt_text(data, password, key_size_bytes):
     nonce = data[:NONCE_LENGTH_BYTES]
     cipher = data[NONCE_LENGTH_BYTES:]
 
-    class Counter(object):
-        __value = nonce + [0] * (BLOCK_SIZE_BYTES - NONCE_LENGTH_BYTES)
-
-        def next_value(self):
-            temp = self.__value
-            self.__value = inc(self.__value)
-            return temp
-
-    decrypted_data = aes_ctr_decrypt(cipher, key, Counter())
-    plaintext = intlist_to_bytes(decrypted_data)
+    plaintext = aes_ctr_decrypt_bytes(
+        cipher, intlist_to_bytes(key),
+        nonce + b'\x00' * (BLOCK_SIZE_BYTES - NONCE_LENGTH_BYTES))
 
     return plaintext
 
@@ -358,4 +386,128 @@ def inc(data):
     return data
 
 
-__all__ = ['aes_encrypt', 'key_expansion', 'aes_ctr_decrypt', 'aes_cbc_decrypt', 'aes_decrypt_text']
+def _mul_word(s, m0, m1, m2, m3):
+    return ((rijndael_mul(s, m0) << 24) | (rijndael_mul(s, m1) << 16)
+            | (rijndael_mul(s, m2) << 8) | rijndael_mul(s, m3))
+
+
+def _rotate_tables(table):
+    return (table,
+            tuple(((w >> 8) | (w << 24)) & 0xFFFFFFFF for w in table),
+            tuple(((w >> 16) | (w << 16)) & 0xFFFFFFFF for w in table),
+            tuple(((w >> 24) | (w << 8)) & 0xFFFFFFFF for w in table))
+
+
+# T-box tables combining SubBytes, ShiftRows and MixColumns, one 32-Bit
+# column per byte of the state, so that a round is 16 table lookups
+TE0, TE1, TE2, TE3 = _rotate_tables(tuple(_mul_word(s, 2, 1, 1, 3) for s in SBOX))
+TD0, TD1, TD2, TD3 = _rotate_tables(tuple(_mul_word(s, 0xE, 0x9, 0xD, 0xB) for s in SBOX_INV))
+
+# Key schedules of the recently used keys, as (rounds, encryption round
+# keys, decryption round keys) with the round keys as 32-Bit words
+_KEY_SCHEDULE_CACHE = {}
+_KEY_SCHEDULE_CACHE_SIZE = 16
+
+
+def _bytes_to_words(data):
+    data = bytes(data) + b'\x00' * (-len(data) % BLOCK_SIZE_BYTES)
+    return compat_struct_unpack('>%dI' % (len(data) // 4), data)
+
+
+def _words_to_bytes(words):
+    return compat_struct_pack('>%dI' % len(words), *words)
+
+
+def _key_schedule(key):
+    key = bytes(key)
+    schedule = _KEY_SCHEDULE_CACHE.get(key)
+    if schedule is not None:
+        return schedule
+
+    ek = list(_bytes_to_words(intlist_to_bytes(key_expansion(bytes_to_intlist(key)))))
+    rounds = len(ek) // 4 - 1
+    # Round keys of the equivalent inverse cipher: reversed, and with
+    # InvMixColumns applied to all but the first and last ones
+    dk = []
+    for r in range(rounds, -1, -1):
+        round_key = ek[r * 4:(r + 1) * 4]
+        if r not in (0, rounds):
+            round_key = [
+                TD0[SBOX[w >> 24]] ^ TD1[SBOX[(w >> 16) & 0xFF]]
+                ^ TD2[SBOX[(w >> 8) & 0xFF]] ^ TD3[SBOX[w & 0xFF]]
+                for w in round_key]
+        dk.extend(round_key)
+
+    schedule = rounds, tuple(ek), tuple(dk)
+    if len(_KEY_SCHEDULE_CACHE) >= _KEY_SCHEDULE_CACHE_SIZE:
+        _KEY_SCHEDULE_CACHE.clear()
+    _KEY_SCHEDULE_CACHE[key] = schedule
+    return schedule
+
+
+def _encrypt_block(s0, s1, s2, s3, ek, rounds, te0=TE0, te1=TE1, te2=TE2, te3=TE3, sbox=SBOX):
+    s0 ^= ek[0]
+    s1 ^= ek[1]
+    s2 ^= ek[2]
+    s3 ^= ek[3]
+    for k in range(4, rounds * 4, 4):
+        s0, s1, s2, s3 = (
+            te0[s0 >> 24] ^ te1[(s1 >> 16) & 0xFF] ^ te2[(s2 >> 8) & 0xFF] ^ te3[s3 & 0xFF] ^ ek[k],
+            te0[s1 >> 24] ^ te1[(s2 >> 16) & 0xFF] ^ te2[(s3 >> 8) & 0xFF] ^ te3[s0 & 0xFF] ^ ek[k + 1],
+            te0[s2 >> 24] ^ te1[(s3 >> 16) & 0xFF] ^ te2[(s0 >> 8) & 0xFF] ^ te3[s1 & 0xFF] ^ ek[k + 2],
+            te0[s3 >> 24] ^ te1[(s0 >> 16) & 0xFF] ^ te2[(s1 >> 8) & 0xFF] ^ te3[s2 & 0xFF] ^ ek[k + 3])
+    k = rounds * 4
+    return (
+        ((sbox[s0 >> 24] << 24) | (sbox[(s1 >> 16) & 0xFF] << 16)
+         | (sbox[(s2 >> 8) & 0xFF] << 8) | sbox[s3 & 0xFF]) ^ ek[k],
+        ((sbox[s1 >> 24] << 24) | (sbox[(s2 >> 16) & 0xFF] << 16)
+         | (sbox[(s3 >> 8) & 0xFF] << 8) | sbox[s0 & 0xFF]) ^ ek[k + 1],
+        ((sbox[s2 >> 24] << 24) | (sbox[(s3 >> 16) & 0xFF] << 16)
+         | (sbox[(s0 >> 8) & 0xFF] << 8) | sbox[s1 & 0xFF]) ^ ek[k + 2],
+        ((sbox[s3 >> 24] << 24) | (sbox[(s0 >> 16) & 0xFF] << 16)
+         | (sbox[(s1 >> 8) & 0xFF] << 8) | sbox[s2 & 0xFF]) ^ ek[k + 3])
+
+
+def _decrypt_block(s0, s1, s2, s3, dk, rounds, td0=TD0, td1=TD1, td2=TD2, td3=TD3, sbox_inv=SBOX_INV):
+    s0 ^= dk[0]
+    s1 ^= dk[1]
+    s2 ^= dk[2]
+    s3 ^= dk[3]
+    for k in range(4, rounds * 4, 4):
+        s0, s1, s2, s3 = (
+            td0[s0 >> 24] ^ td1[(s3 >> 16) & 0xFF] ^ td2[(s2 >> 8) & 0xFF] ^ td3[s1 & 0xFF] ^ dk[k],
+            td0[s1 >> 24] ^ td1[(s0 >> 16) & 0xFF] ^ td2[(s3 >> 8) & 0xFF] ^ td3[s2 & 0xFF] ^ dk[k + 1],
+            td0[s2 >> 24] ^ td1[(s1 >> 16) & 0xFF] ^ td2[(s0 >> 8) & 0xFF] ^ td3[s3 & 0xFF] ^ dk[k + 2],
+            td0[s3 >> 24] ^ td1[(s2 >> 16) & 0xFF] ^ td2[(s1 >> 8) & 0xFF] ^ td3[s0 & 0xFF] ^ dk[k + 3])
+    k = rounds * 4
+    return (
+        ((sbox_inv[s0 >> 24] << 24) | (sbox_inv[(s3 >> 16) & 0xFF] << 16)
+         | (sbox_inv[(s2 >> 8) & 0xFF] << 8) | sbox_inv[s1 & 0xFF]) ^ dk[k],
+        ((sbox_inv[s1 >> 24] << 24) | (sbox_inv[(s0 >> 16) & 0xFF] << 16)
+         | (sbox_inv[(s3 >> 8) & 0xFF] << 8) | sbox_inv[s2 & 0xFF]) ^ dk[k + 1],
+        ((sbox_inv[s2 >> 24] << 24) | (sbox_inv[(s1 >> 16) & 0xFF] << 16)
+         | (sbox_inv[(s0 >> 8) & 0xFF] << 8) | sbox_inv[s3 & 0xFF]) ^ dk[k + 2],
+        ((sbox_inv[s3 >> 24] << 24) | (sbox_inv[(s2 >> 16) & 0xFF] << 16)
+         | (sbox_inv[(s1 >> 8) & 0xFF] << 8) | sbox_inv[s0 & 0xFF]) ^ dk[k + 3])
+
+
+def _aes_ctr_crypt(data, key, next_counter_block):
+    rounds, ek, _ = _key_schedule(key)
+    data_len = len(data)
+    words = _bytes_to_words(data)
+    encrypt_block = _encrypt_block
+
+    decrypted = []
+    append = decrypted.extend
+    for i in range(0, len(words), 4):
+        k0, k1, k2, k3 = encrypt_block(
+            *compat_struct_unpack('>4I', next_counter_block()), ek=ek, rounds=rounds)
+        append((words[i] ^ k0, words[i + 1] ^ k1, words[i + 2] ^ k2, words[i + 3] ^ k3))
+
+    return _words_to_bytes(decrypted)[:data_len]
+
+
+__all__ = [
+    'aes_encrypt', 'key_expansion', 'aes_ctr_decrypt', 'aes_cbc_decrypt', 'aes_decrypt_text',
+    'aes_ctr_decrypt_bytes', 'aes_cbc_decrypt_bytes', 'aes_cbc_encrypt_bytes',
+]
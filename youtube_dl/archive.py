@@ -0,0 +1,161 @@
+from __future__ import unicode_literals
+
+import errno
+import io
+import os
+import threading
+
+from .utils import (
+    encodeFilename,
+    import_sqlite3,
+    locked_file,
+    YoutubeDLError,
+)
+
+
+SQLITE_EXTENSIONS = ('.db', '.sqlite', '.sqlite3')
+SQLITE_HEADER = b'SQLite format 3\x00'
+
+
+class DownloadArchive(object):
+    """
+    Plain text download archive with one "<extractor> <video id>" entry per
+    line.
+
+    The file is read once into a set, later only the lines appended since
+    the last read (e.g. by other youtube-dl processes sharing the archive)
+    are read when an entry is not found in the set.
+    """
+
+    def __init__(self, filename):
+        self.filename = filename
+        self._ids = set()
+        # Amount of bytes of the archive file already loaded into _ids
+        self._offset = 0
+        self._lock = threading.Lock()
+
+    def _refresh(self):
+        try:
+            size = os.path.getsize(encodeFilename(self.filename))
+        except OSError as ose:
+            if ose.errno != errno.ENOENT:
+                raise
+            size = 0
+        if size == self._offset:
+            return
+        if size < self._offset:
+            # The archive file has been rewritten, start over
+            self._ids = set()
+            self._offset = 0
+        with locked_file(self.filename, 'rb') as archive_file:
+            archive_file.seek(self._offset)
+            data = archive_file.read()
+        # Only skip past complete lines so that an entry missing the
+        # trailing newline is read again once it is completed
+        self._offset += data.rfind(b'\n') + 1
+        self._ids.update(
+            line.strip() for line in data.decode('utf-8').splitlines())
+
+    def __contains__(self, vid_id):
+        with self._lock:
+            if vid_id in self._ids:
+                return True
+            self._refresh()
+            return vid_id in self._ids
+
+    def filter_recorded(self, vid_ids):
+        """Return the set of the given entries that are in the archive"""
+        vid_ids = set(vid_ids)
+        with self._lock:
+            if not vid_ids <= self._ids:
+                self._refresh()
+            return vid_ids & self._ids
+
+    def add(self, vid_id):
+        with self._lock:
+            with locked_file(self.filename, 'a', encoding='utf-8') as archive_file:
+                archive_file.write(vid_id + '\n')
+            self._ids.add(vid_id)
+
+    def close(self):
+        pass
+
+
+class SQLiteDownloadArchive(object):
+    """
+    Download archive stored in an SQLite database with the same
+    "<extractor> <video id>" entries as the plain text archive.
+
+    SQLite handles locking itself, so the database may be safely shared by
+    several youtube-dl processes.
+    """
+
+    _TIMEOUT = 60
+    # Keep below the default limit of 999 parameters of older SQLite versions
+    _QUERY_BATCH_SIZE = 500
+
+    def __init__(self, filename):
+        if import_sqlite3() is None:
+            raise YoutubeDLError(
+                'Python sqlite3 module is required to use an SQLite download archive')
+        self.filename = filename
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def _connection(self):
+        if self._conn is None:
+            self._conn = import_sqlite3().connect(
+                self.filename, timeout=self._TIMEOUT, check_same_thread=False)
+            with self._conn:
+                self._conn.execute(
+                    'CREATE TABLE IF NOT EXISTS archive (id TEXT PRIMARY KEY)')
+        return self._conn
+
+    def __contains__(self, vid_id):
+        with self._lock:
+            cursor = self._connection().execute(
+                'SELECT 1 FROM archive WHERE id = ?', (vid_id, ))
+            return cursor.fetchone() is not None
+
+    def filter_recorded(self, vid_ids):
+        """Return the set of the given entries that are in the archive"""
+        vid_ids = list(set(vid_ids))
+        recorded = set()
+        with self._lock:
+            conn = self._connection()
+            for start in range(0, len(vid_ids), self._QUERY_BATCH_SIZE):
+                batch = vid_ids[start:start + self._QUERY_BATCH_SIZE]
+                recorded.update(row[0] for row in conn.execute(
+                    'SELECT id FROM archive WHERE id IN (%s)' % ', '.join('?' * len(batch)),
+                    batch))
+        return recorded
+
+    def add(self, vid_id):
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.execute(
+                    'INSERT OR IGNORE INTO archive (id) VALUES (?)', (vid_id, ))
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+def is_sqlite_archive(filename):
+    if os.path.splitext(filename)[1].lower() in SQLITE_EXTENSIONS:
+        return True
+    try:
+        with io.open(encodeFilename(filename), 'rb') as f:
+            return f.read(len(SQLITE_HEADER)) == SQLITE_HEADER
+    except IOError:
+        return False
+
+
+def open_download_archive(filename):
+    """Return a download archive object suitable for the given file"""
+    if is_sqlite_archive(filename):
+        return SQLiteDownloadArchive(filename)
+    return DownloadArchive(filename)
@@ -1,37 +1,253 @@
 from __future__ import unicode_literals
 
+import base64
+import email
 import errno
+import hashlib
 import io
 import json
 import os
 import re
 import shutil
+import sys
+import threading
+import time
 import traceback
 
-from .compat import compat_getenv
+from .compat import (
+    compat_getenv,
+    compat_http_client,
+    compat_urllib_response,
+)
 from .utils import (
     expand_path,
+    import_sqlite3,
+    sanitized_Request,
     write_json_file,
+    YoutubeDLError,
 )
 
 
+class FileCacheBackend(object):
+    """
+    Cache backend storing each entry in its own JSON file,
+    <root>/<section>/<key>.json. Files are replaced atomically, so
+    processes sharing the directory never read partially written entries.
+
+    The modification time of a file is the time its entry was stored, its
+    access time is the time the entry was last loaded.
+    """
+
+    def __init__(self, root_dir):
+        self._root_dir = root_dir
+
+    def _get_cache_fn(self, section, key):
+        return os.path.join(self._root_dir, section, '%s.json' % key)
+
+    def load(self, section, key, max_age=None):
+        """
+        Return the entry or raise KeyError if there is none or it is older
+        than max_age seconds and ValueError if it cannot be decoded
+        """
+        fn = self._get_cache_fn(section, key)
+        try:
+            st = os.stat(fn)
+            if max_age is not None and time.time() - st.st_mtime > max_age:
+                raise KeyError(key)
+            with io.open(fn, 'r', encoding='utf-8') as cachef:
+                try:
+                    data = json.load(cachef)
+                except ValueError:
+                    raise ValueError('%s is corrupted (%d bytes)' % (fn, st.st_size))
+        except (IOError, OSError):
+            raise KeyError(key)
+        try:
+            # Keep track of the least recently used entries
+            os.utime(fn, (time.time(), st.st_mtime))
+        except OSError:
+            pass
+        return data
+
+    def store(self, section, key, data):
+        fn = self._get_cache_fn(section, key)
+        try:
+            os.makedirs(os.path.dirname(fn))
+        except OSError as ose:
+            if ose.errno != errno.EEXIST:
+                raise
+        write_json_file(data, fn)
+
+    def evict(self, section, max_size):
+        section_dir = os.path.join(self._root_dir, section)
+        entries = []
+        total_size = 0
+        try:
+            fns = os.listdir(section_dir)
+        except OSError:
+            return 0
+        for fn in fns:
+            if not fn.endswith('.json'):
+                continue
+            fn = os.path.join(section_dir, fn)
+            try:
+                st = os.stat(fn)
+            except OSError:
+                continue
+            entries.append((st.st_atime, st.st_size, fn))
+            total_size += st.st_size
+        for _, size, fn in sorted(entries):
+            if total_size <= max_size:
+                break
+            try:
+                os.remove(fn)
+            except OSError:
+                continue
+            total_size -= size
+        return total_size
+
+    def close(self):
+        pass
+
+
+class SQLiteCacheBackend(object):
+    """
+    Cache backend storing all the entries in a single SQLite database,
+    <root>/cache.sqlite, which SQLite keeps consistent when it is shared by
+    several processes.
+    """
+
+    _TIMEOUT = 60
+
+    def __init__(self, root_dir):
+        if import_sqlite3() is None:
+            raise YoutubeDLError(
+                'Python sqlite3 module is required to use the SQLite cache backend')
+        self.filename = os.path.join(root_dir, 'cache.sqlite')
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def _connection(self):
+        if self._conn is None:
+            try:
+                os.makedirs(os.path.dirname(self.filename))
+            except OSError as ose:
+                if ose.errno != errno.EEXIST:
+                    raise
+            self._conn = import_sqlite3().connect(
+                self.filename, timeout=self._TIMEOUT, check_same_thread=False)
+            with self._conn:
+                self._conn.execute(
+                    'CREATE TABLE IF NOT EXISTS cache ('
+                    'section TEXT, key TEXT, data TEXT, size INTEGER, '
+                    'stored REAL, accessed REAL, PRIMARY KEY (section, key))')
+        return self._conn
+
+    def load(self, section, key, max_age=None):
+        with self._lock:
+            conn = self._connection()
+            row = conn.execute(
+                'SELECT data, stored FROM cache WHERE section = ? AND key = ?',
+                (section, key)).fetchone()
+            if row is None or (max_age is not None and time.time() - row[1] > max_age):
+                raise KeyError(key)
+            with conn:
+                conn.execute(
+                    'UPDATE cache SET accessed = ? WHERE section = ? AND key = ?',
+                    (time.time(), section, key))
+        try:
+            return json.loads(row[0])
+        except ValueError:
+            raise ValueError('%s/%s in %s is corrupted' % (section, key, self.filename))
+
+    def store(self, section, key, data):
+        data = json.dumps(data)
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.execute(
+                    'INSERT OR REPLACE INTO cache VALUES (?, ?, ?, ?, ?, ?)',
+                    (section, key, data, len(data), now, now))
+
+    def evict(self, section, max_size):
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                total_size = conn.execute(
+                    'SELECT COALESCE(SUM(size), 0) FROM cache WHERE section = ?',
+                    (section, )).fetchone()[0]
+                if total_size <= max_size:
+                    return total_size
+                evicted = []
+                for key, size in conn.execute(
+                        'SELECT key, size FROM cache WHERE section = ? ORDER BY accessed',
+                        (section, )):
+                    if total_size <= max_size:
+                        break
+                    evicted.append((section, key))
+                    total_size -= size
+                conn.executemany(
+                    'DELETE FROM cache WHERE section = ? AND key = ?', evicted)
+        return total_size
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+CACHE_BACKENDS = {
+    'file': FileCacheBackend,
+    'sqlite': SQLiteCacheBackend,
+}
+
+
+def _backend_errors():
+    """Errors of the backends that are reported instead of failing the caller"""
+    sqlite3 = import_sqlite3()
+    return (IOError, OSError, ValueError, YoutubeDLError) + (
+        (sqlite3.Error, ) if sqlite3 is not None else ())
+
+
 class Cache(object):
+    # Default max_age of the entries of some sections, in seconds
+    _SECTION_MAX_AGES = {
+        'youtube-players': 30 * 24 * 3600,
+        'youtube-sigfuncs': 30 * 24 * 3600,
+    }
+
     def __init__(self, ydl):
         self._ydl = ydl
+        self._root_dir = None
+        self._backend = None
+        self._backend_lock = threading.Lock()
 
     def _get_root_dir(self):
         res = self._ydl.params.get('cachedir')
-        if res is None:
-            cache_root = compat_getenv('XDG_CACHE_HOME', '~/.cache')
-            res = os.path.join(cache_root, 'youtube-dl')
-        return expand_path(res)
+        if self._root_dir is None or self._root_dir[0] != res:
+            root_dir = res
+            if root_dir is None:
+                cache_root = compat_getenv('XDG_CACHE_HOME', '~/.cache')
+                root_dir = os.path.join(cache_root, 'youtube-dl')
+            self._root_dir = (res, expand_path(root_dir))
+        return self._root_dir[1]
 
-    def _get_cache_fn(self, section, key, dtype):
+    def _get_backend(self):
+        root_dir = self._get_root_dir()
+        backend_name = self._ydl.params.get('cache_backend') or 'file'
+        with self._backend_lock:
+            if self._backend is None or self._backend[0] != (root_dir, backend_name):
+                if self._backend is not None:
+                    self._backend[1].close()
+                self._backend = ((root_dir, backend_name), CACHE_BACKENDS[backend_name](root_dir))
+            return self._backend[1]
+
+    @staticmethod
+    def _check_key(section, key):
         assert re.match(r'^[a-zA-Z0-9_.-]+$', section), \
             'invalid section %r' % section
         assert re.match(r'^[a-zA-Z0-9_.-]+$', key), 'invalid key %r' % key
-        return os.path.join(
-            self._get_root_dir(), section, '%s.%s' % (key, dtype))
 
     @property
     def enabled(self):
@@ -39,46 +255,61 @@ class Cache(object):
 
     def store(self, section, key, data, dtype='json'):
         assert dtype in ('json',)
+        self._check_key(section, key)
 
         if not self.enabled:
             return
 
-        fn = self._get_cache_fn(section, key, dtype)
         try:
-            try:
-                os.makedirs(os.path.dirname(fn))
-            except OSError as ose:
-                if ose.errno != errno.EEXIST:
-                    raise
-            write_json_file(data, fn)
+            self._get_backend().store(section, key, data)
         except Exception:
             tb = traceback.format_exc()
             self._ydl.report_warning(
-                'Writing cache to %r failed: %s' % (fn, tb))
+                'Writing cache entry %s/%s failed: %s' % (section, key, tb))
 
-    def load(self, section, key, dtype='json', default=None):
+    def load(self, section, key, dtype='json', default=None, max_age=None):
+        """
+        Return the data stored for the key of the section, or default if
+        there is none or it was stored more than max_age seconds ago
+        (by default, the max age of the section if it has one)
+        """
         assert dtype in ('json',)
+        self._check_key(section, key)
 
         if not self.enabled:
             return default
 
-        cache_fn = self._get_cache_fn(section, key, dtype)
+        if max_age is None:
+            max_age = self._SECTION_MAX_AGES.get(section)
         try:
-            try:
-                with io.open(cache_fn, 'r', encoding='utf-8') as cachef:
-                    return json.load(cachef)
-            except ValueError:
-                try:
-                    file_size = os.path.getsize(cache_fn)
-                except (OSError, IOError) as oe:
-                    file_size = str(oe)
-                self._ydl.report_warning(
-                    'Cache retrieval from %s failed (%s)' % (cache_fn, file_size))
-        except IOError:
+            return self._get_backend().load(section, key, max_age)
+        except KeyError:
             pass  # No cache available
+        except _backend_errors() as e:
+            self._ydl.report_warning('Cache retrieval failed: %s' % e)
 
         return default
 
+    def evict(self, section, max_size):
+        """
+        Remove the least recently used entries of a section until it takes
+        at most max_size bytes, and return its size or None if unknown
+        """
+        if not self.enabled:
+            return None
+
+        try:
+            return self._get_backend().evict(section, max_size)
+        except _backend_errors() as e:
+            self._ydl.report_warning('Cache eviction failed: %s' % e)
+            return None
+
+    def close(self):
+        with self._backend_lock:
+            if self._backend is not None:
+                self._backend[1].close()
+                self._backend = None
+
     def remove(self):
         if not self.enabled:
             self._ydl.to_screen('Cache is disabled (Did you combine --no-cache-dir and --rm-cache-dir?)')
@@ -88,9 +319,162 @@ class Cache(object):
         if not any((term in cachedir) for term in ('cache', 'tmp')):
             raise Exception('Not removing directory %s - this does not look like a cache dir' % cachedir)
 
+        self.close()
         self._ydl.to_screen(
             'Removing cache dir %s .' % cachedir, skip_eol=True)
         if os.path.exists(cachedir):
             self._ydl.to_screen('.', skip_eol=True)
             shutil.rmtree(cachedir)
         self._ydl.to_screen('.')
+
+
+class HTTPCache(Cache):
+    """
+    Cache of the web pages and API responses downloaded by the extractors,
+    stored in the "http" section of the cache directory.
+
+    Only GET and HEAD requests are cached. Entries are keyed by the method,
+    URL, headers and cookies of a request, and the cookies the response set
+    are replayed along with it. They are fresh for http_cache_ttl seconds, or less if the
+    server says so with Cache-Control: max-age; stale entries are
+    revalidated with their ETag or Last-Modified value if they have one.
+    Once the cache grows larger than http_cache_max_size, the least recently
+    used entries are removed. The size is only looked up by the first store
+    and once the entries stored since then may have filled the cache.
+    """
+
+    _SECTION = 'http'
+    _DEFAULT_TTL = 3600
+    _DEFAULT_MAX_SIZE = 100 * 1024 * 1024
+    # Headers that do not apply to the decoded body that is cached
+    _DROPPED_HEADERS = ('content-encoding', 'content-length', 'transfer-encoding')
+
+    def __init__(self, ydl):
+        super(HTTPCache, self).__init__(ydl)
+        # Estimated size of the section, None until it is looked up
+        self._size = None
+        self._size_lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return bool(self._ydl.params.get('http_cache')) and super(HTTPCache, self).enabled
+
+    @staticmethod
+    def cacheable(req):
+        return req.get_method() in ('GET', 'HEAD')
+
+    def request_key(self, req):
+        """Return the key of the entry for a Request object"""
+        url = req.get_full_url()
+        cookie_req = sanitized_Request(url)
+        self._ydl.cookiejar.add_cookie_header(cookie_req)
+        data = req.data
+        if data is not None and not isinstance(data, bytes):
+            data = data.encode('utf-8')
+        key = json.dumps([
+            req.get_method(), url,
+            base64.b64encode(data).decode('ascii') if data is not None else None,
+            sorted((k.lower(), v) for k, v in req.header_items()),
+            cookie_req.get_header('Cookie')], sort_keys=True)
+        return hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def _cache_control(headers):
+        return dict(
+            (k, v.strip('"')) for k, v in re.findall(
+                r'([a-z-]+)(?:=("[^"]*"|[^,\s]*))?', (headers.get('cache-control') or '').lower()))
+
+    def _lifetime(self, headers):
+        ttl = self._ydl.params.get('http_cache_ttl')
+        if ttl is None:
+            ttl = self._DEFAULT_TTL
+        cache_control = self._cache_control(headers)
+        if 'no-cache' in cache_control:
+            return 0
+        try:
+            return min(ttl, int(cache_control['max-age']))
+        except (KeyError, ValueError):
+            return ttl
+
+    def load_response(self, key):
+        """Return the cached entry for the key or None"""
+        if not self.enabled:
+            return None
+        entry = self.load(self._SECTION, key)
+        if not isinstance(entry, dict):
+            return None
+        return entry
+
+    def is_fresh(self, entry):
+        headers = dict(entry['headers'])
+        return time.time() < entry['timestamp'] + self._lifetime(headers)
+
+    @staticmethod
+    def validators(entry):
+        """Return the headers to revalidate the entry with"""
+        headers = dict(entry['headers'])
+        validators = {}
+        if headers.get('etag'):
+            validators['If-None-Match'] = headers['etag']
+        if headers.get('last-modified'):
+            validators['If-Modified-Since'] = headers['last-modified']
+        return validators
+
+    @staticmethod
+    def response(entry):
+        """Return a response object replaying the entry"""
+        header_text = ''.join('%s: %s\r\n' % (k, v) for k, v in entry['headers'])
+        if sys.version_info[0] >= 3:
+            headers = email.message_from_string(header_text)
+        else:
+            # cookielib needs the getheaders() method of httplib messages
+            headers = compat_http_client.HTTPMessage(
+                io.BytesIO(header_text.encode('utf-8') + b'\r\n'))
+        response = compat_urllib_response.addinfourl(
+            io.BytesIO(base64.b64decode(entry['body'].encode('ascii'))),
+            headers, entry['url'], entry['status'])
+        return response
+
+    @staticmethod
+    def _header_items(info):
+        if hasattr(info, 'get_all'):
+            return info.items()
+        # Python 2 joins repeated headers, such as Set-Cookie, in items()
+        return [
+            tuple(part.strip() for part in line.split(':', 1))
+            for line in info.headers if ':' in line]
+
+    def store_response(self, key, urlh, body):
+        if not self.enabled or urlh.getcode() != 200:
+            return
+        headers = [
+            (k.lower(), v) for k, v in self._header_items(urlh.info())
+            if k.lower() not in self._DROPPED_HEADERS]
+        if 'no-store' in self._cache_control(dict(headers)):
+            return
+        entry = {
+            'url': urlh.geturl(),
+            'status': 200,
+            'headers': headers,
+            'body': base64.b64encode(body).decode('ascii'),
+            'timestamp': time.time(),
+        }
+        self.store(self._SECTION, key, entry)
+        max_size = self._ydl.params.get('http_cache_max_size')
+        if max_size is None:
+            max_size = self._DEFAULT_MAX_SIZE
+        with self._size_lock:
+            if self._size is not None:
+                # The body takes most of the space of an entry
+                self._size += len(entry['body']) + len(entry['url']) + sum(
+                    len(k) + len(v) for k, v in headers)
+                if self._size <= max_size:
+                    return
+        size = self.evict(self._SECTION, max_size)
+        with self._size_lock:
+            self._size = size
+
+    def refresh_response(self, key, entry):
+        """Mark a revalidated entry as fresh again"""
+        entry['timestamp'] = time.time()
+        self.store(self._SECTION, key, entry)
@@ -4,9 +4,7 @@ from __future__ import unicode_literals
 import base64
 import binascii
 import collections
-import ctypes
 import email
-import getpass
 import io
 import itertools
 import optparse
@@ -2788,12 +2786,15 @@ else:
 
 if sys.version_info < (3, 0) and sys.platform == 'win32':
     def compat_getpass(prompt, *args, **kwargs):
+        import getpass
         if isinstance(prompt, compat_str):
             from .utils import preferredencoding
             prompt = prompt.encode(preferredencoding())
         return getpass.getpass(prompt, *args, **kwargs)
 else:
-    compat_getpass = getpass.getpass
+    def compat_getpass(prompt, *args, **kwargs):
+        import getpass
+        return getpass.getpass(prompt, *args, **kwargs)
 
 try:
     compat_input = raw_input
@@ -2977,6 +2978,7 @@ if platform.python_implementation() == 'PyPy' and sys.pypy_version_info < (5, 4,
     # 1. https://bitbucket.org/pypy/pypy/issues/2360/windows-ctypescdll-typeerror-function-name
     # 2. https://github.com/ytdl-org/youtube-dl/pull/4392
     def compat_ctypes_WINFUNCTYPE(*args, **kwargs):
+        import ctypes
         real = ctypes.WINFUNCTYPE(*args, **kwargs)
 
         def resf(tpl, *args, **kwargs):
@@ -2986,6 +2988,7 @@ if platform.python_implementation() == 'PyPy' and sys.pypy_version_info < (5, 4,
         return resf
 else:
     def compat_ctypes_WINFUNCTYPE(*args, **kwargs):
+        import ctypes
         return ctypes.WINFUNCTYPE(*args, **kwargs)
 
 
@@ -51,6 +51,8 @@ class FileDownloader(object):
     http_chunk_size:    Size of a chunk for chunk-based HTTP downloading. May be
                         useful for bypassing bandwidth throttling imposed by
                         a webserver (experimental)
+    http_connections:   Number of connections to download a plain HTTP file
+                        with, each one fetching a part of it.
 
     Subclasses of this one must re-define the real_download method.
     """
@@ -11,7 +11,6 @@ from ..compat import (
     compat_setenv,
     compat_str,
 )
-from ..postprocessor.ffmpeg import FFmpegPostProcessor, EXT_TO_OUT_FORMATS
 from ..utils import (
     cli_option,
     cli_valueless_option,
@@ -218,9 +217,12 @@ class FFmpegFD(ExternalFD):
 
     @classmethod
     def available(cls):
+        from ..postprocessor.ffmpeg import FFmpegPostProcessor
         return FFmpegPostProcessor().available
 
     def _call_downloader(self, tmpfilename, info_dict):
+        from ..postprocessor.ffmpeg import FFmpegPostProcessor, EXT_TO_OUT_FORMATS
+
         url = info_dict['url']
         ffpp = FFmpegPostProcessor(downloader=self)
         if not ffpp.available:
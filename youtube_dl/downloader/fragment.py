@@ -1,12 +1,16 @@
 from __future__ import division, unicode_literals
 
+import io
 import os
 import time
 import json
+import threading
 
 from .common import FileDownloader
 from .http import HttpFD
+from ..compat import compat_urllib_error
 from ..utils import (
+    DownloadError,
     error_to_compat_str,
     encodeFilename,
     sanitize_open,
@@ -30,7 +34,12 @@ class FragmentFD(FileDownloader):
     skip_unavailable_fragments:
                         Skip unavailable fragments (DASH and hlsnative only)
     keep_fragments:     Keep downloaded fragments on disk after downloading is
-                        finished
+                        finished. Otherwise fragments are downloaded into
+                        memory and never written to disk on their own
+    concurrent_fragment_downloads:
+                        Number of fragments to download concurrently (DASH,
+                        hlsnative, ISM and non-live f4m only). Fragments are
+                        still appended to the destination file in order.
 
     For each incomplete fragment download youtube-dl keeps on disk a special
     bookkeeping file with download state and metadata (in future such files will
@@ -53,6 +62,10 @@ class FragmentFD(FileDownloader):
     This feature is experimental and file format may change in future.
     """
 
+    # Maximum amount of fragment data (in bytes) that may be held in memory
+    # waiting for the preceding fragments during concurrent downloading
+    _FRAGMENT_BUFFER_LIMIT = 64 * 1024 * 1024
+
     def report_retry_fragment(self, err, frag_index, count, retries):
         self.to_screen(
             '[download] Got server HTTP error: %s. Retrying fragment %d (attempt %d of %s)...'
@@ -96,15 +109,19 @@ class FragmentFD(FileDownloader):
         frag_index_stream.close()
 
     def _download_fragment(self, ctx, frag_url, info_dict, headers=None):
-        fragment_filename = '%s-Frag%d' % (ctx['tmpfilename'], ctx['fragment_index'])
-        success = ctx['dl'].download(fragment_filename, {
+        fragment_info_dict = {
             'url': frag_url,
             'http_headers': headers or info_dict.get('http_headers'),
-        })
-        if not success:
+        }
+        if not self.params.get('keep_fragments', False):
+            frag_stream = io.BytesIO()
+            if not ctx['dl'].download(frag_stream, fragment_info_dict):
+                return False, None
+            return True, frag_stream.getvalue()
+        fragment_filename = '%s-Frag%d' % (ctx['tmpfilename'], ctx['fragment_index'])
+        if not ctx['dl'].download(fragment_filename, fragment_info_dict):
             return False, None
-        down, frag_sanitized = sanitize_open(fragment_filename, 'rb')
-        ctx['fragment_filename_sanitized'] = frag_sanitized
+        down, _ = sanitize_open(fragment_filename, 'rb')
         frag_content = down.read()
         down.close()
         return True, frag_content
@@ -116,9 +133,155 @@ class FragmentFD(FileDownloader):
         finally:
             if self.__do_ytdl_file(ctx):
                 self._write_ytdl_file(ctx)
-            if not self.params.get('keep_fragments', False):
-                os.remove(encodeFilename(ctx['fragment_filename_sanitized']))
-            del ctx['fragment_filename_sanitized']
+
+    def _download_fragment_with_retries(self, ctx, fragment, info_dict):
+        """
+        Download a single fragment retrying on HTTP errors.
+
+        Returns a (success, frag_content) tuple, where success is False if the
+        whole download must be aborted and frag_content is None if the
+        fragment is unavailable and should be skipped.
+        """
+        fragment_retries = self.params.get('fragment_retries', 0)
+        fatal = fragment.get(
+            'fatal', not self.params.get('skip_unavailable_fragments', True))
+        frag_index = fragment['frag_index']
+        count = 0
+        while count <= fragment_retries:
+            try:
+                return self._download_fragment(
+                    ctx, fragment['url'], info_dict, fragment.get('headers'))
+            except compat_urllib_error.HTTPError as err:
+                # Unavailable (possibly temporary) fragments may be served.
+                # First we try to retry then either skip or abort.
+                # See https://github.com/ytdl-org/youtube-dl/issues/10165,
+                # https://github.com/ytdl-org/youtube-dl/issues/10448).
+                count += 1
+                if count <= fragment_retries:
+                    self.report_retry_fragment(err, frag_index, count, fragment_retries)
+            except DownloadError:
+                # Don't retry fragment if error occurred during HTTP downloading
+                # itself since it has own retry settings
+                if not fatal:
+                    return True, None
+                raise
+        if not fatal:
+            return True, None
+        self.report_error('giving up after %s fragment retries' % fragment_retries)
+        return False, None
+
+    def _download_and_append_fragments(self, ctx, fragments, info_dict, pack_func=None):
+        """
+        Download fragments and append them to the destination file in order.
+
+        fragments is a list of dicts with the following keys:
+        frag_index:  1-based index of the fragment among all fragments
+        url:         URL of the fragment
+        headers:     (optional) HTTP headers to use for the fragment
+        fatal:       (optional) Whether unavailability of the fragment should
+                     abort the download rather than skip the fragment
+
+        pack_func, if present, is called with the downloaded content and the
+        fragment dict right before appending and must return the data to
+        append. It is always called in fragment order from the calling thread.
+        Fragments already downloaded according to the .ytdl file are skipped.
+        """
+        fragments = [
+            fragment for fragment in fragments
+            if fragment['frag_index'] > ctx['fragment_index']]
+
+        def append_fragment(frag_content, fragment):
+            if frag_content is None:
+                self.report_skip_fragment(fragment['frag_index'])
+                return
+            if pack_func:
+                frag_content = pack_func(frag_content, fragment)
+            ctx['fragment_index'] = fragment['frag_index']
+            self._append_fragment(ctx, frag_content)
+
+        max_workers = min(
+            self.params.get('concurrent_fragment_downloads') or 1, len(fragments))
+        if max_workers <= 1:
+            for fragment in fragments:
+                ctx['fragment_index'] = fragment['frag_index']
+                success, frag_content = self._download_fragment_with_retries(
+                    ctx, fragment, info_dict)
+                if not success:
+                    return False
+                append_fragment(frag_content, fragment)
+            return True
+
+        # Fragments are handed out to the workers in order and their results
+        # are kept in a reorder buffer until all the preceding fragments have
+        # been appended. A worker does not start a new fragment while the
+        # buffer is over the memory limit unless it is the very next fragment
+        # to be appended, so that the download always makes progress.
+        cond = threading.Condition()
+        results = {}
+        pool = {
+            'next': 0,
+            'head': 0,
+            'buffered': 0,
+            'abort': False,
+        }
+
+        def worker():
+            frag_ctx = ctx.copy()
+            frag_ctx.update({
+                'dl': HttpQuietDownloader(self.ydl, ctx['dl'].params),
+                'prev_frag_downloaded_bytes': 0,
+            })
+            frag_ctx['dl'].add_progress_hook(ctx['make_frag_progress_hook'](frag_ctx))
+            while True:
+                with cond:
+                    while (not pool['abort']
+                           and pool['head'] < pool['next'] < len(fragments)
+                           and pool['buffered'] >= self._FRAGMENT_BUFFER_LIMIT):
+                        cond.wait()
+                    if pool['abort'] or pool['next'] >= len(fragments):
+                        return
+                    pos = pool['next']
+                    pool['next'] += 1
+                fragment = fragments[pos]
+                frag_ctx['fragment_index'] = fragment['frag_index']
+                try:
+                    result = self._download_fragment_with_retries(
+                        frag_ctx, fragment, info_dict)
+                except Exception as err:
+                    result = err
+                with cond:
+                    results[pos] = result
+                    if not isinstance(result, Exception) and result[1]:
+                        pool['buffered'] += len(result[1])
+                    cond.notify_all()
+
+        workers = [threading.Thread(target=worker) for _ in range(max_workers)]
+        for t in workers:
+            t.daemon = True
+            t.start()
+        try:
+            for pos, fragment in enumerate(fragments):
+                with cond:
+                    while pos not in results:
+                        cond.wait()
+                    result = results.pop(pos)
+                    pool['head'] = pos + 1
+                    if not isinstance(result, Exception) and result[1]:
+                        pool['buffered'] -= len(result[1])
+                    cond.notify_all()
+                if isinstance(result, Exception):
+                    raise result
+                success, frag_content = result
+                if not success:
+                    return False
+                append_fragment(frag_content, fragment)
+        finally:
+            with cond:
+                pool['abort'] = True
+                cond.notify_all()
+            for t in workers:
+                t.join()
+        return True
 
     def _prepare_frag_download(self, ctx):
         if 'live' not in ctx:
@@ -211,38 +374,54 @@ class FragmentFD(FileDownloader):
             'prev_frag_downloaded_bytes': 0,
         })
 
-        def frag_progress_hook(s):
-            if s['status'] not in ('downloading', 'finished'):
-                return
-
-            time_now = time.time()
-            state['elapsed'] = time_now - start
-            frag_total_bytes = s.get('total_bytes') or 0
-            if not ctx['live']:
-                estimated_size = (
-                    (ctx['complete_frags_downloaded_bytes'] + frag_total_bytes)
-                    / (state['fragment_index'] + 1) * total_frags)
-                state['total_bytes_estimate'] = estimated_size
-
-            if s['status'] == 'finished':
-                state['fragment_index'] += 1
-                ctx['fragment_index'] = state['fragment_index']
-                state['downloaded_bytes'] += frag_total_bytes - ctx['prev_frag_downloaded_bytes']
-                ctx['complete_frags_downloaded_bytes'] = state['downloaded_bytes']
-                ctx['prev_frag_downloaded_bytes'] = 0
-            else:
-                frag_downloaded_bytes = s['downloaded_bytes']
-                state['downloaded_bytes'] += frag_downloaded_bytes - ctx['prev_frag_downloaded_bytes']
-                if not ctx['live']:
-                    state['eta'] = self.calc_eta(
-                        start, time_now, estimated_size - resume_len,
-                        state['downloaded_bytes'] - resume_len)
-                state['speed'] = s.get('speed') or ctx.get('speed')
-                ctx['speed'] = state['speed']
-                ctx['prev_frag_downloaded_bytes'] = frag_downloaded_bytes
-            self._hook_progress(state)
-
-        ctx['dl'].add_progress_hook(frag_progress_hook)
+        lock = threading.Lock()
+
+        def make_frag_progress_hook(frag_ctx):
+            # frag_ctx is ctx itself for sequential downloading and a per
+            # worker copy of ctx for concurrent downloading
+            def frag_progress_hook(s):
+                if s['status'] not in ('downloading', 'finished'):
+                    return
+
+                with lock:
+                    time_now = time.time()
+                    state['elapsed'] = time_now - start
+                    frag_total_bytes = s.get('total_bytes') or 0
+                    if not ctx['live']:
+                        estimated_size = (
+                            (ctx['complete_frags_downloaded_bytes'] + frag_total_bytes)
+                            / (state['fragment_index'] + 1) * total_frags)
+                        state['total_bytes_estimate'] = estimated_size
+
+                    if s['status'] == 'finished':
+                        state['fragment_index'] += 1
+                        if frag_ctx is ctx:
+                            ctx['fragment_index'] = state['fragment_index']
+                        state['downloaded_bytes'] += frag_total_bytes - frag_ctx['prev_frag_downloaded_bytes']
+                        ctx['complete_frags_downloaded_bytes'] += frag_total_bytes
+                        frag_ctx['prev_frag_downloaded_bytes'] = 0
+                    else:
+                        frag_downloaded_bytes = s['downloaded_bytes']
+                        state['downloaded_bytes'] += frag_downloaded_bytes - frag_ctx['prev_frag_downloaded_bytes']
+                        if not ctx['live']:
+                            state['eta'] = self.calc_eta(
+                                start, time_now, estimated_size - resume_len,
+                                state['downloaded_bytes'] - resume_len)
+                        if frag_ctx is ctx:
+                            speed = s.get('speed')
+                        else:
+                            # Per fragment speed only reflects a single connection
+                            speed = self.calc_speed(
+                                start, time_now, state['downloaded_bytes'] - resume_len)
+                        state['speed'] = speed or ctx.get('speed')
+                        ctx['speed'] = state['speed']
+                        frag_ctx['prev_frag_downloaded_bytes'] = frag_downloaded_bytes
+                    self._hook_progress(state)
+
+            return frag_progress_hook
+
+        ctx['make_frag_progress_hook'] = make_frag_progress_hook
+        ctx['dl'].add_progress_hook(make_frag_progress_hook(ctx))
 
         return start
 
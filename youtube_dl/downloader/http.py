@@ -1,20 +1,25 @@
 from __future__ import unicode_literals
 
 import errno
+import io
+import json
 import os
 import socket
+import threading
 import time
 import random
 import re
 
 from .common import FileDownloader
 from ..compat import (
+    compat_http_client,
     compat_str,
     compat_urllib_error,
 )
 from ..utils import (
     ContentTooShortError,
     encodeFilename,
+    error_to_compat_str,
     int_or_none,
     sanitize_open,
     sanitized_Request,
@@ -25,6 +30,28 @@ from ..utils import (
 
 
 class HttpFD(FileDownloader):
+    """
+    Downloader for plain HTTP(S) URLs.
+
+    With http_connections greater than 1, a file whose size is known and
+    whose server supports byte ranges is split into that many segments
+    downloaded concurrently into their place in the temporary file. The
+    progress of the segments is kept in the .ytdl file, in the format used
+    by FragmentFD, so that each segment is resumed where it stopped:
+
+    downloader:
+        segments:
+            List of dictionaries with the start and end (inclusive) offsets
+            of a segment and the amount of bytes of it downloaded so far
+        filesize:
+            Size of the whole file
+    """
+
+    # Smallest part of a file worth its own connection
+    _MIN_SEGMENT_SIZE = 1024 * 1024
+    # Seconds between updates of the .ytdl file of a segmented download
+    _SEGMENTS_SAVE_INTERVAL = 1
+
     def real_download(self, filename, info_dict):
         url = info_dict['url']
 
@@ -33,9 +60,13 @@ class HttpFD(FileDownloader):
             __setattr__ = dict.__setitem__
             __delattr__ = dict.__delitem__
 
+        # filename may also be a writable file-like object (e.g. a fragment
+        # buffer), in which case the data is written to it as is
+        to_stream = hasattr(filename, 'write')
+
         ctx = DownloadContext()
         ctx.filename = filename
-        ctx.tmpfilename = self.temp_name(filename)
+        ctx.tmpfilename = filename if to_stream else self.temp_name(filename)
         ctx.stream = None
 
         # Do not include the Accept-Encoding header
@@ -49,6 +80,12 @@ class HttpFD(FileDownloader):
             info_dict.get('downloader_options', {}).get('http_chunk_size')
             or self.params.get('http_chunk_size') or 0)
 
+        connections = self.params.get('http_connections') or 1
+        if connections > 1 and not to_stream and filename != '-' and not is_test and not chunk_size:
+            result = self._download_segmented(filename, info_dict, headers, connections)
+            if result is not None:
+                return result
+
         ctx.open_mode = 'wb'
         ctx.resume_len = 0
         ctx.data_len = None
@@ -56,7 +93,7 @@ class HttpFD(FileDownloader):
         ctx.start_time = time.time()
         ctx.chunk_size = None
 
-        if self.params.get('continuedl', True):
+        if self.params.get('continuedl', True) and not to_stream:
             # Establish possible resume length
             if os.path.isfile(encodeFilename(ctx.tmpfilename)):
                 ctx.resume_len = os.path.getsize(
@@ -222,7 +259,7 @@ class HttpFD(FileDownloader):
             before = start  # start measuring
 
             def retry(e):
-                to_stdout = ctx.tmpfilename == '-'
+                to_stdout = to_stream or ctx.tmpfilename == '-'
                 if ctx.stream is not None:
                     if not to_stdout:
                         ctx.stream.close()
@@ -252,7 +289,13 @@ class HttpFD(FileDownloader):
                     break
 
                 # Open destination file just in time
-                if ctx.stream is None:
+                if ctx.stream is None and to_stream:
+                    ctx.stream = filename
+                    if ctx.open_mode == 'wb':
+                        # Restarting the download from scratch
+                        ctx.stream.seek(0)
+                        ctx.stream.truncate()
+                elif ctx.stream is None:
                     try:
                         ctx.stream, ctx.tmpfilename = sanitize_open(
                             ctx.tmpfilename, ctx.open_mode)
@@ -319,7 +362,7 @@ class HttpFD(FileDownloader):
                 self.to_stderr('\n')
                 self.report_error('Did not get any data blocks')
                 return False
-            if ctx.tmpfilename != '-':
+            if not to_stream and ctx.tmpfilename != '-':
                 ctx.stream.close()
 
             if data_len is not None and byte_counter != data_len:
@@ -328,10 +371,11 @@ class HttpFD(FileDownloader):
                     retry(err)
                 raise err
 
-            self.try_rename(ctx.tmpfilename, ctx.filename)
+            if not to_stream:
+                self.try_rename(ctx.tmpfilename, ctx.filename)
 
             # Update file modification time
-            if self.params.get('updatetime', True):
+            if self.params.get('updatetime', True) and not to_stream:
                 info_dict['filetime'] = self.try_utime(ctx.filename, ctx.data.info().get('last-modified', None))
 
             self._hook_progress({
@@ -360,3 +404,256 @@ class HttpFD(FileDownloader):
 
         self.report_error('giving up after %s retries' % retries)
         return False
+
+    def _probe_file_size(self, url, headers):
+        """
+        Return the size and the Last-Modified header of the file at url if
+        the server supports byte ranges, None otherwise
+        """
+        request = sanitized_Request(url, None, headers)
+        request.add_header('Range', 'bytes=0-0')
+        try:
+            data = self.ydl.urlopen(request)
+        except (compat_urllib_error.URLError, compat_http_client.HTTPException, socket.error):
+            # Let the single connection download deal with it
+            return None
+        try:
+            data.read()
+            content_range_m = re.search(
+                r'bytes 0-0/(\d+)', data.headers.get('Content-Range') or '')
+            if data.getcode() != 206 or not content_range_m:
+                return None
+            return int(content_range_m.group(1)), data.headers.get('Last-Modified')
+        finally:
+            data.close()
+
+    def _read_segments(self, filename):
+        try:
+            with io.open(encodeFilename(self.ytdl_filename(filename)), 'r', encoding='utf-8') as f:
+                downloader = json.load(f)['downloader']
+            segments = [dict(
+                (k, int(segment[k])) for k in ('start', 'end', 'downloaded'))
+                for segment in downloader['segments']]
+            return int(downloader['filesize']), segments
+        except (IOError, OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def _write_segments(self, filename, filesize, segments):
+        stream, _ = sanitize_open(self.ytdl_filename(filename), 'w')
+        try:
+            stream.write(json.dumps({
+                'downloader': {
+                    'segments': segments,
+                    'filesize': filesize,
+                },
+            }))
+        finally:
+            stream.close()
+
+    @staticmethod
+    def _is_retriable_error(err):
+        if isinstance(err, compat_urllib_error.HTTPError):
+            return 500 <= err.code < 600
+        return isinstance(err, (
+            compat_urllib_error.URLError, compat_http_client.HTTPException,
+            socket.error, ContentTooShortError))
+
+    def _download_segmented(self, filename, info_dict, headers, connections):
+        """
+        Download the file over several connections, each one fetching a
+        byte range of it.
+
+        Returns None if the file should be downloaded over a single
+        connection instead.
+        """
+        url = info_dict['url']
+        tmpfilename = self.temp_name(filename)
+        state = None
+        if self.params.get('continuedl', True):
+            state = self._read_segments(filename)
+            if state is None and os.path.isfile(encodeFilename(tmpfilename)):
+                # Partial file of a single connection download
+                return None
+
+        probe = self._probe_file_size(url, headers)
+        if probe is None:
+            return None
+        filesize, last_modified = probe
+
+        if state is not None and (
+                state[0] != filesize
+                or not os.path.isfile(encodeFilename(tmpfilename))
+                or os.path.getsize(encodeFilename(tmpfilename)) != filesize):
+            self.report_unable_to_resume()
+            state = None
+
+        if state is None:
+            count = min(connections, filesize // self._MIN_SEGMENT_SIZE)
+            if count <= 1:
+                return None
+            min_data_len = self.params.get('min_filesize')
+            max_data_len = self.params.get('max_filesize')
+            if min_data_len is not None and filesize < min_data_len:
+                self.to_screen('\r[download] File is smaller than min-filesize (%s bytes < %s bytes). Aborting.' % (filesize, min_data_len))
+                return False
+            if max_data_len is not None and filesize > max_data_len:
+                self.to_screen('\r[download] File is larger than max-filesize (%s bytes > %s bytes). Aborting.' % (filesize, max_data_len))
+                return False
+            segment_size = -(-filesize // count)
+            segments = [{
+                'start': start,
+                'end': min(start + segment_size, filesize) - 1,
+                'downloaded': 0,
+            } for start in range(0, filesize, segment_size)]
+            try:
+                stream, tmpfilename = sanitize_open(tmpfilename, 'wb')
+                stream.truncate(filesize)
+                stream.close()
+            except (OSError, IOError) as err:
+                self.report_error('unable to open for writing: %s' % str(err))
+                return False
+            filename = self.undo_temp_name(tmpfilename)
+            if self.params.get('xattr_set_filesize', False):
+                try:
+                    write_xattr(tmpfilename, 'user.ytdl.filesize', str(filesize).encode('utf-8'))
+                except (XAttrUnavailableError, XAttrMetadataError) as err:
+                    self.report_error('unable to set filesize xattr: %s' % str(err))
+        else:
+            segments = state[1]
+            self.report_resuming_byte(sum(segment['downloaded'] for segment in segments))
+
+        self.report_destination(filename)
+        self._write_segments(filename, filesize, segments)
+
+        retries = self.params.get('retries', 0)
+        lock = threading.Lock()
+        start_time = time.time()
+        progress = {
+            'downloaded': sum(segment['downloaded'] for segment in segments),
+            'saved': start_time,
+            'error': None,
+            'gave_up': False,
+        }
+        resume_len = progress['downloaded']
+
+        def download_segment(segment):
+            count = 0
+            block_size = self.params.get('buffersize', 1024)
+            stream = io.open(encodeFilename(tmpfilename), 'r+b')
+            try:
+                while segment['start'] + segment['downloaded'] <= segment['end']:
+                    if progress['error'] or progress['gave_up']:
+                        return
+                    range_start = segment['start'] + segment['downloaded']
+                    request = sanitized_Request(url, None, headers)
+                    request.add_header('Range', 'bytes=%d-%d' % (range_start, segment['end']))
+                    try:
+                        data = self.ydl.urlopen(request)
+                        try:
+                            if not re.match(
+                                    r'bytes %d-' % range_start, data.headers.get('Content-Range') or ''):
+                                raise compat_urllib_error.URLError(
+                                    'server did not honour the requested range')
+                            stream.seek(range_start)
+                            before = time.time()
+                            while True:
+                                # Stop as soon as another segment failed or
+                                # the download was interrupted
+                                if progress['error'] or progress['gave_up']:
+                                    return
+                                remaining = segment['end'] - segment['start'] - segment['downloaded'] + 1
+                                data_block = data.read(min(block_size, remaining))
+                                if not data_block:
+                                    break
+                                stream.write(data_block)
+                                stream.flush()
+                                now = time.time()
+                                with lock:
+                                    segment['downloaded'] += len(data_block)
+                                    progress['downloaded'] += len(data_block)
+                                    downloaded = progress['downloaded']
+                                    if now - progress['saved'] >= self._SEGMENTS_SAVE_INTERVAL:
+                                        progress['saved'] = now
+                                        self._write_segments(filename, filesize, segments)
+                                    self._hook_progress({
+                                        'status': 'downloading',
+                                        'downloaded_bytes': downloaded,
+                                        'total_bytes': filesize,
+                                        'tmpfilename': tmpfilename,
+                                        'filename': filename,
+                                        'eta': self.calc_eta(start_time, now, filesize - resume_len, downloaded - resume_len),
+                                        'speed': self.calc_speed(start_time, now, downloaded - resume_len),
+                                        'elapsed': now - start_time,
+                                    })
+                                self.slow_down(start_time, now, downloaded - resume_len)
+                                if not self.params.get('noresizebuffer', False):
+                                    block_size = self.best_block_size(now - before, len(data_block))
+                                before = now
+                        finally:
+                            data.close()
+                        remaining = segment['end'] - segment['start'] - segment['downloaded'] + 1
+                        if remaining:
+                            raise ContentTooShortError(
+                                segment['end'] - range_start + 1 - remaining,
+                                segment['end'] - range_start + 1)
+                    except Exception as err:
+                        if not self._is_retriable_error(err):
+                            raise
+                        count += 1
+                        if count > retries:
+                            with lock:
+                                progress['gave_up'] = True
+                            return
+                        self.report_retry(err, count, retries)
+            finally:
+                stream.close()
+
+        def worker(segment):
+            try:
+                download_segment(segment)
+            except Exception as err:
+                with lock:
+                    progress['error'] = progress['error'] or err
+
+        threads = [
+            threading.Thread(target=worker, args=(segment, ))
+            for segment in segments
+            if segment['start'] + segment['downloaded'] <= segment['end']]
+        try:
+            for t in threads:
+                t.daemon = True
+                t.start()
+            for t in threads:
+                t.join()
+        finally:
+            if any(t.is_alive() for t in threads):
+                # Interrupted, stop the remaining segments
+                progress['gave_up'] = True
+            with lock:
+                self._write_segments(filename, filesize, segments)
+
+        if progress['error']:
+            raise progress['error']
+        if progress['gave_up']:
+            self.report_error('giving up after %s retries' % retries)
+            return False
+
+        self.try_rename(tmpfilename, filename)
+        try:
+            os.remove(encodeFilename(self.ytdl_filename(filename)))
+        except OSError as err:
+            self.report_warning(
+                'unable to remove %s: %s' % (self.ytdl_filename(filename), error_to_compat_str(err)))
+
+        if self.params.get('updatetime', True):
+            info_dict['filetime'] = self.try_utime(filename, last_modified)
+
+        self._hook_progress({
+            'downloaded_bytes': filesize,
+            'total_bytes': filesize,
+            'filename': filename,
+            'status': 'finished',
+            'elapsed': time.time() - start_time,
+        })
+
+        return True
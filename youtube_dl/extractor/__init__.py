@@ -1,11 +1,38 @@
 from __future__ import unicode_literals
 
-try:
-    from .lazy_extractors import *
-    from .lazy_extractors import _ALL_CLASSES
-    _LAZY_LOADER = True
-except ImportError:
-    _LAZY_LOADER = False
+import os
+
+
+def _lazy_extractors_outdated(extractor_dir=os.path.dirname(os.path.abspath(__file__))):
+    """
+    Return True if any extractor source was modified after lazy_extractors
+    was generated from it.
+
+    Only source checkouts can get out of sync: releases are built and
+    installed as a whole, possibly with meaningless modification times.
+    """
+    if not os.path.isdir(os.path.join(extractor_dir, os.pardir, os.pardir, '.git')):
+        return False
+    try:
+        lazy_mtime = os.stat(os.path.join(extractor_dir, 'lazy_extractors.py')).st_mtime
+        return any(
+            os.stat(os.path.join(extractor_dir, fn)).st_mtime > lazy_mtime
+            for fn in os.listdir(extractor_dir)
+            if fn.endswith('.py') and fn != 'lazy_extractors.py')
+    except OSError:
+        return False
+
+
+_LAZY_LOADER = False
+if not _lazy_extractors_outdated():
+    try:
+        from .lazy_extractors import *
+        from .lazy_extractors import _ALL_CLASSES
+        _LAZY_LOADER = True
+    except ImportError:
+        pass
+
+if not _LAZY_LOADER:
     from .extractors import *
 
     _ALL_CLASSES = [
@@ -138,6 +138,7 @@ class AnvatoIE(InfoExtractor):
 
     _ANVP_RE = r'<script[^>]+\bdata-anvp\s*=\s*(["\'])(?P<anvp>(?:(?!\1).)+)\1'
     _AUTH_KEY = b'\x31\xc2\x42\x84\x9e\x73\xa0\xce'
+    _EMBED_MARKERS = ('data-anvp', )
 
     _TESTS = [{
         # from https://www.boston25news.com/news/watch-humpback-whale-breaches-right-next-to-fishing-boat-near-nh/817484874
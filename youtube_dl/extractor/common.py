@@ -4,6 +4,7 @@ from __future__ import unicode_literals
 import base64
 import datetime
 import hashlib
+import io
 import json
 import netrc
 import os
@@ -12,6 +13,7 @@ import re
 import socket
 import ssl
 import sys
+import threading
 import time
 import math
 
@@ -29,6 +31,7 @@ from ..compat import (
     compat_urllib_parse_unquote,
     compat_urllib_parse_urlencode,
     compat_urllib_request,
+    compat_urllib_response,
     compat_urlparse,
     compat_xml_parse_error,
 )
@@ -64,6 +67,7 @@ from ..utils import (
     parse_iso8601,
     parse_m3u8_attributes,
     parse_resolution,
+    ParsedWebpage,
     RegexNotFoundError,
     sanitized_Request,
     sanitize_filename,
@@ -383,16 +387,25 @@ class InfoExtractor(object):
     will be used by geo restriction bypass mechanism similarly
     to _GEO_COUNTRIES.
 
+    _EMBED_MARKERS attribute may contain a tuple of lowercase substrings at
+    least one of which occurs in any webpage this extractor's _extract_url(s)
+    methods would find an embed in. GenericIE does not look for embeds of
+    this extractor in webpages containing none of them.
+
     Finally, the _WORKING attribute should be set to False for broken IEs
     in order to warn the users and skip the tests.
     """
 
     _ready = False
     _downloader = None
+    # Serializes the initialization (e.g. login) of extractors used by
+    # concurrent downloads
+    _initialize_lock = threading.RLock()
     _x_forwarded_for_ip = None
     _GEO_BYPASS = True
     _GEO_COUNTRIES = None
     _GEO_IP_BLOCKS = None
+    _EMBED_MARKERS = None
     _WORKING = True
 
     def __init__(self, downloader=None):
@@ -432,8 +445,10 @@ class InfoExtractor(object):
             'ip_blocks': self._GEO_IP_BLOCKS,
         })
         if not self._ready:
-            self._real_initialize()
-            self._ready = True
+            with self._initialize_lock:
+                if not self._ready:
+                    self._real_initialize()
+                    self._ready = True
 
     def _initialize_geo_bypass(self, geo_bypass_context):
         """
@@ -581,50 +596,31 @@ class InfoExtractor(object):
         return compat_str(type(self).__name__[:-2])
 
     @staticmethod
-    def __can_accept_status_code(err, expected_status):
-        assert isinstance(err, compat_urllib_error.HTTPError)
+    def __is_expected_status(status, expected_status):
         if expected_status is None:
             return False
         if isinstance(expected_status, compat_integer_types):
-            return err.code == expected_status
+            return status == expected_status
         elif isinstance(expected_status, (list, tuple)):
-            return err.code in expected_status
+            return status in expected_status
         elif callable(expected_status):
-            return expected_status(err.code) is True
+            return expected_status(status) is True
         else:
             assert False
 
+    @staticmethod
+    def __can_accept_status_code(err, expected_status):
+        assert isinstance(err, compat_urllib_error.HTTPError)
+        return InfoExtractor.__is_expected_status(err.code, expected_status)
+
     def _request_webpage(self, url_or_request, video_id, note=None, errnote=None, fatal=True, data=None, headers={}, query={}, expected_status=None):
         """
         Return the response handle.
 
         See _download_webpage docstring for arguments specification.
         """
-        if note is None:
-            self.report_download_webpage(video_id)
-        elif note is not False:
-            if video_id is None:
-                self.to_screen('%s' % (note,))
-            else:
-                self.to_screen('%s: %s' % (video_id, note))
-
-        # Some sites check X-Forwarded-For HTTP header in order to figure out
-        # the origin of the client behind proxy. This allows bypassing geo
-        # restriction by faking this header's value to IP that belongs to some
-        # geo unrestricted country. We will do so once we encounter any
-        # geo restriction error.
-        if self._x_forwarded_for_ip:
-            if 'X-Forwarded-For' not in headers:
-                headers['X-Forwarded-For'] = self._x_forwarded_for_ip
-
-        if isinstance(url_or_request, compat_urllib_request.Request):
-            url_or_request = update_Request(
-                url_or_request, data=data, headers=headers, query=query)
-        else:
-            if query:
-                url_or_request = update_url_query(url_or_request, query)
-            if data is not None or headers:
-                url_or_request = sanitized_Request(url_or_request, data, headers)
+        self._report_request(video_id, note)
+        url_or_request = self._create_request(url_or_request, data, headers, query)
         exceptions = [compat_urllib_error.URLError, compat_http_client.HTTPException, socket.error]
         if hasattr(ssl, 'CertificateError'):
             exceptions.append(ssl.CertificateError)
@@ -652,6 +648,35 @@ class InfoExtractor(object):
                 self._downloader.report_warning(errmsg)
                 return False
 
+    def _report_request(self, video_id, note):
+        if note is None:
+            self.report_download_webpage(video_id)
+        elif note is not False:
+            if video_id is None:
+                self.to_screen('%s' % (note,))
+            else:
+                self.to_screen('%s: %s' % (video_id, note))
+
+    def _create_request(self, url_or_request, data=None, headers={}, query={}):
+        # Some sites check X-Forwarded-For HTTP header in order to figure out
+        # the origin of the client behind proxy. This allows bypassing geo
+        # restriction by faking this header's value to IP that belongs to some
+        # geo unrestricted country. We will do so once we encounter any
+        # geo restriction error.
+        if self._x_forwarded_for_ip:
+            if 'X-Forwarded-For' not in headers:
+                headers['X-Forwarded-For'] = self._x_forwarded_for_ip
+
+        if isinstance(url_or_request, compat_urllib_request.Request):
+            url_or_request = update_Request(
+                url_or_request, data=data, headers=headers, query=query)
+        else:
+            if query:
+                url_or_request = update_url_query(url_or_request, query)
+            if data is not None or headers:
+                url_or_request = sanitized_Request(url_or_request, data, headers)
+        return url_or_request
+
     def _download_webpage_handle(self, url_or_request, video_id, note=None, errnote=None, fatal=True, encoding=None, data=None, headers={}, query={}, expected_status=None):
         """
         Return a tuple (page content as string, URL handle).
@@ -662,13 +687,63 @@ class InfoExtractor(object):
         if isinstance(url_or_request, (compat_str, str)):
             url_or_request = url_or_request.partition('#')[0]
 
-        urlh = self._request_webpage(url_or_request, video_id, note, errnote, fatal, data=data, headers=headers, query=query, expected_status=expected_status)
+        http_cache = getattr(self._downloader, 'http_cache', None)
+        if http_cache is not None and http_cache.enabled:
+            urlh = self._request_webpage_cached(http_cache, url_or_request, video_id, note, errnote, fatal, data=data, headers=headers, query=query, expected_status=expected_status)
+        else:
+            urlh = self._request_webpage(url_or_request, video_id, note, errnote, fatal, data=data, headers=headers, query=query, expected_status=expected_status)
         if urlh is False:
             assert not fatal
             return False
         content = self._webpage_read_content(urlh, url_or_request, video_id, note, errnote, fatal, encoding=encoding)
         return (content, urlh)
 
+    def _request_webpage_cached(self, http_cache, url_or_request, video_id, note=None, errnote=None, fatal=True, data=None, headers={}, query={}, expected_status=None):
+        """
+        Return the response handle, replaying the response from the HTTP
+        cache if possible. The returned handle is always fully read.
+        """
+        request = self._create_request(url_or_request, data, headers, query)
+        if not isinstance(request, compat_urllib_request.Request):
+            request = sanitized_Request(request)
+        if not http_cache.cacheable(request):
+            return self._request_webpage(request, video_id, note, errnote, fatal, expected_status=expected_status)
+
+        def replay(entry):
+            response = http_cache.response(entry)
+            # Pages may rely on the session cookies they set
+            self._downloader.cookiejar.extract_cookies(response, request)
+            return response
+
+        key = http_cache.request_key(request)
+        entry = http_cache.load_response(key)
+        urlh = None
+        if entry is not None:
+            if http_cache.is_fresh(entry):
+                self._report_request(video_id, note)
+                return replay(entry)
+            validators = http_cache.validators(entry)
+            if validators:
+                def check_status(status):
+                    return status == 304 or self.__is_expected_status(status, expected_status)
+
+                urlh = self._request_webpage(
+                    update_Request(request, headers=validators), video_id, note, errnote, fatal,
+                    expected_status=check_status)
+                if urlh is not False and urlh.getcode() == 304:
+                    urlh.close()
+                    http_cache.refresh_response(key, entry)
+                    return replay(entry)
+        if urlh is None:
+            urlh = self._request_webpage(request, video_id, note, errnote, fatal, expected_status=expected_status)
+        if urlh is False:
+            return False
+        body = urlh.read()
+        urlh.close()
+        http_cache.store_response(key, urlh, body)
+        return compat_urllib_response.addinfourl(
+            io.BytesIO(body), urlh.info(), urlh.geturl(), urlh.getcode())
+
     @staticmethod
     def _guess_encoding_from_content(content_type, webpage_bytes):
         m = re.match(r'[a-zA-Z0-9_.-]+/[a-zA-Z0-9_.-]+\s*;\s*charset=(.+)', content_type)
@@ -809,6 +884,17 @@ class InfoExtractor(object):
             content, _ = res
             return content
 
+    def _download_parsed_webpage(self, *args, **kwargs):
+        """
+        Return the data of the page as a ParsedWebpage.
+
+        See _download_webpage docstring for arguments specification.
+        """
+        webpage = self._download_webpage(*args, **kwargs)
+        if webpage is False:
+            return webpage
+        return ParsedWebpage(webpage)
+
     def _download_xml_handle(
             self, url_or_request, video_id, note='Downloading XML',
             errnote='Unable to download XML', transform_source=None,
@@ -1022,6 +1108,15 @@ class InfoExtractor(object):
         else:
             return res
 
+    def _search_script_regex(self, pattern, string, name, default=NO_DEFAULT, fatal=True, flags=0, group=None):
+        """
+        Like _search_regex, but for data found in <script>s: only their
+        contents are searched if string is a ParsedWebpage.
+        """
+        if isinstance(string, ParsedWebpage):
+            string = string.script_text
+        return self._search_regex(pattern, string, name, default, fatal, flags, group)
+
     def _get_netrc_login_info(self, netrc_machine=None):
         username = None
         password = None
@@ -1107,6 +1202,8 @@ class InfoExtractor(object):
         og_regexes = []
         for p in prop:
             og_regexes.extend(self._og_regexes(p))
+        if isinstance(html, ParsedWebpage):
+            html = html.meta_html
         escaped = self._search_regex(og_regexes, html, name, flags=re.DOTALL, **kargs)
         if escaped is None:
             return None
@@ -1125,6 +1222,8 @@ class InfoExtractor(object):
         regexes = self._og_regexes('video') + self._og_regexes('video:url')
         if secure:
             regexes = self._og_regexes('video:secure_url') + regexes
+        if isinstance(html, ParsedWebpage):
+            html = html.meta_html
         return self._html_search_regex(regexes, html, name, **kargs)
 
     def _og_search_url(self, html, **kargs):
@@ -1135,6 +1234,8 @@ class InfoExtractor(object):
             name = [name]
         if display_name is None:
             display_name = name[0]
+        if isinstance(html, ParsedWebpage):
+            html = html.meta_html
         return self._html_search_regex(
             [self._meta_regex(n) for n in name],
             html, display_name, fatal=fatal, group='content', **kwargs)
@@ -1144,6 +1245,8 @@ class InfoExtractor(object):
 
     def _rta_search(self, html):
         # See http://www.rtalabel.org/index.php?content=howtofaq#single
+        if isinstance(html, ParsedWebpage):
+            html = html.meta_html
         if re.search(r'(?ix)<meta\s+name="rating"\s+'
                      r'     content="RTA-5042-1996-1400-1577-RTA"',
                      html):
@@ -1187,16 +1290,19 @@ class InfoExtractor(object):
                                       'twitter card player')
 
     def _search_json_ld(self, html, video_id, expected_type=None, **kwargs):
-        json_ld_list = list(re.finditer(JSON_LD_RE, html))
+        if isinstance(html, ParsedWebpage):
+            json_ld_list = html.json_ld
+        else:
+            json_ld_list = [mobj.group('json_ld') for mobj in re.finditer(JSON_LD_RE, html)]
         default = kwargs.get('default', NO_DEFAULT)
         # JSON-LD may be malformed and thus `fatal` should be respected.
         # At the same time `default` may be passed that assumes `fatal=False`
         # for _search_regex. Let's simulate the same behavior here as well.
         fatal = kwargs.get('fatal', True) if default == NO_DEFAULT else False
         json_ld = []
-        for mobj in json_ld_list:
+        for json_ld_str in json_ld_list:
             json_ld_item = self._parse_json(
-                mobj.group('json_ld'), video_id, fatal=fatal)
+                json_ld_str, video_id, fatal=fatal)
             if not json_ld_item:
                 continue
             if isinstance(json_ld_item, dict):
@@ -1334,6 +1440,8 @@ class InfoExtractor(object):
 
     @staticmethod
     def _hidden_inputs(html):
+        if isinstance(html, ParsedWebpage):
+            html = html.input_html
         html = re.sub(r'<!--(?:(?!<!--).)*-->', '', html)
         hidden_inputs = {}
         for input in re.findall(r'(?i)(<input[^>]+>)', html):
@@ -1363,51 +1471,48 @@ class InfoExtractor(object):
             # formats sorting in some cases)
             if 'tbr' not in f and f.get('abr') is not None and f.get('vbr') is not None:
                 f['tbr'] = f['abr'] + f['vbr']
-
-        def _formats_key(f):
             # TODO remove the following workaround
-            from ..utils import determine_ext
             if not f.get('ext') and 'url' in f:
                 f['ext'] = determine_ext(f['url'])
 
-            if isinstance(field_preference, (list, tuple)):
-                return tuple(
-                    f.get(field)
-                    if f.get(field) is not None
-                    else ('' if field == 'format_id' else -1)
-                    for field in field_preference)
+        if isinstance(field_preference, (list, tuple)):
+            formats.sort(key=lambda f: tuple(
+                f.get(field)
+                if f.get(field) is not None
+                else ('' if field == 'format_id' else -1)
+                for field in field_preference))
+            return
+
+        # Everything that does not depend on the format is looked up once,
+        # the key of each format is then built once by sort()
+        if self._downloader.params.get('prefer_free_formats'):
+            audio_order = ('aac', 'mp3', 'm4a', 'webm', 'ogg', 'opus')
+            video_order = ('flv', 'mp4', 'webm')
+        else:
+            audio_order = ('webm', 'opus', 'ogg', 'mp3', 'aac', 'm4a')
+            video_order = ('webm', 'flv', 'mp4')
+        audio_ext_preferences = dict((ext, i) for i, ext in enumerate(audio_order))
+        video_ext_preferences = dict((ext, i) for i, ext in enumerate(video_order))
+        proto_preferences = {'http': 0, 'https': 0, 'rtsp': -0.5}
 
+        def _formats_key(f):
             preference = f.get('preference')
             if preference is None:
                 preference = 0
-                if f.get('ext') in ['f4f', 'f4m']:  # Not yet supported
+                if f.get('ext') in ('f4f', 'f4m'):  # Not yet supported
                     preference -= 0.5
 
             protocol = f.get('protocol') or determine_protocol(f)
-            proto_preference = 0 if protocol in ['http', 'https'] else (-0.5 if protocol == 'rtsp' else -0.1)
+            proto_preference = proto_preferences.get(protocol, -0.1)
 
             if f.get('vcodec') == 'none':  # audio only
                 preference -= 50
-                if self._downloader.params.get('prefer_free_formats'):
-                    ORDER = ['aac', 'mp3', 'm4a', 'webm', 'ogg', 'opus']
-                else:
-                    ORDER = ['webm', 'opus', 'ogg', 'mp3', 'aac', 'm4a']
                 ext_preference = 0
-                try:
-                    audio_ext_preference = ORDER.index(f['ext'])
-                except ValueError:
-                    audio_ext_preference = -1
+                audio_ext_preference = audio_ext_preferences.get(f.get('ext'), -1)
             else:
                 if f.get('acodec') == 'none':  # video only
                     preference -= 40
-                if self._downloader.params.get('prefer_free_formats'):
-                    ORDER = ['flv', 'mp4', 'webm']
-                else:
-                    ORDER = ['webm', 'flv', 'mp4']
-                try:
-                    ext_preference = ORDER.index(f['ext'])
-                except ValueError:
-                    ext_preference = -1
+                ext_preference = video_ext_preferences.get(f.get('ext'), -1)
                 audio_ext_preference = 0
 
             return (
@@ -2509,6 +2614,8 @@ class InfoExtractor(object):
             return is_plain_url, formats
 
         entries = []
+        if isinstance(webpage, ParsedWebpage):
+            webpage = webpage.media_html
         # amp-video and amp-audio are very similar to their HTML5 counterparts
         # so we wll include them right here (see
         # https://www.ampproject.org/docs/reference/components/amp-video)
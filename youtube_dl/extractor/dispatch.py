@@ -0,0 +1,273 @@
+from __future__ import unicode_literals
+
+import collections
+import sys
+import threading
+
+try:
+    # Python 3.11+ deprecates the public aliases
+    from re import _parser as sre_parse
+except ImportError:
+    import sre_parse
+
+from .common import InfoExtractor
+from ..compat import compat_chr
+
+
+# Length of the substrings of URLs the extractors are indexed by
+NGRAM_LENGTH = 4
+# Maximum number of alternatives tracked for a literal part of a regex
+_MAX_ALTERNATIVES = 16
+
+
+def _op_name(op):
+    # Opcodes are named ints on Python 3 and lowercase strings on Python 2
+    return getattr(op, 'name', op).upper()
+
+
+def _is_valid_requirement(strings):
+    return bool(strings) and all(len(s) >= NGRAM_LENGTH for s in strings)
+
+
+def _requirement_quality(requirement):
+    # Prefer requirements made of few long literals
+    return min(len(s) for s in requirement), -len(requirement)
+
+
+def _best_requirement(requirements):
+    if not requirements:
+        return None
+    return max(requirements, key=_requirement_quality)
+
+
+def _analyze_sequence(items):
+    """
+    Analyze a sequence of regex items.
+
+    Returns an (exact, requirements) tuple, where exact is the set of all the
+    strings the sequence may match (or None if it is unbounded or too big)
+    and requirements is a list of sets of literals such that every match
+    contains at least one literal of each set. All strings are lowercased.
+    """
+    exact = set([''])
+    # Plain literal characters following the strings in exact
+    tail = []
+    requirements = []
+    is_exact = True
+    # Iterating over SubPattern itself is slow
+    for op, av in getattr(items, 'data', items):
+        op = _op_name(op)
+        if op == 'LITERAL' and av < 128:
+            tail.append(compat_chr(av).lower())
+            continue
+        if tail:
+            tail = ''.join(tail)
+            exact = set(e + tail for e in exact)
+            tail = []
+        node_exact, node_requirements = _analyze_node(op, av)
+        if node_exact is not None and len(exact) * len(node_exact) <= _MAX_ALTERNATIVES:
+            exact = set(e + s for e in exact for s in node_exact)
+            continue
+        is_exact = False
+        # Literal part is finished, every match contains one of its strings
+        requirements.append(exact)
+        if node_exact is not None:
+            exact = set(node_exact)
+        else:
+            requirements.extend(node_requirements)
+            exact = set([''])
+    if tail:
+        tail = ''.join(tail)
+        exact = set(e + tail for e in exact)
+    if is_exact:
+        return exact, []
+    requirements.append(exact)
+    return None, [r for r in requirements if _is_valid_requirement(r)]
+
+
+def _analyze_node(op, av):
+    if op == 'LITERAL':
+        if av > 127:
+            return None, []
+        return set([compat_chr(av).lower()]), []
+    elif op == 'IN':
+        if len(av) > 16 or any(_op_name(o) != 'LITERAL' or a > 127 for o, a in av):
+            return None, []
+        return set(compat_chr(a).lower() for _, a in av), []
+    elif op in ('AT', 'ASSERT', 'ASSERT_NOT'):
+        # Zero-width
+        return set(['']), []
+    elif op == 'SUBPATTERN':
+        return _analyze_sequence(av[-1])
+    elif op == 'ATOMIC_GROUP':
+        return _analyze_sequence(av)
+    elif op == 'BRANCH':
+        branches = [_analyze_sequence(b) for b in av[1]]
+        if all(e is not None for e, _ in branches):
+            exact = set()
+            for e, _ in branches:
+                exact |= e
+            if len(exact) <= _MAX_ALTERNATIVES:
+                return exact, []
+        # Every match contains one of the literals required by any of the branches
+        requirement = set()
+        for e, r in branches:
+            r = _best_requirement(([e] if _is_valid_requirement(e) else []) + r)
+            if r is None:
+                return None, []
+            requirement |= r
+        return None, [requirement]
+    elif op in ('MAX_REPEAT', 'MIN_REPEAT', 'POSSESSIVE_REPEAT'):
+        lo, hi, item = av
+        exact, requirements = _analyze_sequence(item)
+        if lo == 0:
+            if hi == 1 and exact is not None:
+                return exact | set(['']), []
+            return None, []
+        if exact is not None:
+            if lo == hi and len(exact) ** lo <= _MAX_ALTERNATIVES:
+                result = set([''])
+                for _ in range(lo):
+                    result = set(r + e for r in result for e in exact)
+                return result, []
+            requirements = [exact] + requirements
+        return None, [r for r in requirements if _is_valid_requirement(r)]
+    return None, []
+
+
+def url_requirements(regex, max_requirements=3):
+    """
+    Return a list of sets of lowercase literals, such that every string
+    matching the regex contains (ignoring case) at least one literal of each
+    set. Only literals at least NGRAM_LENGTH long are considered and only
+    the best max_requirements requirements are returned.
+    """
+    try:
+        exact, requirements = _analyze_sequence(sre_parse.parse(regex))
+    except Exception:
+        return []
+    if exact is not None:
+        requirements = [exact] if _is_valid_requirement(exact) else []
+    return sorted(requirements, key=_requirement_quality, reverse=True)[:max_requirements]
+
+
+def url_ngrams(url):
+    """Return the set of substrings the URL may be looked up by, or None"""
+    try:
+        url.encode('ascii')
+    except UnicodeError:
+        # Case folding of non-ASCII characters may not be consistent with
+        # regex matching, do not take any chances
+        return None
+    url = url.lower()
+    return set(url[i:i + NGRAM_LENGTH] for i in range(len(url) - NGRAM_LENGTH + 1))
+
+
+def _has_default_suitable(ie_cls):
+    func = getattr(ie_cls.suitable, '__func__', None)
+    if func is InfoExtractor.suitable.__func__:
+        return True
+    # Lazy extractors carry a copy of InfoExtractor.suitable
+    lazy_extractors = sys.modules.get(__name__.rpartition('.')[0] + '.lazy_extractors')
+    return (lazy_extractors is not None
+            and func is lazy_extractors.LazyLoadExtractor.suitable.__func__)
+
+
+# Requirements of extractor classes are shared by all the indexes
+_requirements_cache = {}
+
+
+def _ie_requirements(ie_cls):
+    requirements = _requirements_cache.get(ie_cls)
+    if requirements is None:
+        valid_url = getattr(ie_cls, '_VALID_URL', None)
+        requirements = (
+            url_requirements(valid_url)
+            if valid_url and _has_default_suitable(ie_cls) else [])
+        _requirements_cache[ie_cls] = requirements
+    return requirements
+
+
+class ExtractorIndex(object):
+    """
+    Index of info extractors (classes or instances) used to quickly find the
+    extractors that may be suitable for a URL.
+
+    Extractors using the default suitable() are indexed by a few substrings of
+    the literals their _VALID_URL requires, so only the extractors whose
+    substrings occur in a URL (and the ones that cannot be indexed) need to
+    be tried. Candidates are returned in the order the extractors were added,
+    thus the first suitable extractor is the same as with a linear walk.
+
+    Building the index costs about as much as compiling every _VALID_URL, so
+    it is only built once more than lookup_threshold lookups have been made.
+    """
+
+    def __init__(self, lookup_threshold=8):
+        self._lookup_threshold = lookup_threshold
+        self._lookups = 0
+        self._ies = []
+        self._pending = []
+        self._index = collections.defaultdict(list)
+        self._unindexed = []
+        self._ngram_frequency = None
+        self._lock = threading.Lock()
+
+    def add(self, ie):
+        with self._lock:
+            self._pending.append(ie)
+
+    def _build(self):
+        pending, self._pending = self._pending, []
+        if self._ngram_frequency is None:
+            # Prefer the rarest substrings among the extractors
+            self._ngram_frequency = collections.Counter()
+            for ie in pending:
+                ngrams = set()
+                for requirement in _ie_requirements(ie if isinstance(ie, type) else type(ie)):
+                    for literal in requirement:
+                        ngrams.update(
+                            literal[i:i + NGRAM_LENGTH]
+                            for i in range(len(literal) - NGRAM_LENGTH + 1))
+                self._ngram_frequency.update(ngrams)
+        for ie in pending:
+            pos = len(self._ies)
+            self._ies.append(ie)
+            keys = self._select_keys(ie if isinstance(ie, type) else type(ie))
+            if keys is None:
+                self._unindexed.append(pos)
+                continue
+            for key in keys:
+                self._index[key].append(pos)
+
+    def _select_keys(self, ie_cls):
+        best = None
+        for requirement in _ie_requirements(ie_cls):
+            keys = set()
+            cost = 0
+            for literal in requirement:
+                frequency, key = min(
+                    (self._ngram_frequency[literal[i:i + NGRAM_LENGTH]], literal[i:i + NGRAM_LENGTH])
+                    for i in range(len(literal) - NGRAM_LENGTH + 1))
+                if key not in keys:
+                    keys.add(key)
+                    cost += frequency
+            if best is None or cost < best[0]:
+                best = (cost, keys)
+        return best[1] if best else None
+
+    def candidates(self, url):
+        """Return the extractors that may be suitable for the URL, in order"""
+        with self._lock:
+            if self._lookups < self._lookup_threshold:
+                self._lookups += 1
+                return self._ies + self._pending
+            if self._pending:
+                self._build()
+        ngrams = url_ngrams(url)
+        if ngrams is None:
+            return list(self._ies)
+        positions = set(self._unindexed)
+        for ngram in ngrams:
+            positions.update(self._index.get(ngram, ()))
+        return [self._ies[pos] for pos in sorted(positions)]
@@ -26,6 +26,7 @@ from ..utils import (
     merge_dicts,
     mimetype2ext,
     orderedSet,
+    ParsedWebpage,
     sanitized_Request,
     smuggle_url,
     unescapeHTML,
@@ -2430,6 +2431,16 @@ class GenericIE(InfoExtractor):
         webpage = re.sub(
             r'<div[^>]+class=[^>]*?\bsqs-video-wrapper\b[^>]*>',
             lambda x: unescapeHTML(x.group(0)), webpage)
+        # The page is searched for metadata and embeds by lots of helpers below
+        webpage = ParsedWebpage(webpage)
+
+        # Most embeds can only be found in webpages containing some marker
+        # substring, do not look for those whose markers are all missing
+        lowered_webpage = webpage.lower()
+
+        def may_embed(ie):
+            return ie._EMBED_MARKERS is None or any(
+                marker in lowered_webpage for marker in ie._EMBED_MARKERS)
 
         # it's tempting to parse this further, but you would
         # have to take into account all the variations like
@@ -2467,7 +2478,7 @@ class GenericIE(InfoExtractor):
         })
 
         # Look for Brightcove Legacy Studio embeds
-        bc_urls = BrightcoveLegacyIE._extract_brightcove_urls(webpage)
+        bc_urls = BrightcoveLegacyIE._extract_brightcove_urls(webpage) if may_embed(BrightcoveLegacyIE) else []
         if bc_urls:
             entries = [{
                 '_type': 'url',
@@ -2483,7 +2494,7 @@ class GenericIE(InfoExtractor):
             }
 
         # Look for Brightcove New Studio embeds
-        bc_urls = BrightcoveNewIE._extract_urls(self, webpage)
+        bc_urls = BrightcoveNewIE._extract_urls(self, webpage) if may_embed(BrightcoveNewIE) else []
         if bc_urls:
             return self.playlist_from_matches(
                 bc_urls, video_id, video_title,
@@ -2491,17 +2502,17 @@ class GenericIE(InfoExtractor):
                 ie='BrightcoveNew')
 
         # Look for Nexx embeds
-        nexx_urls = NexxIE._extract_urls(webpage)
+        nexx_urls = NexxIE._extract_urls(webpage) if may_embed(NexxIE) else []
         if nexx_urls:
             return self.playlist_from_matches(nexx_urls, video_id, video_title, ie=NexxIE.ie_key())
 
         # Look for Nexx iFrame embeds
-        nexx_embed_urls = NexxEmbedIE._extract_urls(webpage)
+        nexx_embed_urls = NexxEmbedIE._extract_urls(webpage) if may_embed(NexxEmbedIE) else []
         if nexx_embed_urls:
             return self.playlist_from_matches(nexx_embed_urls, video_id, video_title, ie=NexxEmbedIE.ie_key())
 
         # Look for ThePlatform embeds
-        tp_urls = ThePlatformIE._extract_urls(webpage)
+        tp_urls = ThePlatformIE._extract_urls(webpage) if may_embed(ThePlatformIE) else []
         if tp_urls:
             return self.playlist_from_matches(tp_urls, video_id, video_title, ie='ThePlatform')
 
@@ -2512,7 +2523,7 @@ class GenericIE(InfoExtractor):
         if matches:
             return self.playlist_from_matches(matches, video_id, video_title, ie='RtlNl')
 
-        vimeo_urls = VimeoIE._extract_urls(url, webpage)
+        vimeo_urls = VimeoIE._extract_urls(url, webpage) if may_embed(VimeoIE) else []
         if vimeo_urls:
             return self.playlist_from_matches(vimeo_urls, video_id, video_title, ie=VimeoIE.ie_key())
 
@@ -2523,12 +2534,12 @@ class GenericIE(InfoExtractor):
             return self.url_result(vid_me_embed_url, 'Vidme')
 
         # Look for YouTube embeds
-        youtube_urls = YoutubeIE._extract_urls(webpage)
+        youtube_urls = YoutubeIE._extract_urls(webpage) if may_embed(YoutubeIE) else []
         if youtube_urls:
             return self.playlist_from_matches(
                 youtube_urls, video_id, video_title, ie=YoutubeIE.ie_key())
 
-        matches = DailymotionIE._extract_urls(webpage)
+        matches = DailymotionIE._extract_urls(webpage) if may_embed(DailymotionIE) else []
         if matches:
             return self.playlist_from_matches(matches, video_id, video_title)
 
@@ -2543,18 +2554,18 @@ class GenericIE(InfoExtractor):
                     playlists, video_id, video_title, lambda p: '//dailymotion.com/playlist/%s' % p)
 
         # Look for DailyMail embeds
-        dailymail_urls = DailyMailIE._extract_urls(webpage)
+        dailymail_urls = DailyMailIE._extract_urls(webpage) if may_embed(DailyMailIE) else []
         if dailymail_urls:
             return self.playlist_from_matches(
                 dailymail_urls, video_id, video_title, ie=DailyMailIE.ie_key())
 
         # Look for Teachable embeds, must be before Wistia
-        teachable_url = TeachableIE._extract_url(webpage, url)
+        teachable_url = TeachableIE._extract_url(webpage, url) if may_embed(TeachableIE) else None
         if teachable_url:
             return self.url_result(teachable_url)
 
         # Look for embedded Wistia player
-        wistia_urls = WistiaIE._extract_urls(webpage)
+        wistia_urls = WistiaIE._extract_urls(webpage) if may_embed(WistiaIE) else []
         if wistia_urls:
             playlist = self.playlist_from_matches(wistia_urls, video_id, video_title, ie=WistiaIE.ie_key())
             for entry in playlist['entries']:
@@ -2565,7 +2576,7 @@ class GenericIE(InfoExtractor):
             return playlist
 
         # Look for SVT player
-        svt_url = SVTIE._extract_url(webpage)
+        svt_url = SVTIE._extract_url(webpage) if may_embed(SVTIE) else None
         if svt_url:
             return self.url_result(svt_url, 'SVT')
 
@@ -2638,7 +2649,7 @@ class GenericIE(InfoExtractor):
             return self.url_result(mobj.group(1), 'Mpora')
 
         # Look for embedded Facebook player
-        facebook_urls = FacebookIE._extract_urls(webpage)
+        facebook_urls = FacebookIE._extract_urls(webpage) if may_embed(FacebookIE) else []
         if facebook_urls:
             return self.playlist_from_matches(facebook_urls, video_id, video_title)
 
@@ -2648,7 +2659,7 @@ class GenericIE(InfoExtractor):
             return self.url_result(mobj.group('url'), 'VK')
 
         # Look for embedded Odnoklassniki player
-        odnoklassniki_url = OdnoklassnikiIE._extract_url(webpage)
+        odnoklassniki_url = OdnoklassnikiIE._extract_url(webpage) if may_embed(OdnoklassnikiIE) else None
         if odnoklassniki_url:
             return self.url_result(odnoklassniki_url, OdnoklassnikiIE.ie_key())
 
@@ -2683,62 +2694,62 @@ class GenericIE(InfoExtractor):
             return self.playlist_from_matches(matches, video_id, video_title, ie='BBCCoUk')
 
         # Look for embedded RUTV player
-        rutv_url = RUTVIE._extract_url(webpage)
+        rutv_url = RUTVIE._extract_url(webpage) if may_embed(RUTVIE) else None
         if rutv_url:
             return self.url_result(rutv_url, 'RUTV')
 
         # Look for embedded TVC player
-        tvc_url = TVCIE._extract_url(webpage)
+        tvc_url = TVCIE._extract_url(webpage) if may_embed(TVCIE) else None
         if tvc_url:
             return self.url_result(tvc_url, 'TVC')
 
         # Look for embedded SportBox player
-        sportbox_urls = SportBoxIE._extract_urls(webpage)
+        sportbox_urls = SportBoxIE._extract_urls(webpage) if may_embed(SportBoxIE) else []
         if sportbox_urls:
             return self.playlist_from_matches(sportbox_urls, video_id, video_title, ie=SportBoxIE.ie_key())
 
         # Look for embedded XHamster player
-        xhamster_urls = XHamsterEmbedIE._extract_urls(webpage)
+        xhamster_urls = XHamsterEmbedIE._extract_urls(webpage) if may_embed(XHamsterEmbedIE) else []
         if xhamster_urls:
             return self.playlist_from_matches(xhamster_urls, video_id, video_title, ie='XHamsterEmbed')
 
         # Look for embedded TNAFlixNetwork player
-        tnaflix_urls = TNAFlixNetworkEmbedIE._extract_urls(webpage)
+        tnaflix_urls = TNAFlixNetworkEmbedIE._extract_urls(webpage) if may_embed(TNAFlixNetworkEmbedIE) else []
         if tnaflix_urls:
             return self.playlist_from_matches(tnaflix_urls, video_id, video_title, ie=TNAFlixNetworkEmbedIE.ie_key())
 
         # Look for embedded PornHub player
-        pornhub_urls = PornHubIE._extract_urls(webpage)
+        pornhub_urls = PornHubIE._extract_urls(webpage) if may_embed(PornHubIE) else []
         if pornhub_urls:
             return self.playlist_from_matches(pornhub_urls, video_id, video_title, ie=PornHubIE.ie_key())
 
         # Look for embedded DrTuber player
-        drtuber_urls = DrTuberIE._extract_urls(webpage)
+        drtuber_urls = DrTuberIE._extract_urls(webpage) if may_embed(DrTuberIE) else []
         if drtuber_urls:
             return self.playlist_from_matches(drtuber_urls, video_id, video_title, ie=DrTuberIE.ie_key())
 
         # Look for embedded RedTube player
-        redtube_urls = RedTubeIE._extract_urls(webpage)
+        redtube_urls = RedTubeIE._extract_urls(webpage) if may_embed(RedTubeIE) else []
         if redtube_urls:
             return self.playlist_from_matches(redtube_urls, video_id, video_title, ie=RedTubeIE.ie_key())
 
         # Look for embedded Tube8 player
-        tube8_urls = Tube8IE._extract_urls(webpage)
+        tube8_urls = Tube8IE._extract_urls(webpage) if may_embed(Tube8IE) else []
         if tube8_urls:
             return self.playlist_from_matches(tube8_urls, video_id, video_title, ie=Tube8IE.ie_key())
 
         # Look for embedded Mofosex player
-        mofosex_urls = MofosexEmbedIE._extract_urls(webpage)
+        mofosex_urls = MofosexEmbedIE._extract_urls(webpage) if may_embed(MofosexEmbedIE) else []
         if mofosex_urls:
             return self.playlist_from_matches(mofosex_urls, video_id, video_title, ie=MofosexEmbedIE.ie_key())
 
         # Look for embedded Spankwire player
-        spankwire_urls = SpankwireIE._extract_urls(webpage)
+        spankwire_urls = SpankwireIE._extract_urls(webpage) if may_embed(SpankwireIE) else []
         if spankwire_urls:
             return self.playlist_from_matches(spankwire_urls, video_id, video_title, ie=SpankwireIE.ie_key())
 
         # Look for embedded YouPorn player
-        youporn_urls = YouPornIE._extract_urls(webpage)
+        youporn_urls = YouPornIE._extract_urls(webpage) if may_embed(YouPornIE) else []
         if youporn_urls:
             return self.playlist_from_matches(youporn_urls, video_id, video_title, ie=YouPornIE.ie_key())
 
@@ -2755,7 +2766,7 @@ class GenericIE(InfoExtractor):
             return self.url_result(mobj.group('url'), 'TED')
 
         # Look for embedded Ustream videos
-        ustream_url = UstreamIE._extract_url(webpage)
+        ustream_url = UstreamIE._extract_url(webpage) if may_embed(UstreamIE) else None
         if ustream_url:
             return self.url_result(ustream_url, UstreamIE.ie_key())
 
@@ -2774,27 +2785,27 @@ class GenericIE(InfoExtractor):
             return self.url_result(mobj.group('url'))
 
         # Look for embedded smotri.com player
-        smotri_url = SmotriIE._extract_url(webpage)
+        smotri_url = SmotriIE._extract_url(webpage) if may_embed(SmotriIE) else None
         if smotri_url:
             return self.url_result(smotri_url, 'Smotri')
 
         # Look for embedded Myvi.ru player
-        myvi_url = MyviIE._extract_url(webpage)
+        myvi_url = MyviIE._extract_url(webpage) if may_embed(MyviIE) else None
         if myvi_url:
             return self.url_result(myvi_url)
 
         # Look for embedded soundcloud player
-        soundcloud_urls = SoundcloudEmbedIE._extract_urls(webpage)
+        soundcloud_urls = SoundcloudEmbedIE._extract_urls(webpage) if may_embed(SoundcloudEmbedIE) else []
         if soundcloud_urls:
             return self.playlist_from_matches(soundcloud_urls, video_id, video_title, getter=unescapeHTML)
 
         # Look for tunein player
-        tunein_urls = TuneInBaseIE._extract_urls(webpage)
+        tunein_urls = TuneInBaseIE._extract_urls(webpage) if may_embed(TuneInBaseIE) else []
         if tunein_urls:
             return self.playlist_from_matches(tunein_urls, video_id, video_title)
 
         # Look for embedded mtvservices player
-        mtvservices_url = MTVServicesEmbeddedIE._extract_url(webpage)
+        mtvservices_url = MTVServicesEmbeddedIE._extract_url(webpage) if may_embed(MTVServicesEmbeddedIE) else None
         if mtvservices_url:
             return self.url_result(mtvservices_url, ie='MTVServicesEmbedded')
 
@@ -2853,7 +2864,7 @@ class GenericIE(InfoExtractor):
             return self.url_result(mobj.group('url'), 'Zapiks')
 
         # Look for Kaltura embeds
-        kaltura_urls = KalturaIE._extract_urls(webpage)
+        kaltura_urls = KalturaIE._extract_urls(webpage) if may_embed(KalturaIE) else []
         if kaltura_urls:
             return self.playlist_from_matches(
                 kaltura_urls, video_id, video_title,
@@ -2861,7 +2872,7 @@ class GenericIE(InfoExtractor):
                 ie=KalturaIE.ie_key())
 
         # Look for EaglePlatform embeds
-        eagleplatform_url = EaglePlatformIE._extract_url(webpage)
+        eagleplatform_url = EaglePlatformIE._extract_url(webpage) if may_embed(EaglePlatformIE) else None
         if eagleplatform_url:
             return self.url_result(smuggle_url(eagleplatform_url, {'referrer': url}), EaglePlatformIE.ie_key())
 
@@ -2872,17 +2883,17 @@ class GenericIE(InfoExtractor):
             return self.url_result('eagleplatform:%(host)s:%(id)s' % mobj.groupdict(), 'EaglePlatform')
 
         # Look for Pladform embeds
-        pladform_url = PladformIE._extract_url(webpage)
+        pladform_url = PladformIE._extract_url(webpage) if may_embed(PladformIE) else None
         if pladform_url:
             return self.url_result(pladform_url)
 
         # Look for Videomore embeds
-        videomore_url = VideomoreIE._extract_url(webpage)
+        videomore_url = VideomoreIE._extract_url(webpage) if may_embed(VideomoreIE) else None
         if videomore_url:
             return self.url_result(videomore_url)
 
         # Look for Webcaster embeds
-        webcaster_url = WebcasterFeedIE._extract_url(self, webpage)
+        webcaster_url = WebcasterFeedIE._extract_url(self, webpage) if may_embed(WebcasterFeedIE) else None
         if webcaster_url:
             return self.url_result(webcaster_url, ie=WebcasterFeedIE.ie_key())
 
@@ -2905,7 +2916,7 @@ class GenericIE(InfoExtractor):
             return self.url_result(mobj.group('url'))
 
         # Look for NBC Sports VPlayer embeds
-        nbc_sports_url = NBCSportsVPlayerIE._extract_url(webpage)
+        nbc_sports_url = NBCSportsVPlayerIE._extract_url(webpage) if may_embed(NBCSportsVPlayerIE) else None
         if nbc_sports_url:
             return self.url_result(nbc_sports_url, 'NBCSportsVPlayer')
 
@@ -2916,7 +2927,7 @@ class GenericIE(InfoExtractor):
             return self.url_result(nbc_news_embed_url.group('url'), 'NBCNews')
 
         # Look for Google Drive embeds
-        google_drive_url = GoogleDriveIE._extract_url(webpage)
+        google_drive_url = GoogleDriveIE._extract_url(webpage) if may_embed(GoogleDriveIE) else None
         if google_drive_url:
             return self.url_result(google_drive_url, 'GoogleDrive')
 
@@ -2933,49 +2944,49 @@ class GenericIE(InfoExtractor):
             return self.url_result(senate_isvp_url, 'SenateISVP')
 
         # Look for Kinja embeds
-        kinja_embed_urls = KinjaEmbedIE._extract_urls(webpage, url)
+        kinja_embed_urls = KinjaEmbedIE._extract_urls(webpage, url) if may_embed(KinjaEmbedIE) else []
         if kinja_embed_urls:
             return self.playlist_from_matches(
                 kinja_embed_urls, video_id, video_title)
 
         # Look for OnionStudios embeds
-        onionstudios_url = OnionStudiosIE._extract_url(webpage)
+        onionstudios_url = OnionStudiosIE._extract_url(webpage) if may_embed(OnionStudiosIE) else None
         if onionstudios_url:
             return self.url_result(onionstudios_url)
 
         # Look for ViewLift embeds
-        viewlift_url = ViewLiftEmbedIE._extract_url(webpage)
+        viewlift_url = ViewLiftEmbedIE._extract_url(webpage) if may_embed(ViewLiftEmbedIE) else None
         if viewlift_url:
             return self.url_result(viewlift_url)
 
         # Look for JWPlatform embeds
-        jwplatform_urls = JWPlatformIE._extract_urls(webpage)
+        jwplatform_urls = JWPlatformIE._extract_urls(webpage) if may_embed(JWPlatformIE) else []
         if jwplatform_urls:
             return self.playlist_from_matches(jwplatform_urls, video_id, video_title, ie=JWPlatformIE.ie_key())
 
         # Look for Digiteka embeds
-        digiteka_url = DigitekaIE._extract_url(webpage)
+        digiteka_url = DigitekaIE._extract_url(webpage) if may_embed(DigitekaIE) else None
         if digiteka_url:
             return self.url_result(self._proto_relative_url(digiteka_url), DigitekaIE.ie_key())
 
         # Look for Arkena embeds
-        arkena_url = ArkenaIE._extract_url(webpage)
+        arkena_url = ArkenaIE._extract_url(webpage) if may_embed(ArkenaIE) else None
         if arkena_url:
             return self.url_result(arkena_url, ArkenaIE.ie_key())
 
         # Look for Piksel embeds
-        piksel_url = PikselIE._extract_url(webpage)
+        piksel_url = PikselIE._extract_url(webpage) if may_embed(PikselIE) else None
         if piksel_url:
             return self.url_result(piksel_url, PikselIE.ie_key())
 
         # Look for Limelight embeds
-        limelight_urls = LimelightBaseIE._extract_urls(webpage, url)
+        limelight_urls = LimelightBaseIE._extract_urls(webpage, url) if may_embed(LimelightBaseIE) else []
         if limelight_urls:
             return self.playlist_result(
                 limelight_urls, video_id, video_title, video_description)
 
         # Look for Anvato embeds
-        anvato_urls = AnvatoIE._extract_urls(self, webpage, video_id)
+        anvato_urls = AnvatoIE._extract_urls(self, webpage, video_id) if may_embed(AnvatoIE) else []
         if anvato_urls:
             return self.playlist_result(
                 anvato_urls, video_id, video_title, video_description)
@@ -3039,18 +3050,18 @@ class GenericIE(InfoExtractor):
             return info
 
         # Look for Instagram embeds
-        instagram_embed_url = InstagramIE._extract_embed_url(webpage)
+        instagram_embed_url = InstagramIE._extract_embed_url(webpage) if may_embed(InstagramIE) else None
         if instagram_embed_url is not None:
             return self.url_result(
                 self._proto_relative_url(instagram_embed_url), InstagramIE.ie_key())
 
         # Look for LiveLeak embeds
-        liveleak_urls = LiveLeakIE._extract_urls(webpage)
+        liveleak_urls = LiveLeakIE._extract_urls(webpage) if may_embed(LiveLeakIE) else []
         if liveleak_urls:
             return self.playlist_from_matches(liveleak_urls, video_id, video_title)
 
         # Look for 3Q SDN embeds
-        threeqsdn_url = ThreeQSDNIE._extract_url(webpage)
+        threeqsdn_url = ThreeQSDNIE._extract_url(webpage) if may_embed(ThreeQSDNIE) else None
         if threeqsdn_url:
             return {
                 '_type': 'url_transparent',
@@ -3063,80 +3074,80 @@ class GenericIE(InfoExtractor):
             }
 
         # Look for VBOX7 embeds
-        vbox7_url = Vbox7IE._extract_url(webpage)
+        vbox7_url = Vbox7IE._extract_url(webpage) if may_embed(Vbox7IE) else None
         if vbox7_url:
             return self.url_result(vbox7_url, Vbox7IE.ie_key())
 
         # Look for DBTV embeds
-        dbtv_urls = DBTVIE._extract_urls(webpage)
+        dbtv_urls = DBTVIE._extract_urls(webpage) if may_embed(DBTVIE) else []
         if dbtv_urls:
             return self.playlist_from_matches(dbtv_urls, video_id, video_title, ie=DBTVIE.ie_key())
 
         # Look for Videa embeds
-        videa_urls = VideaIE._extract_urls(webpage)
+        videa_urls = VideaIE._extract_urls(webpage) if may_embed(VideaIE) else []
         if videa_urls:
             return self.playlist_from_matches(videa_urls, video_id, video_title, ie=VideaIE.ie_key())
 
         # Look for 20 minuten embeds
-        twentymin_urls = TwentyMinutenIE._extract_urls(webpage)
+        twentymin_urls = TwentyMinutenIE._extract_urls(webpage) if may_embed(TwentyMinutenIE) else []
         if twentymin_urls:
             return self.playlist_from_matches(
                 twentymin_urls, video_id, video_title, ie=TwentyMinutenIE.ie_key())
 
         # Look for VideoPress embeds
-        videopress_urls = VideoPressIE._extract_urls(webpage)
+        videopress_urls = VideoPressIE._extract_urls(webpage) if may_embed(VideoPressIE) else []
         if videopress_urls:
             return self.playlist_from_matches(
                 videopress_urls, video_id, video_title, ie=VideoPressIE.ie_key())
 
         # Look for Rutube embeds
-        rutube_urls = RutubeIE._extract_urls(webpage)
+        rutube_urls = RutubeIE._extract_urls(webpage) if may_embed(RutubeIE) else []
         if rutube_urls:
             return self.playlist_from_matches(
                 rutube_urls, video_id, video_title, ie=RutubeIE.ie_key())
 
         # Look for WashingtonPost embeds
-        wapo_urls = WashingtonPostIE._extract_urls(webpage)
+        wapo_urls = WashingtonPostIE._extract_urls(webpage) if may_embed(WashingtonPostIE) else []
         if wapo_urls:
             return self.playlist_from_matches(
                 wapo_urls, video_id, video_title, ie=WashingtonPostIE.ie_key())
 
         # Look for Mediaset embeds
-        mediaset_urls = MediasetIE._extract_urls(self, webpage)
+        mediaset_urls = MediasetIE._extract_urls(self, webpage) if may_embed(MediasetIE) else []
         if mediaset_urls:
             return self.playlist_from_matches(
                 mediaset_urls, video_id, video_title, ie=MediasetIE.ie_key())
 
         # Look for JOJ.sk embeds
-        joj_urls = JojIE._extract_urls(webpage)
+        joj_urls = JojIE._extract_urls(webpage) if may_embed(JojIE) else []
         if joj_urls:
             return self.playlist_from_matches(
                 joj_urls, video_id, video_title, ie=JojIE.ie_key())
 
         # Look for megaphone.fm embeds
-        mpfn_urls = MegaphoneIE._extract_urls(webpage)
+        mpfn_urls = MegaphoneIE._extract_urls(webpage) if may_embed(MegaphoneIE) else []
         if mpfn_urls:
             return self.playlist_from_matches(
                 mpfn_urls, video_id, video_title, ie=MegaphoneIE.ie_key())
 
         # Look for vzaar embeds
-        vzaar_urls = VzaarIE._extract_urls(webpage)
+        vzaar_urls = VzaarIE._extract_urls(webpage) if may_embed(VzaarIE) else []
         if vzaar_urls:
             return self.playlist_from_matches(
                 vzaar_urls, video_id, video_title, ie=VzaarIE.ie_key())
 
-        channel9_urls = Channel9IE._extract_urls(webpage)
+        channel9_urls = Channel9IE._extract_urls(webpage) if may_embed(Channel9IE) else []
         if channel9_urls:
             return self.playlist_from_matches(
                 channel9_urls, video_id, video_title, ie=Channel9IE.ie_key())
 
-        vshare_urls = VShareIE._extract_urls(webpage)
+        vshare_urls = VShareIE._extract_urls(webpage) if may_embed(VShareIE) else []
         if vshare_urls:
             return self.playlist_from_matches(
                 vshare_urls, video_id, video_title, ie=VShareIE.ie_key())
 
         # Look for Mediasite embeds
-        mediasite_urls = MediasiteIE._extract_urls(webpage)
+        mediasite_urls = MediasiteIE._extract_urls(webpage) if may_embed(MediasiteIE) else []
         if mediasite_urls:
             entries = [
                 self.url_result(smuggle_url(
@@ -3145,48 +3156,48 @@ class GenericIE(InfoExtractor):
                 for mediasite_url in mediasite_urls]
             return self.playlist_result(entries, video_id, video_title)
 
-        springboardplatform_urls = SpringboardPlatformIE._extract_urls(webpage)
+        springboardplatform_urls = SpringboardPlatformIE._extract_urls(webpage) if may_embed(SpringboardPlatformIE) else []
         if springboardplatform_urls:
             return self.playlist_from_matches(
                 springboardplatform_urls, video_id, video_title,
                 ie=SpringboardPlatformIE.ie_key())
 
-        yapfiles_urls = YapFilesIE._extract_urls(webpage)
+        yapfiles_urls = YapFilesIE._extract_urls(webpage) if may_embed(YapFilesIE) else []
         if yapfiles_urls:
             return self.playlist_from_matches(
                 yapfiles_urls, video_id, video_title, ie=YapFilesIE.ie_key())
 
-        vice_urls = ViceIE._extract_urls(webpage)
+        vice_urls = ViceIE._extract_urls(webpage) if may_embed(ViceIE) else []
         if vice_urls:
             return self.playlist_from_matches(
                 vice_urls, video_id, video_title, ie=ViceIE.ie_key())
 
-        xfileshare_urls = XFileShareIE._extract_urls(webpage)
+        xfileshare_urls = XFileShareIE._extract_urls(webpage) if may_embed(XFileShareIE) else []
         if xfileshare_urls:
             return self.playlist_from_matches(
                 xfileshare_urls, video_id, video_title, ie=XFileShareIE.ie_key())
 
-        cloudflarestream_urls = CloudflareStreamIE._extract_urls(webpage)
+        cloudflarestream_urls = CloudflareStreamIE._extract_urls(webpage) if may_embed(CloudflareStreamIE) else []
         if cloudflarestream_urls:
             return self.playlist_from_matches(
                 cloudflarestream_urls, video_id, video_title, ie=CloudflareStreamIE.ie_key())
 
-        peertube_urls = PeerTubeIE._extract_urls(webpage, url)
+        peertube_urls = PeerTubeIE._extract_urls(webpage, url) if may_embed(PeerTubeIE) else []
         if peertube_urls:
             return self.playlist_from_matches(
                 peertube_urls, video_id, video_title, ie=PeerTubeIE.ie_key())
 
-        indavideo_urls = IndavideoEmbedIE._extract_urls(webpage)
+        indavideo_urls = IndavideoEmbedIE._extract_urls(webpage) if may_embed(IndavideoEmbedIE) else []
         if indavideo_urls:
             return self.playlist_from_matches(
                 indavideo_urls, video_id, video_title, ie=IndavideoEmbedIE.ie_key())
 
-        apa_urls = APAIE._extract_urls(webpage)
+        apa_urls = APAIE._extract_urls(webpage) if may_embed(APAIE) else []
         if apa_urls:
             return self.playlist_from_matches(
                 apa_urls, video_id, video_title, ie=APAIE.ie_key())
 
-        foxnews_urls = FoxNewsIE._extract_urls(webpage)
+        foxnews_urls = FoxNewsIE._extract_urls(webpage) if may_embed(FoxNewsIE) else []
         if foxnews_urls:
             return self.playlist_from_matches(
                 foxnews_urls, video_id, video_title, ie=FoxNewsIE.ie_key())
@@ -3198,17 +3209,17 @@ class GenericIE(InfoExtractor):
             return self.playlist_from_matches(
                 sharevideos_urls, video_id, video_title)
 
-        viqeo_urls = ViqeoIE._extract_urls(webpage)
+        viqeo_urls = ViqeoIE._extract_urls(webpage) if may_embed(ViqeoIE) else []
         if viqeo_urls:
             return self.playlist_from_matches(
                 viqeo_urls, video_id, video_title, ie=ViqeoIE.ie_key())
 
-        expressen_urls = ExpressenIE._extract_urls(webpage)
+        expressen_urls = ExpressenIE._extract_urls(webpage) if may_embed(ExpressenIE) else []
         if expressen_urls:
             return self.playlist_from_matches(
                 expressen_urls, video_id, video_title, ie=ExpressenIE.ie_key())
 
-        zype_urls = ZypeIE._extract_urls(webpage)
+        zype_urls = ZypeIE._extract_urls(webpage) if may_embed(ZypeIE) else []
         if zype_urls:
             return self.playlist_from_matches(
                 zype_urls, video_id, video_title, ie=ZypeIE.ie_key())
@@ -42,6 +42,7 @@ class KalturaIE(InfoExtractor):
         2: 'ttml',
         3: 'vtt',
     }
+    _EMBED_MARKERS = ('kaltura', 'kwidget.')
     _TESTS = [
         {
             'url': 'kaltura:269692:1_1jc2y3e4',
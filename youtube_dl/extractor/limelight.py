@@ -18,6 +18,7 @@ from ..utils import (
 
 class LimelightBaseIE(InfoExtractor):
     _PLAYLIST_SERVICE_URL = 'http://production-ps.lvp.llnw.net/r/PlaylistService/%s/%s/%s'
+    _EMBED_MARKERS = ('limelight', )
 
     @classmethod
     def _extract_urls(cls, webpage, source_url):
@@ -8,6 +8,7 @@ from ..utils import int_or_none
 
 class LiveLeakIE(InfoExtractor):
     _VALID_URL = r'https?://(?:\w+\.)?liveleak\.com/view\?.*?\b[it]=(?P<id>[\w_]+)'
+    _EMBED_MARKERS = ('liveleak.com/ll_embed?', )
     _TESTS = [{
         'url': 'http://www.liveleak.com/view?i=757_1364311680',
         'md5': '0813c2430bea7a46bf13acf3406992f4',
@@ -28,6 +28,7 @@ class MediasetIE(ThePlatformBaseIE):
                             )
                     )(?P<id>[0-9A-Z]{16,})
                     '''
+    _EMBED_MARKERS = ('video.mediaset.it/player/playeriframe', )
     _TESTS = [{
         # full episode
         'url': 'https://www.mediasetplay.mediaset.it/video/hellogoodbye/quarta-puntata_FAFU000000661824',
@@ -11,6 +11,7 @@ class MegaphoneIE(InfoExtractor):
     IE_NAME = 'megaphone.fm'
     IE_DESC = 'megaphone.fm embedded players'
     _VALID_URL = r'https://player\.megaphone\.fm/(?P<id>[A-Z0-9]+)'
+    _EMBED_MARKERS = ('player.megaphone.fm/', )
     _TEST = {
         'url': 'https://player.megaphone.fm/GLT9749789991?"',
         'md5': '4816a0de523eb3e972dc0dda2c191f96',
@@ -61,6 +61,7 @@ class MofosexIE(KeezMoviesIE):
 
 class MofosexEmbedIE(InfoExtractor):
     _VALID_URL = r'https?://(?:www\.)?mofosex\.com/embed/?\?.*?\bvideoid=(?P<id>\d+)'
+    _EMBED_MARKERS = ('mofosex.com/embed', )
     _TESTS = [{
         'url': 'https://www.mofosex.com/embed/?videoid=318131&referrer=KM',
         'only_matching': True,
@@ -29,6 +29,7 @@ class MyviIE(SprutoBaseIE):
                         )
                         (?P<id>[\da-zA-Z_-]+)
                     '''
+    _EMBED_MARKERS = ('myvi.', )
     _TESTS = [{
         'url': 'http://myvi.ru/player/embed/html/oOy4euHA6LVwNNAjhD9_Jq5Ha2Qf0rtVMVFMAZav8wObeRTZaCATzucDQIDph8hQU0',
         'md5': '571bbdfba9f9ed229dc6d34cc0f335bf',
@@ -26,6 +26,7 @@ class NexxIE(InfoExtractor):
                         )
                         (?P<id>\d+)
                     '''
+    _EMBED_MARKERS = ('onplayready', )
     _TESTS = [{
         # movie
         'url': 'https://api.nexx.cloud/v3/748/videos/byid/128907',
@@ -411,6 +412,7 @@ class NexxIE(InfoExtractor):
 
 class NexxEmbedIE(InfoExtractor):
     _VALID_URL = r'https?://embed\.nexx(?:\.cloud|cdn\.com)/\d+/(?:video/)?(?P<id>[^/?#&]+)'
+    _EMBED_MARKERS = ('embed.nexx', )
     _TESTS = [{
         'url': 'http://embed.nexx.cloud/748/KC1614647Z27Y7T?autoplay=1',
         'md5': '16746bfc28c42049492385c989b26c4a',
@@ -33,6 +33,7 @@ class OdnoklassnikiIE(InfoExtractor):
                     )
                     (?P<id>[\d-]+)
                 '''
+    _EMBED_MARKERS = ('.ru/videoembed/', )
     _TESTS = [{
         # metadata in JSON
         'url': 'http://ok.ru/video/20079905452',
@@ -16,6 +16,7 @@ from ..utils import (
 
 class PikselIE(InfoExtractor):
     _VALID_URL = r'https?://player\.piksel\.com/v/(?:refid/[^/]+/prefid/)?(?P<id>[a-z0-9_]+)'
+    _EMBED_MARKERS = ('player.piksel.com/v/', )
     _TESTS = [
         {
             'url': 'http://player.piksel.com/v/ums2867l',
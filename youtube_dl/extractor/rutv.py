@@ -22,6 +22,7 @@ class RUTVIE(InfoExtractor):
                         )
                         (?P<id>\d+)
                     '''
+    _EMBED_MARKERS = ('rutv.r', 'vgtrk.com')
 
     _TESTS = [
         {
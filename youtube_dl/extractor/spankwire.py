@@ -23,6 +23,7 @@ class SpankwireIE(InfoExtractor):
                         )
                         (?P<id>\d+)
                     '''
+    _EMBED_MARKERS = ('spankwire.com/embedplayer.aspx', )
     _TESTS = [{
         # download URL pattern: */<height>P_<tbr>K_<video_id>.mp4
         'url': 'http://www.spankwire.com/Buckcherry-s-X-Rated-Music-Video-Crazy-Bitch/video103545/',
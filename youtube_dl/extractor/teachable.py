@@ -109,6 +109,7 @@ class TeachableIE(TeachableBaseIE):
                     )
                     /courses/[^/]+/lectures/(?P<id>\d+)
                     ''' % TeachableBaseIE._VALID_URL_SUB_TUPLE
+    _EMBED_MARKERS = ('teachabletracker.linker:autolink', )
 
     _TESTS = [{
         'url': 'https://gns3.teachable.com/courses/gns3-certified-associate/lectures/6842364',
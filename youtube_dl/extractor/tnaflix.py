@@ -177,6 +177,7 @@ class TNAFlixNetworkEmbedIE(TNAFlixNetworkBaseIE):
     _VALID_URL = r'https?://player\.(?:tna|emp)flix\.com/video/(?P<id>\d+)'
 
     _TITLE_REGEX = r'<title>([^<]+)</title>'
+    _EMBED_MARKERS = ('flix.com/video/', )
 
     _TESTS = [{
         'url': 'https://player.tnaflix.com/video/6538',
@@ -10,6 +10,7 @@ from ..compat import compat_urlparse
 
 class TuneInBaseIE(InfoExtractor):
     _API_BASE_URL = 'http://tunein.com/tuner/tune/'
+    _EMBED_MARKERS = ('tunein.com/embed/player/', )
 
     @staticmethod
     def _extract_urls(webpage):
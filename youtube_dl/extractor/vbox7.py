@@ -21,6 +21,7 @@ class Vbox7IE(InfoExtractor):
                         (?P<id>[\da-fA-F]+)
                     '''
     _GEO_COUNTRIES = ['BG']
+    _EMBED_MARKERS = ('vbox7.com/emb/external.php', )
     _TESTS = [{
         'url': 'http://vbox7.com/play:0946fff23c',
         'md5': 'a60f9ab3a3a2f013ef9a967d5f7be5bf',
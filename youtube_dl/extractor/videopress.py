@@ -19,6 +19,7 @@ from ..utils import (
 
 class VideoPressIE(InfoExtractor):
     _VALID_URL = r'https?://videopress\.com/embed/(?P<id>[\da-zA-Z]+)'
+    _EMBED_MARKERS = ('videopress.com/embed/', )
     _TESTS = [{
         'url': 'https://videopress.com/embed/kUJmAcSf',
         'md5': '706956a6c875873d51010921310e4bc6',
@@ -280,6 +280,7 @@ class VimeoIE(VimeoBaseInfoExtractor):
                         /?(?:[?&].*)?(?:[#].*)?$
                     '''
     IE_NAME = 'vimeo'
+    _EMBED_MARKERS = ('vimeo.com', )
     _TESTS = [
         {
             'url': 'http://vimeo.com/56015672#at=0',
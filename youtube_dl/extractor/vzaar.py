@@ -15,6 +15,7 @@ from ..utils import (
 
 class VzaarIE(InfoExtractor):
     _VALID_URL = r'https?://(?:(?:www|view)\.)?vzaar\.com/(?:videos/)?(?P<id>\d+)'
+    _EMBED_MARKERS = ('view.vzaar.com/', )
     _TESTS = [{
         # HTTP and HLS
         'url': 'https://vzaar.com/videos/1152805',
@@ -14,6 +14,7 @@ from ..utils import (
 class WistiaIE(InfoExtractor):
     _VALID_URL = r'(?:wistia:|https?://(?:fast\.)?wistia\.(?:net|com)/embed/(?:iframe|medias)/)(?P<id>[a-z0-9]{10})'
     _EMBED_BASE_URL = 'http://fast.wistia.com/embed/'
+    _EMBED_MARKERS = ('wistia', )
 
     _TESTS = [{
         'url': 'http://fast.wistia.net/embed/iframe/sh7fpupwlt',
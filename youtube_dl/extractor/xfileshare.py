@@ -68,6 +68,7 @@ class XFileShareIE(InfoExtractor):
         r'>(?:404 - )?File Not Found<',
         r'>The file was removed by administrator<',
     )
+    _EMBED_MARKERS = ('/embed-', )
 
     _TESTS = [{
         'url': 'http://xvideosharing.com/fq65f94nd2ve',
@@ -16,6 +16,7 @@ from ..utils import (
 class YapFilesIE(InfoExtractor):
     _YAPFILES_URL = r'//(?:(?:www|api)\.)?yapfiles\.ru/get_player/*\?.*?\bv=(?P<id>\w+)'
     _VALID_URL = r'https?:%s' % _YAPFILES_URL
+    _EMBED_MARKERS = ('yapfiles.ru/get_player', )
     _TESTS = [{
         # with hd
         'url': 'http://www.yapfiles.ru/get_player/?v=vMDE1NjcyNDUt0413',
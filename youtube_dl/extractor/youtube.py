@@ -36,6 +36,7 @@ from ..utils import (
     orderedSet,
     parse_codecs,
     parse_duration,
+    ParsedWebpage,
     remove_quotes,
     remove_start,
     smuggle_url,
@@ -298,7 +299,7 @@ class YoutubeBaseInfoExtractor(InfoExtractor):
 
     def _extract_yt_initial_data(self, video_id, webpage):
         return self._parse_json(
-            self._search_regex(
+            self._search_script_regex(
                 r'(?:window\s*\[\s*["\']ytInitialData["\']\s*\]|ytInitialData)\s*=\s*({.+?})\s*;',
                 webpage, 'yt initial data'),
             video_id)
@@ -486,6 +487,7 @@ class YoutubeIE(YoutubeBaseInfoExtractor):
     _GEO_BYPASS = False
 
     IE_NAME = 'youtube'
+    _EMBED_MARKERS = ('youtube', 'yvii_single_video_player')
     _TESTS = [
         {
             'url': 'https://www.youtube.com/watch?v=BaW_jenozKc&t=1s&end=9',
@@ -1068,6 +1070,10 @@ class YoutubeIE(YoutubeBaseInfoExtractor):
         },
     ]
 
+    # Version of the format of the player code cached in the filesystem
+    _PLAYER_CACHE_VERSION = 1
+    _PLAYER_CACHE_MAX_SIZE = 1024 * 1024
+
     def __init__(self, *args, **kwargs):
         super(YoutubeIE, self).__init__(*args, **kwargs)
         self._player_cache = {}
@@ -1120,11 +1126,13 @@ class YoutubeIE(YoutubeBaseInfoExtractor):
             'Downloading %s player %s' % (player_type, player_id)
         )
         if player_type == 'js':
-            code = self._download_webpage(
-                player_url, video_id,
-                note=download_note,
-                errnote='Download of %s failed' % player_url)
-            res = self._parse_sig_js(code)
+            res = self._load_sig_js(player_id)
+            if res is None:
+                code = self._download_webpage(
+                    player_url, video_id,
+                    note=download_note,
+                    errnote='Download of %s failed' % player_url)
+                res = self._parse_sig_js(code, player_id)
         elif player_type == 'swf':
             urlh = self._request_webpage(
                 player_url, video_id,
@@ -1181,7 +1189,19 @@ class YoutubeIE(YoutubeBaseInfoExtractor):
                 '    return %s\n') % (signature_id_tuple, expr_code)
         self.to_screen('Extracted signature function:\n' + code)
 
-    def _parse_sig_js(self, jscode):
+    def _load_sig_js(self, player_id):
+        """Return the signature function of a player from the filesystem cache or None"""
+        cache_data = self._downloader.cache.load('youtube-players', player_id)
+        if not isinstance(cache_data, dict) or cache_data.get('version') != self._PLAYER_CACHE_VERSION:
+            return None
+        try:
+            jsi = JSInterpreter(cache_data['code'])
+            initial_function = jsi.extract_function(cache_data['funcname'])
+        except (ExtractorError, KeyError):
+            return None
+        return lambda s: initial_function([s])
+
+    def _parse_sig_js(self, jscode, player_id=None):
         funcname = self._search_regex(
             (r'\b[cs]\s*&&\s*[adf]\.set\([^,]+\s*,\s*encodeURIComponent\s*\(\s*(?P<sig>[a-zA-Z0-9$]+)\(',
              r'\b[a-zA-Z0-9]+\s*&&\s*[a-zA-Z0-9]+\.set\([^,]+\s*,\s*encodeURIComponent\s*\(\s*(?P<sig>[a-zA-Z0-9$]+)\(',
@@ -1200,6 +1220,21 @@ class YoutubeIE(YoutubeBaseInfoExtractor):
 
         jsi = JSInterpreter(jscode)
         initial_function = jsi.extract_function(funcname)
+        if player_id is not None:
+            # Only keep the code the signature function needs, players take
+            # hundreds of KB. The helper objects are only extracted when the
+            # function runs.
+            try:
+                initial_function([''.join(map(compat_chr, range(90)))])
+            except Exception:
+                # Let the actual signature report the error
+                return lambda s: initial_function([s])
+            self._downloader.cache.store('youtube-players', player_id, {
+                'version': self._PLAYER_CACHE_VERSION,
+                'funcname': funcname,
+                'code': jsi.extracted_code(),
+            })
+            self._downloader.cache.evict('youtube-players', self._PLAYER_CACHE_MAX_SIZE)
         return lambda s: initial_function([s])
 
     def _parse_sig_swf(self, file_contents):
@@ -1280,7 +1315,7 @@ class YoutubeIE(YoutubeBaseInfoExtractor):
             r';ytplayer\.config\s*=\s*({.+?});ytplayer',
             r';ytplayer\.config\s*=\s*({.+?});',
         )
-        config = self._search_regex(
+        config = self._search_script_regex(
             patterns, webpage, 'ytplayer.config', default=None)
         if config:
             return self._parse_json(
@@ -1571,6 +1606,8 @@ class YoutubeIE(YoutubeBaseInfoExtractor):
         # Get video webpage
         url = proto + '://www.youtube.com/watch?v=%s&gl=US&hl=en&has_verified=1&bpctr=9999999999' % video_id
         video_webpage, urlh = self._download_webpage_handle(url, video_id)
+        # Searched by lots of helpers below
+        video_webpage = ParsedWebpage(video_webpage)
 
         qs = compat_parse_qs(compat_urllib_parse_urlparse(urlh.geturl()).query)
         video_id = qs.get('v', [None])[0] or video_id
@@ -1668,7 +1705,7 @@ class YoutubeIE(YoutubeBaseInfoExtractor):
 
         if not video_info and not player_response:
             player_response = extract_player_response(
-                self._search_regex(
+                self._search_script_regex(
                     r'ytInitialPlayerResponse\s*=\s*({.+?})\s*;', video_webpage,
                     'initial player response', default='{}'),
                 video_id)
@@ -2931,8 +2968,8 @@ class YoutubeTabIE(YoutubeBaseInfoExtractor):
                 self.to_screen('Downloading just video %s because of --no-playlist' % video_id)
                 return self.url_result(video_id, ie=YoutubeIE.ie_key(), video_id=video_id)
             self.to_screen('Downloading playlist %s - add --no-playlist to just download video %s' % (playlist_id, video_id))
-        webpage = self._download_webpage(url, item_id)
-        identity_token = self._search_regex(
+        webpage = self._download_parsed_webpage(url, item_id)
+        identity_token = self._search_script_regex(
             r'\bID_TOKEN["\']\s*:\s*["\'](.+?)["\']', webpage,
             'identity token', default=None)
         data = self._extract_yt_initial_data(item_id, webpage)
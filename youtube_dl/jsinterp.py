@@ -3,6 +3,7 @@ from __future__ import unicode_literals
 import json
 import operator
 import re
+import threading
 
 from .utils import (
     ExtractorError,
@@ -26,189 +27,397 @@ _ASSIGN_OPERATORS.append(('=', lambda cur, right: right))
 
 _NAME_RE = r'[a-zA-Z_$][a-zA-Z_$0-9]*'
 
+# Binding power of the binary operators, as in JavaScript
+_PRECEDENCE = {
+    '|': 1,
+    '^': 2,
+    '&': 3,
+    '>>': 4, '<<': 4,
+    '-': 5, '+': 5,
+    '%': 6, '/': 6, '*': 6,
+}
+_OPERATOR_FUNCS = dict(_OPERATORS)
+_ASSIGN_OPERATOR_FUNCS = dict(_ASSIGN_OPERATORS)
+
+_TOKEN_RE = re.compile(r'''(?sx)
+    (?P<space>\s+|//[^\n]*|/\*.*?\*/)|
+    (?P<number>[0-9]+(?:\.[0-9]+)?)|
+    (?P<string>"(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*')|
+    (?P<name>%s)|
+    (?P<op>>>=|<<=|>>|<<|[-+*/%%&|^]=?|=|[()\[\],.;])
+''' % _NAME_RE)
+
+_LITERALS = {
+    'true': True,
+    'false': False,
+    'null': None,
+}
+_MAX_NESTING = 100
+# Maximum depth of nested calls of extracted functions
+_MAX_CALL_DEPTH = 100
+# Compiled statements and function bodies, shared by all the interpreters
+_MAX_CACHED = 1024
+_compiled = {}
+_compiled_lock = threading.Lock()
+
+
+class _JSSyntaxError(Exception):
+    pass
+
+
+def _tokenize(code):
+    """Return a list of (type, value, start, end) tuples"""
+    tokens = []
+    pos = 0
+    while pos < len(code):
+        m = _TOKEN_RE.match(code, pos)
+        if not m:
+            raise _JSSyntaxError('Unexpected character %r' % code[pos])
+        if m.lastgroup != 'space':
+            tokens.append((m.lastgroup, m.group(m.lastgroup), m.start(), m.end()))
+        pos = m.end()
+    return tokens
+
+
+def _parse_string(token):
+    # Turn single-quoted strings into valid JSON as well
+    return json.loads('"%s"' % re.sub(
+        r'\\(.)|"', lambda m: '\\"' if m.group(0) == '"' else (
+            "'" if m.group(1) == "'" else m.group(0)), token[1:-1]))
+
+
+class _Parser(object):
+    """
+    Compile a list of tokens to Python closures taking the interpreter and
+    the local variables.
+    """
+
+    def __init__(self, tokens):
+        self._tokens = tokens
+        self._pos = 0
+        self._depth = 0
+
+    def _peek(self):
+        if self._pos < len(self._tokens):
+            return self._tokens[self._pos]
+        return (None, None, None, None)
+
+    def _next(self):
+        token = self._peek()
+        if token[0] is None:
+            raise _JSSyntaxError('Unexpected end of expression')
+        self._pos += 1
+        return token
+
+    def _accept(self, value):
+        token = self._peek()
+        if token[0] in ('op', 'name') and token[1] == value:
+            self._pos += 1
+            return True
+        return False
+
+    def _expect(self, value):
+        if not self._accept(value):
+            raise _JSSyntaxError('Expected %r' % value)
+
+    def statement(self):
+        if self._accept('var'):
+            expr = self.expression()
+            abort = False
+        elif self._accept('return'):
+            expr = None if self._peek()[0] is None else self.expression()
+            abort = True
+        else:
+            expr = None if self._peek()[0] is None else self.expression()
+            abort = False
+        if self._peek()[0] is not None:
+            raise _JSSyntaxError('Unexpected %r' % self._peek()[1])
+        if expr is None:
+            return lambda jsi, local_vars: (None, abort)
+        return lambda jsi, local_vars: (expr(jsi, local_vars), abort)
+
+    def expression(self):
+        self._depth += 1
+        if self._depth > _MAX_NESTING:
+            raise ExtractorError('Recursion limit reached')
+        try:
+            return self._assignment()
+        finally:
+            self._depth -= 1
+
+    def _assignment(self):
+        start = self._pos
+        left = self._binary(0)
+        token = self._peek()
+        if token[0] != 'op' or token[1] not in _ASSIGN_OPERATOR_FUNCS:
+            return left
+        target = self._tokens[start:self._pos]
+        self._pos += 1
+        opfunc = _ASSIGN_OPERATOR_FUNCS[token[1]]
+        right = self._assignment()
+        if len(target) == 1 and target[0][0] == 'name':
+            name = target[0][1]
+
+            def assign(jsi, local_vars):
+                val = right(jsi, local_vars)
+                val = opfunc(local_vars.get(name), val)
+                local_vars[name] = val
+                return val
+            return assign
+        if getattr(left, 'member', None) is None:
+            raise _JSSyntaxError('Invalid assignment target')
+        obj, key = left.member
+
+        def assign_member(jsi, local_vars):
+            val = right(jsi, local_vars)
+            lvar = obj(jsi, local_vars)
+            idx = key(jsi, local_vars)
+            val = opfunc(lvar[idx], val)
+            lvar[idx] = val
+            return val
+        return assign_member
+
+    def _binary(self, min_precedence):
+        left = self._unary()
+        while True:
+            token = self._peek()
+            precedence = _PRECEDENCE.get(token[1]) if token[0] == 'op' else None
+            if precedence is None or precedence <= min_precedence:
+                return left
+            self._pos += 1
+            right = self._binary(precedence)
+            left = self._binary_op(_OPERATOR_FUNCS[token[1]], left, right)
+
+    @staticmethod
+    def _binary_op(opfunc, left, right):
+        return lambda jsi, local_vars: opfunc(left(jsi, local_vars), right(jsi, local_vars))
+
+    def _unary(self):
+        if self._accept('-'):
+            operand = self._unary()
+            return lambda jsi, local_vars: -operand(jsi, local_vars)
+        if self._accept('+'):
+            return self._unary()
+        return self._postfix()
+
+    def _postfix(self):
+        token = self._peek()
+        expr = self._primary()
+        # Plain names are looked up among the objects of the code as well
+        # when their members are accessed
+        obj_name = token[1] if token[0] == 'name' and token[1] not in _LITERALS else None
+        while True:
+            if self._accept('.'):
+                token = self._next()
+                if token[0] != 'name':
+                    raise _JSSyntaxError('Expected member name')
+                expr = self._member(expr, obj_name, self._constant(token[1]))
+            elif self._accept('['):
+                key = self.expression()
+                self._expect(']')
+                expr = self._member(expr, obj_name, key)
+            elif self._accept('('):
+                args = self._list(')')
+                expr = self._call(expr, obj_name, args)
+            else:
+                return expr
+            obj_name = None
+
+    @staticmethod
+    def _constant(value):
+        return lambda jsi, local_vars: value
+
+    @staticmethod
+    def _member(obj, obj_name, key):
+        if obj_name is not None:
+            obj = lambda jsi, local_vars: jsi._get_object(obj_name, local_vars)
+
+        def member(jsi, local_vars):
+            val = obj(jsi, local_vars)
+            idx = key(jsi, local_vars)
+            if idx == 'length' and not isinstance(val, dict):
+                return len(val)
+            return val[idx]
+        member.member = (obj, key)
+        return member
+
+    @staticmethod
+    def _call(func, obj_name, args):
+        member = getattr(func, 'member', None)
+        if member is not None:
+            obj, key = member
+            return lambda jsi, local_vars: jsi._call_method(
+                obj(jsi, local_vars), key(jsi, local_vars),
+                tuple(arg(jsi, local_vars) for arg in args))
+        if obj_name is None:
+            raise _JSSyntaxError('Unsupported function call')
+        return lambda jsi, local_vars: jsi._get_function(obj_name)(
+            tuple(arg(jsi, local_vars) for arg in args))
+
+    def _list(self, closing):
+        items = []
+        if self._accept(closing):
+            return items
+        while True:
+            items.append(self.expression())
+            if self._accept(closing):
+                return items
+            self._expect(',')
+
+    def _primary(self):
+        kind, value, _, _ = self._next()
+        if kind == 'number':
+            return self._constant(float(value) if '.' in value else int(value))
+        elif kind == 'string':
+            return self._constant(_parse_string(value))
+        elif kind == 'name':
+            if value in _LITERALS:
+                return self._constant(_LITERALS[value])
+            return lambda jsi, local_vars: local_vars[value]
+        elif value == '(':
+            expr = self.expression()
+            self._expect(')')
+            return expr
+        elif value == '[':
+            items = self._list(']')
+            return lambda jsi, local_vars: [item(jsi, local_vars) for item in items]
+        raise _JSSyntaxError('Unexpected %r' % value)
+
+
+def _compile_statement(tokens, code):
+    try:
+        return _Parser(tokens).statement()
+    except _JSSyntaxError:
+        stmt = code[tokens[0][2]:tokens[-1][3]] if tokens else ''
+
+        # Only fail if it is ever run, like statements following a return
+        def unsupported(jsi, local_vars):
+            raise ExtractorError('Unsupported JS expression %r' % stmt)
+        return unsupported
+
+
+def _cached(key, func):
+    compiled = _compiled.get(key)
+    if compiled is None:
+        compiled = func()
+        with _compiled_lock:
+            if len(_compiled) >= _MAX_CACHED:
+                _compiled.clear()
+            _compiled[key] = compiled
+    return compiled
+
+
+def _compile_statements(code):
+    """Compile the ;-separated statements of code"""
+    def compile_statements():
+        try:
+            tokens = _tokenize(code)
+        except _JSSyntaxError:
+            raise ExtractorError('Unsupported JS expression %r' % code)
+        statements = []
+        stmt_tokens = []
+        nesting = 0
+        for token in tokens:
+            if token[0] == 'op':
+                if token[1] in '([':
+                    nesting += 1
+                elif token[1] in ')]':
+                    nesting -= 1
+                elif token[1] == ';' and nesting == 0:
+                    statements.append(_compile_statement(stmt_tokens, code))
+                    stmt_tokens = []
+                    continue
+            stmt_tokens.append(token)
+        statements.append(_compile_statement(stmt_tokens, code))
+        return tuple(statements)
+    return _cached(('statements', code), compile_statements)
+
 
 class JSInterpreter(object):
+    """
+    Interpreter for the small subset of JavaScript used by the signature
+    functions of video players.
+
+    Code is tokenized and compiled to Python closures once per function body
+    (or statement). The compiled code is shared by all the interpreters, so
+    the same function of a different player does not need to be compiled
+    again.
+    """
+
     def __init__(self, code, objects=None):
         if objects is None:
             objects = {}
         self.code = code
         self._functions = {}
         self._objects = objects
+        # Source of the functions and objects extracted from code, by offset
+        self._extracted = {}
+        # Depth of the calls being run in each thread
+        self._call_depth = threading.local()
 
     def interpret_statement(self, stmt, local_vars, allow_recursion=100):
         if allow_recursion < 0:
             raise ExtractorError('Recursion limit reached')
 
-        should_abort = False
-        stmt = stmt.lstrip()
-        stmt_m = re.match(r'var\s', stmt)
-        if stmt_m:
-            expr = stmt[len(stmt_m.group(0)):]
-        else:
-            return_m = re.match(r'return(?:\s+|$)', stmt)
-            if return_m:
-                expr = stmt[len(return_m.group(0)):]
-                should_abort = True
-            else:
-                # Try interpreting it as an expression
-                expr = stmt
-
-        v = self.interpret_expression(expr, local_vars, allow_recursion)
-        return v, should_abort
+        statements = _compile_statements(stmt)
+        if len(statements) != 1:
+            raise ExtractorError('Unsupported JS expression %r' % stmt)
+        return statements[0](self, local_vars)
 
     def interpret_expression(self, expr, local_vars, allow_recursion):
-        expr = expr.strip()
-        if expr == '':  # Empty expression
-            return None
-
-        if expr.startswith('('):
-            parens_count = 0
-            for m in re.finditer(r'[()]', expr):
-                if m.group(0) == '(':
-                    parens_count += 1
-                else:
-                    parens_count -= 1
-                    if parens_count == 0:
-                        sub_expr = expr[1:m.start()]
-                        sub_result = self.interpret_expression(
-                            sub_expr, local_vars, allow_recursion)
-                        remaining_expr = expr[m.end():].strip()
-                        if not remaining_expr:
-                            return sub_result
-                        else:
-                            expr = json.dumps(sub_result) + remaining_expr
-                        break
-            else:
-                raise ExtractorError('Premature end of parens in %r' % expr)
-
-        for op, opfunc in _ASSIGN_OPERATORS:
-            m = re.match(r'''(?x)
-                (?P<out>%s)(?:\[(?P<index>[^\]]+?)\])?
-                \s*%s
-                (?P<expr>.*)$''' % (_NAME_RE, re.escape(op)), expr)
-            if not m:
-                continue
-            right_val = self.interpret_expression(
-                m.group('expr'), local_vars, allow_recursion - 1)
-
-            if m.groupdict().get('index'):
-                lvar = local_vars[m.group('out')]
-                idx = self.interpret_expression(
-                    m.group('index'), local_vars, allow_recursion)
-                assert isinstance(idx, int)
-                cur = lvar[idx]
-                val = opfunc(cur, right_val)
-                lvar[idx] = val
-                return val
-            else:
-                cur = local_vars.get(m.group('out'))
-                val = opfunc(cur, right_val)
-                local_vars[m.group('out')] = val
-                return val
-
-        if expr.isdigit():
-            return int(expr)
-
-        var_m = re.match(
-            r'(?!if|return|true|false)(?P<name>%s)$' % _NAME_RE,
-            expr)
-        if var_m:
-            return local_vars[var_m.group('name')]
-
-        try:
-            return json.loads(expr)
-        except ValueError:
-            pass
-
-        m = re.match(
-            r'(?P<in>%s)\[(?P<idx>.+)\]$' % _NAME_RE, expr)
-        if m:
-            val = local_vars[m.group('in')]
-            idx = self.interpret_expression(
-                m.group('idx'), local_vars, allow_recursion - 1)
-            return val[idx]
-
-        m = re.match(
-            r'(?P<var>%s)(?:\.(?P<member>[^(]+)|\[(?P<member2>[^]]+)\])\s*(?:\(+(?P<args>[^()]*)\))?$' % _NAME_RE,
-            expr)
-        if m:
-            variable = m.group('var')
-            member = remove_quotes(m.group('member') or m.group('member2'))
-            arg_str = m.group('args')
+        if allow_recursion < 0:
+            raise ExtractorError('Recursion limit reached')
 
-            if variable in local_vars:
-                obj = local_vars[variable]
-            else:
-                if variable not in self._objects:
-                    self._objects[variable] = self.extract_object(variable)
-                obj = self._objects[variable]
-
-            if arg_str is None:
-                # Member access
-                if member == 'length':
-                    return len(obj)
-                return obj[member]
-
-            assert expr.endswith(')')
-            # Function call
-            if arg_str == '':
-                argvals = tuple()
-            else:
-                argvals = tuple([
-                    self.interpret_expression(v, local_vars, allow_recursion)
-                    for v in arg_str.split(',')])
-
-            if member == 'split':
-                assert argvals == ('',)
-                return list(obj)
-            if member == 'join':
-                assert len(argvals) == 1
-                return argvals[0].join(obj)
-            if member == 'reverse':
-                assert len(argvals) == 0
-                obj.reverse()
-                return obj
-            if member == 'slice':
-                assert len(argvals) == 1
-                return obj[argvals[0]:]
-            if member == 'splice':
-                assert isinstance(obj, list)
-                index, howMany = argvals
-                res = []
-                for i in range(index, min(index + howMany, len(obj))):
-                    res.append(obj.pop(index))
-                return res
+        def compile_expression():
+            try:
+                tokens = _tokenize(expr)
+                if not tokens:
+                    return lambda jsi, local_vars: None
+                parser = _Parser(tokens)
+                compiled = parser.expression()
+                if parser._peek()[0] is not None:
+                    raise _JSSyntaxError('Unexpected %r' % parser._peek()[1])
+                return compiled
+            except _JSSyntaxError:
+                raise ExtractorError('Unsupported JS expression %r' % expr)
+        return _cached(('expression', expr), compile_expression)(self, local_vars)
+
+    def _get_object(self, name, local_vars):
+        if name in local_vars:
+            return local_vars[name]
+        if name not in self._objects:
+            self._objects[name] = self.extract_object(name)
+        return self._objects[name]
+
+    def _get_function(self, name):
+        if name not in self._functions:
+            self._functions[name] = self.extract_function(name)
+        return self._functions[name]
+
+    @staticmethod
+    def _call_method(obj, member, argvals):
+        if member == 'split':
+            assert argvals == ('',)
+            return list(obj)
+        if member == 'join':
+            assert len(argvals) == 1
+            return argvals[0].join(obj)
+        if member == 'reverse':
+            assert len(argvals) == 0
+            obj.reverse()
+            return obj
+        if member == 'slice':
+            assert len(argvals) == 1
+            return obj[argvals[0]:]
+        if member == 'splice':
+            assert isinstance(obj, list)
+            index, howMany = argvals
+            res = []
+            for i in range(index, min(index + howMany, len(obj))):
+                res.append(obj.pop(index))
+            return res
 
-            return obj[member](argvals)
-
-        for op, opfunc in _OPERATORS:
-            m = re.match(r'(?P<x>.+?)%s(?P<y>.+)' % re.escape(op), expr)
-            if not m:
-                continue
-            x, abort = self.interpret_statement(
-                m.group('x'), local_vars, allow_recursion - 1)
-            if abort:
-                raise ExtractorError(
-                    'Premature left-side return of %s in %r' % (op, expr))
-            y, abort = self.interpret_statement(
-                m.group('y'), local_vars, allow_recursion - 1)
-            if abort:
-                raise ExtractorError(
-                    'Premature right-side return of %s in %r' % (op, expr))
-            return opfunc(x, y)
-
-        m = re.match(
-            r'^(?P<func>%s)\((?P<args>[a-zA-Z0-9_$,]*)\)$' % _NAME_RE, expr)
-        if m:
-            fname = m.group('func')
-            argvals = tuple([
-                int(v) if v.isdigit() else local_vars[v]
-                for v in m.group('args').split(',')]) if len(m.group('args')) > 0 else tuple()
-            if fname not in self._functions:
-                self._functions[fname] = self.extract_function(fname)
-            return self._functions[fname](argvals)
-
-        raise ExtractorError('Unsupported JS expression %r' % expr)
+        return obj[member](argvals)
 
     def extract_object(self, objname):
         _FUNC_NAME_RE = r'''(?:[a-zA-Z$0-9]+|"[a-zA-Z$0-9]+"|'[a-zA-Z$0-9]+')'''
@@ -220,6 +429,7 @@ class JSInterpreter(object):
                 }\s*;
             ''' % (re.escape(objname), _FUNC_NAME_RE),
             self.code)
+        self._extracted[obj_m.start()] = obj_m.group(0)
         fields = obj_m.group('fields')
         # Currently, it only supports function definitions
         fields_m = re.finditer(
@@ -243,20 +453,38 @@ class JSInterpreter(object):
             self.code)
         if func_m is None:
             raise ExtractorError('Could not find JS function %r' % funcname)
+        self._extracted[func_m.start()] = func_m.group(0)
         argnames = func_m.group('args').split(',')
 
         return self.build_function(argnames, func_m.group('code'))
 
+    def extracted_code(self):
+        """
+        Return the parts of the code extracted so far, in their original
+        order. They are enough to interpret the same functions again.
+        """
+        return ';\n'.join(self._extracted[start] for start in sorted(self._extracted))
+
     def call_function(self, funcname, *args):
         f = self.extract_function(funcname)
         return f(args)
 
     def build_function(self, argnames, code):
+        argnames = [argname.strip() for argname in argnames]
+        statements = _compile_statements(code)
+
         def resf(args):
-            local_vars = dict(zip(argnames, args))
-            for stmt in code.split(';'):
-                res, abort = self.interpret_statement(stmt, local_vars)
-                if abort:
-                    break
-            return res
+            depth = getattr(self._call_depth, 'value', 0)
+            if depth >= _MAX_CALL_DEPTH:
+                raise ExtractorError('Recursion limit reached')
+            self._call_depth.value = depth + 1
+            try:
+                local_vars = dict(zip(argnames, args))
+                for stmt in statements:
+                    res, abort = stmt(self, local_vars)
+                    if abort:
+                        break
+                return res
+            finally:
+                self._call_depth.value = depth
         return resf
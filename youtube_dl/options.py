@@ -184,7 +184,8 @@ def parseOpts(overrideArguments=None):
         '--flat-playlist',
         action='store_const', dest='extract_flat', const='in_playlist',
         default=False,
-        help='Do not extract the videos of a playlist, only list them.')
+        help='Do not extract the videos of a playlist, only list them. '
+             'With -j, the entries are printed as they are received, one JSON object per line.')
     general.add_option(
         '--mark-watched',
         action='store_true', dest='mark_watched', default=False,
@@ -198,6 +199,13 @@ def parseOpts(overrideArguments=None):
         action='store_true', dest='no_color',
         default=False,
         help='Do not emit color codes in output')
+    general.add_option(
+        '--serve',
+        action='store_true', dest='serve', default=False,
+        help=(
+            'Keep running and process the jobs read from stdin, one JSON object '
+            'like {"url": URL, "download": false, "params": {...}} per line, '
+            'writing the results, progress and messages to stdout as JSON lines'))
 
     network = optparse.OptionGroup(parser, 'Network Options')
     network.add_option(
@@ -343,7 +351,12 @@ def parseOpts(overrideArguments=None):
     selection.add_option(
         '--download-archive', metavar='FILE',
         dest='download_archive',
-        help='Download only videos not listed in the archive file. Record the IDs of all downloaded videos in it.')
+        help='Download only videos not listed in the archive file. Record the IDs of all downloaded videos in it. '
+             'A FILE with a .db, .sqlite or .sqlite3 extension is used as an SQLite database')
+    selection.add_option(
+        '--break-on-existing',
+        action='store_true', dest='break_on_existing', default=False,
+        help='Stop the download process when encountering a video that is in the archive')
     selection.add_option(
         '--include-ads',
         dest='include_ads', action='store_true',
@@ -450,6 +463,18 @@ def parseOpts(overrideArguments=None):
         help='Languages of the subtitles to download (optional) separated by commas, use --list-subs for available language tags')
 
     downloader = optparse.OptionGroup(parser, 'Download Options')
+    downloader.add_option(
+        '-N', '--concurrent-fragments',
+        dest='concurrent_fragment_downloads', metavar='N', default=1, type=int,
+        help='Number of fragments to download concurrently (default is %default) (DASH, hlsnative, ISM and f4m)')
+    downloader.add_option(
+        '--concurrent-downloads',
+        dest='concurrent_downloads', metavar='N', default=1, type=int,
+        help='Number of URLs or playlist videos to extract and download concurrently (default is %default)')
+    downloader.add_option(
+        '--playlist-prefetch',
+        dest='playlist_prefetch', metavar='N', default=0, type=int,
+        help='Number of upcoming playlist videos to extract in the background while the current one is downloaded, and of playlist pages to fetch at the same time (default is %default)')
     downloader.add_option(
         '-r', '--limit-rate', '--rate-limit',
         dest='ratelimit', metavar='RATE',
@@ -473,7 +498,7 @@ def parseOpts(overrideArguments=None):
     downloader.add_option(
         '--keep-fragments',
         action='store_true', dest='keep_fragments', default=False,
-        help='Keep downloaded fragments on disk after downloading is finished; fragments are erased by default')
+        help='Keep downloaded fragments on disk after downloading is finished; by default fragments are only kept in memory')
     downloader.add_option(
         '--buffer-size',
         dest='buffersize', metavar='SIZE', default='1024',
@@ -487,6 +512,11 @@ def parseOpts(overrideArguments=None):
         dest='http_chunk_size', metavar='SIZE', default=None,
         help='Size of a chunk for chunk-based HTTP downloading (e.g. 10485760 or 10M) (default is disabled). '
              'May be useful for bypassing bandwidth throttling imposed by a webserver (experimental)')
+    downloader.add_option(
+        '--http-connections',
+        dest='http_connections', metavar='N', default=1, type=int,
+        help='Number of connections to download a plain HTTP file with, each one '
+             'fetching a part of it, if the server supports byte ranges (default is %default)')
     downloader.add_option(
         '--test',
         action='store_true', dest='test', default=False,
@@ -499,6 +529,12 @@ def parseOpts(overrideArguments=None):
         '--playlist-random',
         action='store_true',
         help='Download playlist videos in random order')
+    downloader.add_option(
+        '--lazy-playlist',
+        action='store_true', dest='lazy_playlist', default=False,
+        help='Download the videos of a playlist as its entries are received, '
+             'instead of collecting all of them first. The total number of videos '
+             'is then unknown, unless --playlist-reverse or --playlist-random are used')
     downloader.add_option(
         '--xattr-set-filesize',
         dest='xattr_set_filesize', action='store_true',
@@ -763,6 +799,25 @@ def parseOpts(overrideArguments=None):
         '--rm-cache-dir',
         action='store_true', dest='rm_cachedir',
         help='Delete all filesystem cache files')
+    filesystem.add_option(
+        '--cache-backend',
+        dest='cache_backend', metavar='BACKEND', default='file', choices=('file', 'sqlite'),
+        help='How to store the cache: "file" for a file per entry, "sqlite" for a single SQLite database '
+             'that is faster to share between many processes (default is %default)')
+    filesystem.add_option(
+        '--http-cache',
+        action='store_true', dest='http_cache', default=False,
+        help='Cache the web pages and API responses downloaded while extracting in the cache directory, '
+             'so that extracting the same videos again is faster')
+    filesystem.add_option(
+        '--http-cache-ttl',
+        dest='http_cache_ttl', metavar='SECONDS', default=None, type=int,
+        help='Number of seconds cached responses are used without asking the server again, '
+             'unless it allows less (default is 3600)')
+    filesystem.add_option(
+        '--http-cache-size',
+        dest='http_cache_max_size', metavar='SIZE', default=None,
+        help='Maximum size of the cached responses (e.g. 50M), least recently used ones are removed first (default is 100M)')
 
     thumbnail = optparse.OptionGroup(parser, 'Thumbnail images')
     thumbnail.add_option(
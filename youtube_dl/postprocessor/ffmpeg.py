@@ -1,14 +1,17 @@
 from __future__ import unicode_literals
 
+import hashlib
 import io
 import os
 import subprocess
+import threading
 import time
 import re
 
 
 from .common import AudioConversionError, PostProcessor
 
+from ..compat import compat_getenv
 from ..utils import (
     encodeArgument,
     encodeFilename,
@@ -51,6 +54,81 @@ class FFmpegPostProcessorError(PostProcessingError):
     pass
 
 
+# Versions of the executables probed so far in this process, by path
+_exe_versions = {}
+_exe_versions_lock = threading.Lock()
+
+
+def _find_executable(path):
+    """Return the absolute path of the executable file run for path or None"""
+    if os.path.dirname(path):
+        candidates = [path]
+    else:
+        candidates = [
+            os.path.join(d, path)
+            for d in (compat_getenv('PATH') or os.defpath).split(os.pathsep) if d]
+    exts = ['']
+    if os.name == 'nt':
+        exts += (compat_getenv('PATHEXT') or '.EXE').lower().split(os.pathsep)
+    for candidate in candidates:
+        for ext in exts:
+            fn = candidate + ext
+            if os.path.isfile(fn) and os.access(fn, os.X_OK):
+                return os.path.abspath(fn)
+    return None
+
+
+def _probe_ffmpeg_version(path):
+    ver = get_exe_version(path, args=['-version'])
+    if ver:
+        regexs = [
+            r'(?:\d+:)?([0-9.]+)-[0-9]+ubuntu[0-9.]+$',  # Ubuntu, see [1]
+            r'n([0-9.]+)$',  # Arch Linux
+            # 1. http://www.ducea.com/2006/06/17/ubuntu-package-version-naming-explanation/
+        ]
+        for regex in regexs:
+            mobj = re.match(regex, ver)
+            if mobj:
+                ver = mobj.group(1)
+    return ver
+
+
+def get_ffmpeg_version(path, cache=None):
+    """
+    Return the version of the ffmpeg/avconv-like executable run for path or
+    False if there is none.
+
+    Each executable is only run once per process. If a Cache is given, the
+    version is also stored in it, keyed by the location and modification
+    time of the executable, so that it is not run again by later processes.
+    """
+    with _exe_versions_lock:
+        if path in _exe_versions:
+            return _exe_versions[path]
+        exe = _find_executable(path)
+        key = None
+        if exe is not None and cache is not None and cache.enabled:
+            try:
+                st = os.stat(exe)
+            except OSError:
+                pass
+            else:
+                key = hashlib.sha1(('%s\0%s\0%s' % (
+                    exe, st.st_mtime, st.st_size)).encode('utf-8')).hexdigest()
+        ver = cache.load('ffmpeg-versions', key) if key else None
+        if ver is None:
+            if exe is None and os.name != 'nt':
+                # Not in PATH, there is no point in trying to run it
+                ver = False
+            else:
+                # Windows also looks for executables in other places
+                ver = _probe_ffmpeg_version(exe or path)
+            if key:
+                cache.store('ffmpeg-versions', key, ver)
+        _exe_versions[path] = ver
+        return ver
+
+
 class FFmpegPostProcessor(PostProcessor):
     def __init__(self, downloader=None):
         PostProcessor.__init__(self, downloader)
@@ -75,20 +153,8 @@ class FFmpegPostProcessor(PostProcessor):
     def _determine_executables(self):
         programs = ['avprobe', 'avconv', 'ffmpeg', 'ffprobe']
         prefer_ffmpeg = True
-
-        def get_ffmpeg_version(path):
-            ver = get_exe_version(path, args=['-version'])
-            if ver:
-                regexs = [
-                    r'(?:\d+:)?([0-9.]+)-[0-9]+ubuntu[0-9.]+$',  # Ubuntu, see [1]
-                    r'n([0-9.]+)$',  # Arch Linux
-                    # 1. http://www.ducea.com/2006/06/17/ubuntu-package-version-naming-explanation/
-                ]
-                for regex in regexs:
-                    mobj = re.match(regex, ver)
-                    if mobj:
-                        ver = mobj.group(1)
-            return ver
+        # FFmpegFD passes itself as the downloader and has no cache
+        cache = getattr(self._downloader, 'cache', None)
 
         self.basename = None
         self.probe_basename = None
@@ -121,10 +187,10 @@ class FFmpegPostProcessor(PostProcessor):
                 self._paths = dict(
                     (p, os.path.join(location, p)) for p in programs)
                 self._versions = dict(
-                    (p, get_ffmpeg_version(self._paths[p])) for p in programs)
+                    (p, get_ffmpeg_version(self._paths[p], cache)) for p in programs)
         if self._versions is None:
             self._versions = dict(
-                (p, get_ffmpeg_version(p)) for p in programs)
+                (p, get_ffmpeg_version(p, cache)) for p in programs)
             self._paths = dict((p, p) for p in programs)
 
         if prefer_ffmpeg is False:
@@ -0,0 +1,144 @@
+from __future__ import unicode_literals
+
+import json
+import threading
+
+from .compat import compat_str
+from .utils import YoutubeDLError
+
+
+# Parameters that YoutubeDL only reads when it is created
+FIXED_PARAMS = (
+    'bidi_workaround',
+    'cookiefile',
+    'debug_printtraffic',
+    'logger',
+    'logtostderr',
+    'nocheckcertificate',
+    'postprocessors',
+    'progress_hooks',
+    'proxy',
+    'socket_timeout',
+    'source_address',
+)
+
+_PROGRESS_FIELDS = (
+    'status', 'filename', 'tmpfilename', 'downloaded_bytes', 'total_bytes',
+    'total_bytes_estimate', 'elapsed', 'eta', 'speed', 'fragment_index',
+    'fragment_count',
+)
+
+
+class JobServer(object):
+    """
+    Process jobs with a long-lived YoutubeDL instance, so that the imported
+    extractors, the HTTP connection pool, the cookies and the caches are
+    shared by all of them.
+
+    Jobs are read as JSON objects, one per line:
+
+        {"id": 1, "url": "https://...", "download": false, "params": {...}}
+
+    Only "url" is required. "id" is echoed back in every message about the
+    job, "download" (true by default) selects between downloading and only
+    extracting, and "params" overrides YoutubeDL parameters for this job,
+    except for the FIXED_PARAMS.
+
+    Jobs are processed in order, each one producing any number of
+    {"type": "log"} and {"type": "progress"} messages followed by either a
+    {"type": "result", "info": {...}} or an {"type": "error", "error": "..."}
+    message, all written as JSON lines. The server stops at end of input.
+    """
+
+    def __init__(self, ydl):
+        self._ydl = ydl
+        self._out = None
+        self._job_id = None
+        self._write_lock = threading.Lock()
+        ydl.params['logger'] = self
+        ydl.add_progress_hook(self._report_progress)
+
+    def serve(self, inp, out):
+        self._out = out
+        while True:
+            line = inp.readline()
+            if not line:
+                break
+            if isinstance(line, bytes):
+                line = line.decode('utf-8')
+            if line.strip():
+                self.process_job(line)
+        return 0
+
+    def _write(self, msg):
+        msg['id'] = self._job_id
+        line = compat_str(json.dumps(msg, default=compat_str)) + '\n'
+        with self._write_lock:
+            self._out.write(line)
+            self._out.flush()
+
+    def debug(self, msg):
+        self._write({'type': 'log', 'level': 'debug', 'message': msg})
+
+    def warning(self, msg):
+        self._write({'type': 'log', 'level': 'warning', 'message': msg})
+
+    def error(self, msg):
+        self._write({'type': 'log', 'level': 'error', 'message': msg})
+
+    def _report_progress(self, status):
+        progress = dict(
+            (k, status[k]) for k in _PROGRESS_FIELDS if status.get(k) is not None)
+        progress['type'] = 'progress'
+        self._write(progress)
+
+    def process_job(self, line):
+        self._job_id = None
+        try:
+            try:
+                job = json.loads(line)
+            except ValueError as e:
+                raise YoutubeDLError('Invalid job: %s' % e)
+            if not isinstance(job, dict):
+                raise YoutubeDLError('Invalid job: not a JSON object')
+            self._job_id = job.get('id')
+            info = self._run_job(job)
+        except Exception as e:
+            self._write({'type': 'error', 'error': compat_str(e)})
+        else:
+            self._write({'type': 'result', 'info': info})
+        finally:
+            self._job_id = None
+
+    def _run_job(self, job):
+        url = job.get('url')
+        if not isinstance(url, compat_str):
+            raise YoutubeDLError('Invalid job: url is missing')
+        overrides = job.get('params') or {}
+        if not isinstance(overrides, dict):
+            raise YoutubeDLError('Invalid job: params is not a JSON object')
+        fixed = sorted(k for k in overrides if k in FIXED_PARAMS)
+        if fixed:
+            raise YoutubeDLError(
+                'Invalid job: %s cannot be changed per job' % ', '.join(fixed))
+
+        params = self._ydl.params
+        saved = dict((k, params[k]) for k in overrides if k in params)
+        params.update(overrides)
+        try:
+            info = self._ydl.extract_info(url, download=job.get('download', True))
+        finally:
+            for k in overrides:
+                params.pop(k, None)
+            params.update(saved)
+        return _strip_internal_fields(info)
+
+
+def _strip_internal_fields(info):
+    if not isinstance(info, dict):
+        return info
+    info = dict(
+        (k, v) for k, v in info.items() if not k.startswith('__'))
+    if info.get('entries') is not None:
+        info['entries'] = [_strip_internal_fields(e) for e in info['entries']]
+    return info
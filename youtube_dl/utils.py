@@ -9,13 +9,11 @@ import calendar
 import codecs
 import collections
 import contextlib
-import ctypes
 import datetime
 import email.utils
 import email.header
 import errno
 import functools
-import gzip
 import io
 import itertools
 import json
@@ -26,11 +24,13 @@ import os
 import platform
 import random
 import re
+import select
 import socket
 import ssl
 import subprocess
 import sys
 import tempfile
+import threading
 import time
 import traceback
 import xml.etree.ElementTree
@@ -2018,6 +2018,93 @@ def extract_attributes(html_element):
     return parser.attrs
 
 
+class ParsedWebpage(compat_str):
+    """A webpage with lazily built indexes of the tags that the
+    InfoExtractor helpers look at
+
+    Being a string, it can be passed anywhere a webpage is expected. Each
+    kind of tag is indexed by a single scan of the page on first use and
+    the helpers are then served from the (much smaller) index only:
+    meta_html    all <meta> tags
+    input_html   all <input> tags not commented out
+    media_html   all <video> and <audio> elements (including amp- ones)
+    scripts      a list of (attributes, content) tuples for all <script>s
+    script_text  the contents of all <script>s, one after the other
+    json_ld      a list of the contents of JSON-LD <script>s
+    """
+
+    # Attributes of a tag, whose quoted values may contain '>'
+    _ATTRS = r'''(?:[^>"']|"[^"]*"|'[^']*')*'''
+    _META_RE = re.compile(r'(?i)<meta%s>' % _ATTRS)
+    _INPUT_RE = re.compile(r'(?i)<input%s>' % _ATTRS)
+    _COMMENT_RE = re.compile(r'<!--(?:(?!<!--).)*-->')
+    _MEDIA_RES = (
+        re.compile(r'(?s)<(?:amp-)?(?:video|audio)%s/>' % _ATTRS),
+        re.compile(r'(?s)<(?P<tag>(?:amp-)?(?:video|audio))(?:\s+%s)?>.*?</(?P=tag)>' % _ATTRS),
+    )
+    _SCRIPT_RE = re.compile(r'(?is)(<script(?:\s%s)?>)(.*?)</script>' % _ATTRS)
+
+    _index = None
+
+    def _indexed(self, key, build):
+        if self._index is None:
+            self._index = {}
+        if key not in self._index:
+            self._index[key] = build()
+        return self._index[key]
+
+    def _build_input_html(self):
+        inputs = list(self._INPUT_RE.finditer(self))
+        if inputs:
+            comments = [(mobj.start(), mobj.end()) for mobj in self._COMMENT_RE.finditer(self)]
+            inputs = [
+                mobj for mobj in inputs
+                if not any(start <= mobj.start() < end for start, end in comments)]
+        return '\n'.join(mobj.group(0) for mobj in inputs)
+
+    def _build_media_html(self):
+        spans = sorted(
+            (mobj.start(), mobj.end())
+            for media_re in self._MEDIA_RES for mobj in media_re.finditer(self))
+        media = []
+        media_end = 0
+        for start, end in spans:
+            # Nested elements are already part of the enclosing one
+            if start >= media_end:
+                media.append(self[start:end])
+                media_end = end
+        return '\n'.join(media)
+
+    @property
+    def meta_html(self):
+        return self._indexed(
+            'meta_html', lambda: '\n'.join(self._META_RE.findall(self)))
+
+    @property
+    def input_html(self):
+        return self._indexed('input_html', self._build_input_html)
+
+    @property
+    def media_html(self):
+        return self._indexed('media_html', self._build_media_html)
+
+    @property
+    def scripts(self):
+        return self._indexed('scripts', lambda: [
+            (extract_attributes(tag), content)
+            for tag, content in self._SCRIPT_RE.findall(self)])
+
+    @property
+    def script_text(self):
+        return self._indexed('script_text', lambda: '\n'.join(
+            content for _, content in self.scripts))
+
+    @property
+    def json_ld(self):
+        return self._indexed('json_ld', lambda: [
+            mobj.group('json_ld') for mobj in re.finditer(JSON_LD_RE, self)])
+
+
 def clean_html(html):
     """Clean an HTML snippet into a readable string"""
 
@@ -2424,6 +2511,11 @@ class MaxDownloadsReached(YoutubeDLError):
     pass
 
 
+class ExistingVideoReached(YoutubeDLError):
+    """ --break-on-existing triggered. """
+    pass
+
+
 class UnavailableVideoError(YoutubeDLError):
     """Unavailable Format exception.
 
@@ -2545,6 +2637,165 @@ def handle_youtubedl_headers(headers):
     return filtered_headers
 
 
+# Reusing connections relies on HTTPResponse telling when its body has been
+# read completely, which Python 2 httplib does not
+HTTP_KEEP_ALIVE_SUPPORTED = hasattr(compat_http_client.HTTPResponse, '_close_conn')
+
+
+class HTTPConnectionPool(object):
+    """
+    Pool of idle keep-alive HTTP connections.
+
+    Connections are pooled under a key identifying the scheme, host, port and
+    proxy they have been opened for. At most max_idle_per_host connections
+    are kept per key and connections idle for more than idle_timeout seconds
+    are closed.
+    """
+
+    def __init__(self, max_idle_per_host=8, idle_timeout=30):
+        self.max_idle_per_host = max_idle_per_host
+        self.idle_timeout = idle_timeout
+        self._idle = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _is_connection_dropped(conn):
+        sock = conn.sock
+        if sock is None:
+            return True
+        try:
+            # An idle connection becomes readable when the server closes it
+            return bool(select.select([sock], [], [], 0)[0])
+        except (ValueError, select.error, socket.error):
+            return True
+
+    def _evict_expired(self, now):
+        for key, conns in list(self._idle.items()):
+            while conns and now - conns[0][1] >= self.idle_timeout:
+                conns.pop(0)[0].close()
+            if not conns:
+                del self._idle[key]
+
+    def acquire(self, key):
+        """Return an idle connection for key or None"""
+        with self._lock:
+            self._evict_expired(time.time())
+            conns = self._idle.get(key)
+            while conns:
+                conn = conns.pop()[0]
+                if not self._is_connection_dropped(conn):
+                    return conn
+                conn.close()
+        return None
+
+    def release(self, key, conn, reusable=True):
+        """Give back a connection whose response has been closed"""
+        if not reusable:
+            conn.close()
+            return
+        with self._lock:
+            now = time.time()
+            self._evict_expired(now)
+            conns = self._idle.setdefault(key, [])
+            conns.append((conn, now))
+            if len(conns) > self.max_idle_per_host:
+                conns.pop(0)[0].close()
+
+    def close(self):
+        with self._lock:
+            for conns in self._idle.values():
+                for conn, _ in conns:
+                    conn.close()
+            self._idle = {}
+
+
+class _KeepAliveHTTPResponse(compat_http_client.HTTPResponse):
+    # Callback releasing the connection to the pool, called with whether
+    # the connection may be reused once the response is closed
+    _release_connection = None
+    _connection_reusable = True
+
+    def close(self):
+        if self.fp is not None and (self.chunked or self.length):
+            # Unread body left on the connection
+            self._connection_reusable = False
+        compat_http_client.HTTPResponse.close(self)
+
+    def _close_conn(self):
+        compat_http_client.HTTPResponse._close_conn(self)
+        release, self._release_connection = self._release_connection, None
+        if release is not None:
+            release(self._connection_reusable and (self.chunked or not self.length))
+
+
+def _is_stale_connection_error(err):
+    return (isinstance(err, (compat_http_client.BadStatusLine, socket.error))
+            and not isinstance(err, socket.timeout))
+
+
+def _keep_alive_open(handler, http_class, req, key, **http_conn_args):
+    """
+    Equivalent of AbstractHTTPHandler.do_open() reusing the connections of
+    the handler's pool instead of closing them after each request
+    """
+    pool = handler._connection_pool
+    if pool is None:
+        return handler.do_open(http_class, req, **http_conn_args)
+
+    tunnel_host = getattr(req, '_tunnel_host', None)
+    key = key + (req.host, tunnel_host)
+    headers = dict(req.unredirected_hdrs)
+    headers.update(dict(
+        (k, v) for k, v in req.headers.items() if k not in headers))
+    headers = dict((name.title(), val) for name, val in headers.items())
+    tunnel_headers = {}
+    if tunnel_host and 'Proxy-Authorization' in headers:
+        tunnel_headers['Proxy-Authorization'] = headers.pop('Proxy-Authorization')
+    request_kwargs = {}
+    if req.has_header('Transfer-encoding'):
+        request_kwargs['encode_chunked'] = True
+    timeout = req.timeout
+    if timeout is socket._GLOBAL_DEFAULT_TIMEOUT:
+        timeout = socket.getdefaulttimeout()
+
+    conn = pool.acquire(key)
+    while True:
+        reused = conn is not None
+        if reused:
+            conn.timeout = timeout
+            conn.sock.settimeout(timeout)
+        else:
+            conn = http_class(req.host, timeout=req.timeout, **http_conn_args)
+            if tunnel_host:
+                conn.set_tunnel(tunnel_host, headers=tunnel_headers)
+        conn.set_debuglevel(handler._debuglevel)
+        conn.response_class = _KeepAliveHTTPResponse
+        sent = False
+        try:
+            conn.request(
+                req.get_method(), req.selector, req.data, headers,
+                **request_kwargs)
+            sent = True
+            resp = conn.getresponse()
+        except Exception as err:
+            conn.close()
+            if (reused and _is_stale_connection_error(err)
+                    and (req.data is None or isinstance(req.data, bytes))):
+                # The server has closed the idle connection meanwhile
+                conn = None
+                continue
+            if not sent and isinstance(err, socket.error):
+                raise compat_urllib_error.URLError(err)
+            raise
+        break
+
+    if not resp.will_close:
+        resp._release_connection = functools.partial(pool.release, key, conn)
+    resp.url = req.get_full_url()
+    resp.msg = resp.reason
+    return resp
+
+
 class YoutubeDLHandler(compat_urllib_request.HTTPHandler):
     """Handler for HTTP requests and responses.
 
@@ -2566,6 +2817,7 @@ class YoutubeDLHandler(compat_urllib_request.HTTPHandler):
     def __init__(self, params, *args, **kwargs):
         compat_urllib_request.HTTPHandler.__init__(self, *args, **kwargs)
         self._params = params
+        self._connection_pool = HTTPConnectionPool() if HTTP_KEEP_ALIVE_SUPPORTED else None
 
     def http_open(self, req):
         conn_class = compat_http_client.HTTPConnection
@@ -2575,9 +2827,13 @@ class YoutubeDLHandler(compat_urllib_request.HTTPHandler):
             conn_class = make_socks_conn_class(conn_class, socks_proxy)
             del req.headers['Ytdl-socks-proxy']
 
-        return self.do_open(functools.partial(
+        return _keep_alive_open(self, functools.partial(
             _create_http_connection, self, conn_class, False),
-            req)
+            req, ('http', socks_proxy))
+
+    def close(self):
+        if self._connection_pool is not None:
+            self._connection_pool.close()
 
     @staticmethod
     def deflate(data):
@@ -2621,6 +2877,7 @@ class YoutubeDLHandler(compat_urllib_request.HTTPHandler):
         old_resp = resp
         # gzip
         if resp.headers.get('Content-encoding', '') == 'gzip':
+            import gzip
             content = resp.read()
             gz = gzip.GzipFile(fileobj=io.BytesIO(content), mode='rb')
             try:
@@ -2716,6 +2973,7 @@ class YoutubeDLHTTPSHandler(compat_urllib_request.HTTPSHandler):
         compat_urllib_request.HTTPSHandler.__init__(self, *args, **kwargs)
         self._https_conn_class = https_conn_class or compat_http_client.HTTPSConnection
         self._params = params
+        self._connection_pool = HTTPConnectionPool() if HTTP_KEEP_ALIVE_SUPPORTED else None
 
     def https_open(self, req):
         kwargs = {}
@@ -2731,9 +2989,13 @@ class YoutubeDLHTTPSHandler(compat_urllib_request.HTTPSHandler):
             conn_class = make_socks_conn_class(conn_class, socks_proxy)
             del req.headers['Ytdl-socks-proxy']
 
-        return self.do_open(functools.partial(
+        return _keep_alive_open(self, functools.partial(
             _create_http_connection, self, conn_class, True),
-            req, **kwargs)
+            req, ('https', socks_proxy), **kwargs)
+
+    def close(self):
+        if self._connection_pool is not None:
+            self._connection_pool.close()
 
 
 class YoutubeDLCookieJar(compat_cookiejar.MozillaCookieJar):
@@ -3275,12 +3537,12 @@ else:
 
 class locked_file(object):
     def __init__(self, filename, mode, encoding=None):
-        assert mode in ['r', 'a', 'w']
+        assert mode in ['r', 'rb', 'a', 'w']
         self.f = io.open(filename, mode, encoding=encoding)
         self.mode = mode
 
     def __enter__(self):
-        exclusive = self.mode != 'r'
+        exclusive = self.mode not in ('r', 'rb')
         try:
             _lock_file(self.f, exclusive)
         except IOError:
@@ -3303,6 +3565,9 @@ class locked_file(object):
     def read(self, *args):
         return self.f.read(*args)
 
+    def seek(self, *args):
+        return self.f.seek(*args)
+
 
 def get_filesystem_encoding():
     encoding = sys.getfilesystemencoding()
@@ -3523,6 +3788,8 @@ def setproctitle(title):
     if sys.platform.startswith('java'):
         return
 
+    import ctypes
+
     try:
         libc = ctypes.cdll.LoadLibrary('libc.so.6')
     except OSError:
@@ -3716,6 +3983,16 @@ def replace_extension(filename, ext, expected_real_ext=None):
         ext)
 
 
+def import_sqlite3():
+    """ Return the sqlite3 module, or None if Python was built without it.
+    It is imported on first use, since most runs never need it. """
+    try:
+        import sqlite3
+    except ImportError:
+        return None
+    return sqlite3
+
+
 def check_executable(exe, args=[]):
     """ Checks if the given binary is installed somewhere in PATH, and returns its name.
     args can be a list of arguments for a short output (like -version) """
@@ -3757,34 +4034,123 @@ def detect_exe_version(output, version_re=None, unrecognized='present'):
 
 
 class PagedList(object):
-    def __len__(self):
-        # This is only useful for tests
-        return len(self.getslice())
+    """
+    List of entries fetched lazily one page at a time.
 
+    getslice(start, end) returns the entries in [start:end] as a list,
+    iterslice(start, end) yields them as soon as their page is fetched.
 
-class OnDemandPagedList(PagedList):
-    def __init__(self, pagefunc, pagesize, use_cache=True):
+    Pages are fetched by pagefunc(pagenum). With prefetch, when a slice is
+    requested, up to prefetch of the pages it may span are fetched
+    concurrently in background threads. Errors of pages fetched ahead are
+    only raised if the page turns out to be needed, and without use_cache
+    the pages fetched ahead are dropped when the iteration stops.
+    """
+
+    # Number of pages fetched at the same time by default, 0 or 1 to
+    # fetch them one at a time
+    PREFETCH = 0
+
+    def __init__(self, pagefunc, pagesize, use_cache=True, prefetch=None):
         self._pagefunc = pagefunc
         self._pagesize = pagesize
         self._use_cache = use_cache
-        if use_cache:
-            self._cache = {}
+        self._prefetch = prefetch
+        self._cache = {}
+        # Pages being fetched, by page number
+        self._pending = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        # This is only useful for tests
+        return len(self.getslice())
+
+    def set_default_prefetch(self, prefetch):
+        """Set the number of pages fetched at the same time, unless it was
+        given when the list was created"""
+        if self._prefetch is None:
+            self._prefetch = prefetch
 
     def getslice(self, start=0, end=None):
-        res = []
+        return list(self.iterslice(start, end))
+
+    def iterslice(self, start=0, end=None):
+        try:
+            for entry in self._iterslice(start, end):
+                yield entry
+        finally:
+            if not self._use_cache:
+                self._drop_prefetched()
+
+    def _drop_prefetched(self):
+        with self._lock:
+            # Without use_cache, only the pages fetched ahead are cached
+            self._cache.clear()
+            for fetch in self._pending.values():
+                fetch['dropped'] = True
+
+    def _fetch_page(self, pagenum, fetch):
+        try:
+            fetch['result'] = list(self._pagefunc(pagenum))
+        except Exception as e:
+            fetch['error'] = e
+        with self._lock:
+            del self._pending[pagenum]
+            if 'result' in fetch and not fetch.get('dropped'):
+                # Kept until it is used, even without use_cache
+                self._cache[pagenum] = fetch['result']
+        fetch['done'].set()
+
+    def _get_page(self, pagenum, last_pagenum=None):
+        """
+        Return the entries of a page, after starting to fetch the pages
+        following it up to last_pagenum (without limit if it is None)
+        """
+        with self._lock:
+            if self._use_cache:
+                page = self._cache.get(pagenum)
+            else:
+                page = self._cache.pop(pagenum, None)
+            fetch = self._pending.get(pagenum)
+            upto = pagenum + (
+                self.PREFETCH if self._prefetch is None else self._prefetch)
+            if last_pagenum is not None:
+                upto = min(upto, last_pagenum + 1)
+            for n in range(pagenum + 1, upto):
+                if n in self._cache or n in self._pending:
+                    continue
+                self._pending[n] = {'done': threading.Event()}
+                t = threading.Thread(
+                    target=self._fetch_page, args=(n, self._pending[n]))
+                t.daemon = True
+                t.start()
+        if page is not None:
+            return page
+        if fetch is None:
+            page = list(self._pagefunc(pagenum))
+            if self._use_cache:
+                with self._lock:
+                    self._cache[pagenum] = page
+            return page
+        fetch['done'].wait()
+        if 'error' in fetch:
+            raise fetch['error']
+        if not self._use_cache:
+            with self._lock:
+                self._cache.pop(pagenum, None)
+        return fetch['result']
+
+
+class OnDemandPagedList(PagedList):
+    def _iterslice(self, start=0, end=None):
+        last_pagenum = None if end is None else max(end - 1, start) // self._pagesize
         for pagenum in itertools.count(start // self._pagesize):
             firstid = pagenum * self._pagesize
             nextfirstid = pagenum * self._pagesize + self._pagesize
             if start >= nextfirstid:
                 continue
 
-            page_results = None
-            if self._use_cache:
-                page_results = self._cache.get(pagenum)
-            if page_results is None:
-                page_results = list(self._pagefunc(pagenum))
-            if self._use_cache:
-                self._cache[pagenum] = page_results
+            page_results = self._get_page(pagenum, last_pagenum)
 
             startv = (
                 start % self._pagesize
@@ -3798,7 +4164,8 @@ class OnDemandPagedList(PagedList):
 
             if startv != 0 or endv is not None:
                 page_results = page_results[startv:endv]
-            res.extend(page_results)
+            for entry in page_results:
+                yield entry
 
             # A little optimization - if current page is not "full", ie. does
             # not contain page_size videos then we can assume that this page
@@ -3811,24 +4178,22 @@ class OnDemandPagedList(PagedList):
             # break out early as well
             if end == nextfirstid:
                 break
-        return res
 
 
 class InAdvancePagedList(PagedList):
-    def __init__(self, pagefunc, pagecount, pagesize):
-        self._pagefunc = pagefunc
+    def __init__(self, pagefunc, pagecount, pagesize, prefetch=None):
+        super(InAdvancePagedList, self).__init__(
+            pagefunc, pagesize, use_cache=False, prefetch=prefetch)
         self._pagecount = pagecount
-        self._pagesize = pagesize
 
-    def getslice(self, start=0, end=None):
-        res = []
+    def _iterslice(self, start=0, end=None):
         start_page = start // self._pagesize
         end_page = (
             self._pagecount if end is None else (end // self._pagesize + 1))
         skip_elems = start - start_page * self._pagesize
         only_more = None if end is None else end - start
         for pagenum in range(start_page, end_page):
-            page = list(self._pagefunc(pagenum))
+            page = self._get_page(pagenum, end_page - 1)
             if skip_elems:
                 page = page[skip_elems:]
                 skip_elems = None
@@ -3836,11 +4201,11 @@ class InAdvancePagedList(PagedList):
                 if len(page) < only_more:
                     only_more -= len(page)
                 else:
-                    page = page[:only_more]
-                    res.extend(page)
+                    for entry in page[:only_more]:
+                        yield entry
                     break
-            res.extend(page)
-        return res
+            for entry in page:
+                yield entry
 
 
 def uppercase_escape(s):
@@ -4301,6 +4666,10 @@ def determine_protocol(info_dict):
     elif ext == 'f4m':
         return 'f4m'
 
+    # Spare the common case a full parse of the URL
+    scheme, sep, _ = url.partition('://')
+    if sep and scheme in ('http', 'https'):
+        return scheme
     return compat_urllib_parse_urlparse(url).scheme
 
 